@@ -0,0 +1,71 @@
+"""Throughput of QuickXorHash on local files.
+
+python benchmarks/bench_quickxor.py --size 256 --chunk 16
+python benchmarks/bench_quickxor.py /path/to/file
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+from microsoftgraph import quickxor
+from microsoftgraph.quickxor import QuickXorHash, quickxor_file
+
+
+def measure(label: str, size: int, func, repeat: int) -> None:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print("{:<28} {:>10.1f} MiB/s".format(label, size / best / 1024 / 1024))
+
+
+def streamed(path: str, chunk_size: int) -> str:
+    hasher = QuickXorHash()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.b64digest()
+
+
+def sha1(path: str, chunk_size: int) -> str:
+    hasher = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", help="File to hash. Defaults to a temporary file of random bytes.")
+    parser.add_argument("--size", type=int, default=256, help="Size in MiB of the temporary file. Defaults to 256.")
+    parser.add_argument("--chunk", type=int, default=16, help="Chunk size in MiB. Defaults to 16.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measure, the best is kept. Defaults to 3.")
+    args = parser.parse_args()
+
+    path = args.path
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="bench-quickxor-")
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(args.size):
+                f.write(os.urandom(1024 * 1024))
+
+    try:
+        size = os.path.getsize(path)
+        chunk_size = args.chunk * 1024 * 1024
+        print("{} MiB, {} MiB chunks, numpy {}".format(size // 1024 // 1024, args.chunk, quickxor.numpy is not None))
+        measure("quickxor (mmap)", size, lambda: quickxor_file(path, chunk_size), args.repeat)
+        measure("quickxor (streamed)", size, lambda: streamed(path, chunk_size), args.repeat)
+        measure("sha1 (reference)", size, lambda: sha1(path, chunk_size), args.repeat)
+    finally:
+        if args.path is None:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, Optional, Union
+
+from microsoftgraph.client import Client
+from microsoftgraph.decorators import token_required
+from microsoftgraph.files import DOWNLOAD_CHUNK_SIZE, DOWNLOAD_SELECT, Files, encode_share_url, verify_quickxor
+from microsoftgraph.quickxor import QuickXorHash
+from microsoftgraph.response import Response
+from microsoftgraph.scheduler import BULK, priority
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class AsyncFiles(Files):
+    @token_required
+    async def drive_download_shared_contents(self, share_id: str, params: dict = None, **kwargs) -> Response:
+        """Download the contents of the primary stream (file) of a DriveItem. Only driveItems with the file property can
+        be downloaded.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-get-content?view=graph-rest-1.0&tabs=http
+
+        Args:
+            share_id (str): ID of a driveItem.
+            params (dict, optional): Extra params. Defaults to None.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        url = self._client.base_url + "shares/{}/driveItem".format(encode_share_url(share_id))
+        drive_item = await self._client._get(url)
+        file_download_url = drive_item.data["@microsoft.graph.downloadUrl"]
+        response = await self._client.session.get(file_download_url)
+        return drive_item.data["name"], response.content
+
+    @token_required
+    async def drive_iter_contents(self, item_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Stream the contents of a DriveItem chunk by chunk, for e.g. `async for chunk in ...`.
+
+        Args:
+            item_id (str): ID of a driveItem.
+            chunk_size (int, optional): Size of the yielded chunks. Defaults to 1 MiB.
+
+        Yields:
+            bytes: Chunks of the file.
+        """
+        drive_item = await self.drive_get_item(item_id, params={"$select": DOWNLOAD_SELECT})
+        async for chunk in self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size):
+            yield chunk
+
+    @token_required
+    async def drive_download_to(
+        self,
+        item_id: str,
+        destination: Union[str, BinaryIO],
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        verify: bool = True,
+    ) -> Response:
+        """Stream the contents of a DriveItem to a file path or a binary file object.
+
+        Args:
+            item_id (str): ID of a driveItem.
+            destination (str or BinaryIO): File path or object opened in binary mode.
+            chunk_size (int, optional): Size of the chunks read and written. Defaults to 1 MiB.
+            verify (bool, optional): Check the quickXorHash of the content on the fly. Defaults to True.
+
+        Returns:
+            Response: Microsoft Graph Response of the driveItem.
+        """
+        drive_item = await self.drive_get_item(item_id, params={"$select": DOWNLOAD_SELECT})
+        chunks = self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size)
+        hasher = QuickXorHash() if verify else None
+        await write_chunks(chunks, destination, hasher=hasher)
+        if hasher is not None:
+            verify_quickxor(drive_item.data, hasher)
+        return drive_item
+
+    @token_required
+    async def drive_iter_shared_contents(
+        self, share_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream the contents of a shared DriveItem chunk by chunk.
+
+        Args:
+            share_id (str): Sharing url of a driveItem.
+            chunk_size (int, optional): Size of the yielded chunks. Defaults to 1 MiB.
+
+        Yields:
+            bytes: Chunks of the file.
+        """
+        drive_item = await self._get_shared_item(share_id)
+        async for chunk in self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size):
+            yield chunk
+
+    @token_required
+    async def drive_download_shared_to(
+        self,
+        share_id: str,
+        destination: Union[str, BinaryIO],
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        verify: bool = True,
+    ) -> Response:
+        """Stream the contents of a shared DriveItem to a file path or a binary file object.
+
+        Args:
+            share_id (str): Sharing url of a driveItem.
+            destination (str or BinaryIO): File path or object opened in binary mode.
+            chunk_size (int, optional): Size of the chunks read and written. Defaults to 1 MiB.
+            verify (bool, optional): Check the quickXorHash of the content on the fly. Defaults to True.
+
+        Returns:
+            Response: Microsoft Graph Response of the driveItem.
+        """
+        drive_item = await self._get_shared_item(share_id)
+        chunks = self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size)
+        hasher = QuickXorHash() if verify else None
+        await write_chunks(chunks, destination, hasher=hasher)
+        if hasher is not None:
+            verify_quickxor(drive_item.data, hasher)
+        return drive_item
+
+
+async def write_chunks(chunks: AsyncIterator[bytes], destination: Union[str, BinaryIO], hasher=None) -> int:
+    """Asyncio flavour of microsoftgraph.files.write_chunks.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Chunks to write.
+        destination (str or BinaryIO): File path or object opened in binary mode.
+        hasher (optional): Updated with every chunk on the fly, for e.g. a QuickXorHash. Defaults to None.
+
+    Returns:
+        int: Number of bytes written.
+    """
+    if hasattr(destination, "write"):
+        written = 0
+        async for chunk in chunks:
+            destination.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+            written += len(chunk)
+        return written
+
+    with open(destination, "wb") as f:
+        return await write_chunks(chunks, f, hasher=hasher)
+
+
+class AsyncClient(Client):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        api_version: str = "v1.0",
+        account_type: str = "common",
+        requests_hooks: dict = None,
+        paginate: bool = True,
+        session: "httpx.AsyncClient" = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        timeout=None,
+        **kwargs,
+    ) -> None:
+        """Instantiates the asyncio flavour of the library.
+
+        Every module method of the returned client is a coroutine, for e.g. `await client.mail.list_messages()`.
+        Requires httpx: pip install microsoftgraph-python[async]
+
+        Args:
+            client_id (str): Application client id.
+            client_secret (str): Application client secret.
+            api_version (str, optional): v1.0 or beta. Defaults to "v1.0".
+            account_type (str, optional): common, organizations or consumers. Defaults to "common".
+            requests_hooks (dict, optional): httpx event hooks, their functions must be coroutines. Defaults to None.
+            paginate (bool, optional): Follow @odata.nextLink and return every page at once. Defaults to True.
+            session (httpx.AsyncClient, optional): Client to send every request through. If given, the pool
+            parameters below are ignored. Defaults to None.
+            max_connections (int, optional): Maximum number of concurrent connections. Defaults to 100.
+            max_keepalive_connections (int, optional): Maximum number of idle connections kept open. Defaults to 20.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept open. Defaults to 5.0.
+            timeout (float or tuple, optional): Default (connect, read) timeout for every request. Defaults to None.
+            **kwargs: Other Client arguments, for e.g. retry, rate_limiter, scheduler, response_cache or json_codec.
+
+        Raises:
+            ImportError: httpx is not installed.
+        """
+        if httpx is None:
+            raise ImportError("AsyncClient requires httpx. pip install microsoftgraph-python[async]")
+
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        super().__init__(
+            client_id,
+            client_secret,
+            api_version=api_version,
+            account_type=account_type,
+            requests_hooks=requests_hooks,
+            paginate=paginate,
+            session=session,
+            timeout=timeout,
+            **kwargs,
+        )
+        self.files = AsyncFiles(self)
+        self._async_token_lock = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def _create_session(self) -> "httpx.AsyncClient":
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        event_hooks = None
+        if self.requests_hooks:
+            event_hooks = {
+                event: hooks if isinstance(hooks, list) else [hooks] for event, hooks in self.requests_hooks.items()
+            }
+        return httpx.AsyncClient(
+            limits=limits, timeout=self._httpx_timeout(), event_hooks=event_hooks, follow_redirects=True
+        )
+
+    def _httpx_timeout(self) -> "httpx.Timeout":
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(self.timeout)
+
+    async def close(self) -> None:
+        """Closes every pooled connection held by this client."""
+        await self.session.aclose()
+
+    async def _token_request(self, data: dict) -> Response:
+        response = await self.session.post(self.AUTHORITY_URL + self.account_type + self.TOKEN_ENDPOINT, data=data)
+        return self._parse(response)
+
+    async def _ensure_token(self) -> None:
+        if self._can_refresh_token() and self._token_expiring():
+            await self._refresh_stale_token(self.token["access_token"])
+
+    async def _refresh_stale_token(self, stale_access_token: str) -> None:
+        if self._async_token_lock is None:
+            self._async_token_lock = asyncio.Lock()
+        async with self._async_token_lock:
+            if self.token["access_token"] != stale_access_token:
+                return
+            if not self.token_cache:
+                response = await self.refresh_token(self.redirect_uri, self.token["refresh_token"])
+                self._set_refreshed_token(response.data)
+                return
+
+            # The cross-process lock of the token cache blocks and is bound to the thread holding it: a dedicated
+            # thread takes it and does the cache reads and writes, the event loop only awaits them.
+            loop = asyncio.get_running_loop()
+            holder = ThreadPoolExecutor(max_workers=1)
+            lock = self._token_cache_lock()
+            locked = []
+
+            def acquire() -> None:
+                lock.__enter__()
+                locked.append(True)
+
+            def release() -> None:
+                if locked:
+                    lock.__exit__(None, None, None)
+
+            try:
+                await loop.run_in_executor(holder, acquire)
+                if not await loop.run_in_executor(holder, self._adopt_cached_token, stale_access_token):
+                    response = await self.refresh_token(self.redirect_uri, self.token["refresh_token"])
+                    await loop.run_in_executor(holder, self._set_refreshed_token, response.data)
+            except BaseException:
+                # Queued after acquire, so the lock is released even if the wait for it was cancelled.
+                holder.submit(release)
+                holder.shutdown(wait=False)
+                raise
+            await loop.run_in_executor(holder, release)
+            holder.shutdown(wait=False)
+
+    async def get_next(self, response: Response) -> Optional[Response]:
+        """Retrieves the next page for the argument response if any.
+
+        Args:
+            response (Response): Graph API Response.
+
+        Returns:
+            Optional[Response]: Graph API Response if available, None otherwise
+        """
+        if not isinstance(response.data, dict):
+            return None
+
+        if "@odata.nextLink" not in response.data:
+            return None
+
+        with priority(BULK, override=False):
+            return await self._do_get(response.data["@odata.nextLink"])
+
+    async def _paginate_response(self, response: Response) -> Response:
+        if not isinstance(response.data, dict) or "value" not in response.data:
+            return response
+
+        # Copy data to avoid side effects
+        data = []
+        async for response in self.iter_pages(response):
+            if isinstance(response.data, dict) and "value" in response.data:
+                data.extend(response.data["value"])
+
+        response.data["value"] = data
+        return response
+
+    async def iter_pages(self, response: Response, prefetch: int = 0) -> AsyncIterator[Response]:
+        """Lazily yields the argument response and then every following page.
+
+        With prefetch, a background task downloads up to that many pages ahead while the caller processes the
+        current one.
+
+        Args:
+            response (Response): Graph API Response, usually the first page.
+            prefetch (int, optional): Number of pages to fetch ahead in the background. Defaults to 0.
+
+        Yields:
+            Response: Graph API Response of each page.
+        """
+        if prefetch > 0:
+            async for page in self._prefetch_pages(response, prefetch):
+                yield page
+            return
+
+        while response is not None:
+            yield response
+            response = await self.get_next(response)
+
+    async def _prefetch_pages(self, response: Response, prefetch: int) -> AsyncIterator[Response]:
+        pages = asyncio.Queue(maxsize=prefetch)
+
+        async def fetch(page: Response) -> None:
+            try:
+                while page is not None:
+                    page = await self.get_next(page)
+                    if page is not None:
+                        await pages.put((page, None))
+            except Exception as e:
+                await pages.put((None, e))
+                return
+            await pages.put((None, None))
+
+        worker = asyncio.ensure_future(fetch(response))
+        try:
+            yield response
+            while True:
+                page, error = await pages.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+        finally:
+            worker.cancel()
+
+    async def iter_values(self, response: Response, prefetch: int = 0) -> AsyncIterator[dict]:
+        """Lazily yields the items of the argument response and of every following page.
+
+        Args:
+            response (Response): Graph API Response, usually the first page.
+            prefetch (int, optional): Number of pages to fetch ahead in the background. Defaults to 0.
+
+        Yields:
+            dict: Each item of the collection.
+        """
+        async for page in self.iter_pages(response, prefetch=prefetch):
+            if isinstance(page.data, dict):
+                for value in page.data.get("value", []):
+                    yield value
+
+    async def _iter(self, url, prefetch: int = 0, model: type = None, **kwargs) -> AsyncIterator:
+        if model is not None:
+            kwargs["params"] = dict(kwargs.get("params") or {})
+            kwargs["params"].setdefault("$select", model.select())
+        async for value in self.iter_values(await self._do_get(url, **kwargs), prefetch=prefetch):
+            yield value if model is None else model.from_dict(value)
+
+    async def _do_get(self, url, **kwargs) -> Response:
+        if self.response_cache is None:
+            return await self._request("GET", url, **kwargs)
+
+        key, entry = self._cache_lookup(url, kwargs)
+        return self._cache_store(key, entry, await self._request("GET", url, **kwargs))
+
+    async def _get(self, url, **kwargs) -> Response:
+        response = await self._do_get(url, **kwargs)
+        if self.paginate:
+            return await self._paginate_response(response)
+
+        return response
+
+    async def _stream(self, url, chunk_size: int = 1024 * 1024, headers: dict = None) -> AsyncIterator[bytes]:
+        response = await self._request_pre_authenticated("GET", url, headers=headers, stream=True)
+        try:
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def _request_pre_authenticated(self, method, url, headers: dict = None, stream: bool = False, **kwargs):
+        if isinstance(kwargs.get("data"), (bytes, str)):
+            kwargs["content"] = kwargs.pop("data")
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            request = self.session.build_request(method, url, headers=headers, **kwargs)
+            response = await self.session.send(request, stream=stream)
+            delay = self._retry_delay(method, url, response, attempt, started)
+            if delay is None:
+                break
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if response.status_code >= 299:
+            await response.aread()
+            await response.aclose()
+            self._parse(response)
+        return response
+
+    async def _send(self, method, url, **kwargs):
+        if self.scheduler:
+            async with self.scheduler.aslot(method, url):
+                return await self.session.request(method, url, **kwargs)
+        return await self.session.request(method, url, **kwargs)
+
+    async def _request(self, method, url, headers=None, **kwargs) -> Response:
+        await self._ensure_token()
+        _headers = self._prepare_headers(headers)
+        self._encode_json(kwargs)
+        # httpx expects raw bodies as content and form fields as data.
+        if isinstance(kwargs.get("data"), (bytes, str)):
+            kwargs["content"] = kwargs.pop("data")
+        if "allow_redirects" in kwargs:
+            kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+
+        attempt = 0
+        replayed = False
+        started = time.monotonic()
+        while True:
+            if self.rate_limiter:
+                await asyncio.sleep(self.rate_limiter.reserve(method, url))
+            response = await self._send(method, url, headers=_headers, **kwargs)
+            if response.status_code == 401 and not replayed and self._can_refresh_token():
+                # Replay once with a fresh token.
+                replayed = True
+                await self._refresh_stale_token(_headers["Authorization"][len("Bearer ") :])
+                _headers["Authorization"] = "Bearer " + self.token["access_token"]
+                continue
+            delay = self._retry_delay(method, url, response, attempt, started)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        r = self._parse(response)
+        r.retries = attempt
+        return r
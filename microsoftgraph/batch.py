@@ -0,0 +1,221 @@
+import base64
+from urllib.parse import urlencode
+
+from microsoftgraph import exceptions
+from microsoftgraph.calendar import Calendar
+from microsoftgraph.contacts import Contacts
+from microsoftgraph.files import Files
+from microsoftgraph.mail import Mail
+from microsoftgraph.notes import Notes
+from microsoftgraph.response import RawResponse, Response
+from microsoftgraph.users import Users
+from microsoftgraph.utils import require_sync_client
+from microsoftgraph.webhooks import Webhooks
+from microsoftgraph.workbooks import Workbooks
+
+
+class BatchRequest(object):
+    def __init__(self, batch, id: str, method: str, url: str, headers: dict = None, body=None) -> None:
+        """A call queued in a Batch. Its outcome is available once the batch has been executed.
+
+        Args:
+            batch (Batch): Batch the request belongs to.
+            id (str): Request id inside the batch.
+            method (str): HTTP method.
+            url (str): Url relative to the API version, for e.g. /me/messages.
+            headers (dict, optional): Request headers. Defaults to None.
+            body (optional): JSON body or base64 encoded content. Defaults to None.
+        """
+        self._batch = batch
+        self.id = id
+        self.method = method
+        self.url = url
+        self.headers = headers or {}
+        self.body = body
+        self.depends_on = []
+        self.response = None
+        self.error = None
+
+    def __repr__(self) -> str:
+        return "<BatchRequest [{} {} {}]>".format(self.id, self.method, self.url)
+
+    def after(self, *requests: "BatchRequest") -> "BatchRequest":
+        """Runs this request only once the given requests have succeeded (dependsOn).
+
+        Args:
+            requests (BatchRequest): Requests previously queued in the same batch.
+
+        Raises:
+            ValueError: A request belongs to another batch or was queued after this one.
+
+        Returns:
+            BatchRequest: This request, to allow chaining.
+        """
+        for request in requests:
+            if request._batch is not self._batch or int(request.id) >= int(self.id):
+                raise ValueError("A request can only depend on requests queued before it in the same batch.")
+            self.depends_on.append(request)
+        return self
+
+    def result(self) -> Response:
+        """Returns the Response of this request, raising the library exception if it failed.
+
+        Raises:
+            BaseError: Request failed or batch not executed yet.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        if self.error is not None:
+            raise self.error
+        if self.response is None:
+            raise exceptions.BaseError("The batch has not been executed yet.")
+        return self.response
+
+    def to_dict(self, depends_on: list = None) -> dict:
+        data = {"id": self.id, "method": self.method, "url": self.url}
+        if self.headers:
+            data["headers"] = self.headers
+        if self.body is not None:
+            data["body"] = self.body
+        if depends_on:
+            data["dependsOn"] = depends_on
+        return data
+
+
+class Batch(object):
+    MAX_REQUESTS = 20
+
+    def __init__(self, client) -> None:
+        """Combine multiple requests in one HTTP call using JSON batching.
+
+        Module methods called on a batch are queued instead of sent, for e.g. `batch.mail.get_message(message_id)`
+        returns a BatchRequest. Calling `execute` sends them in chunks of 20 requests.
+
+        https://docs.microsoft.com/en-us/graph/json-batching
+
+        Args:
+            client (Client): Library Client.
+        """
+        require_sync_client(client, "Batch")
+        self._client = client
+        self.requests = []
+
+        self.calendar = Calendar(self)
+        self.contacts = Contacts(self)
+        self.files = Files(self)
+        self.mail = Mail(self)
+        self.notes = Notes(self)
+        self.users = Users(self)
+        self.webhooks = Webhooks(self)
+        self.workbooks = Workbooks(self)
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    @property
+    def base_url(self) -> str:
+        return self._client.base_url
+
+    @property
+    def token(self) -> dict:
+        return self._client.token
+
+    @property
+    def workbook_session_id(self) -> str:
+        return self._client.workbook_session_id
+
+    def get_workbook_session_id(self, workbook_id: str = None) -> str:
+        return self._client.get_workbook_session_id(workbook_id)
+
+    def _get(self, url, **kwargs) -> BatchRequest:
+        return self._add("GET", url, **kwargs)
+
+    def _do_get(self, url, **kwargs) -> BatchRequest:
+        return self._add("GET", url, **kwargs)
+
+    def _post(self, url, **kwargs) -> BatchRequest:
+        return self._add("POST", url, **kwargs)
+
+    def _put(self, url, **kwargs) -> BatchRequest:
+        return self._add("PUT", url, **kwargs)
+
+    def _patch(self, url, **kwargs) -> BatchRequest:
+        return self._add("PATCH", url, **kwargs)
+
+    def _delete(self, url, **kwargs) -> BatchRequest:
+        return self._add("DELETE", url, **kwargs)
+
+    def _add(self, method, url, headers=None, params=None, json=None, data=None, **kwargs) -> BatchRequest:
+        if kwargs:
+            raise ValueError("Unsupported arguments in a batch request: {}".format(", ".join(kwargs)))
+        if not url.startswith(self.base_url):
+            raise ValueError("Batch requests must target {}".format(self.base_url))
+
+        url = "/" + url[len(self.base_url) :]
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(params, safe="$,")
+
+        headers = dict(headers or {})
+        body = None
+        if json is not None:
+            headers["Content-Type"] = "application/json"
+            body = json
+        elif data is not None:
+            headers.setdefault("Content-Type", "application/octet-stream")
+            if isinstance(data, str):
+                data = data.encode()
+            body = base64.b64encode(data).decode()
+
+        request = BatchRequest(self, str(len(self.requests) + 1), method, url, headers=headers, body=body)
+        self.requests.append(request)
+        return request
+
+    def execute(self) -> list:
+        """Sends the queued requests, MAX_REQUESTS per HTTP call, and assigns each one its Response or exception.
+
+        dependsOn between requests of the same chunk is sent to Graph. Dependencies on requests of an earlier chunk are
+        resolved locally: the dependent request fails with FailedDependency without being sent if any of them failed.
+
+        Returns:
+            list: The executed BatchRequest objects, in queue order.
+        """
+        pending = [request for request in self.requests if request.response is None and request.error is None]
+        for start in range(0, len(pending), self.MAX_REQUESTS):
+            self._execute_chunk(pending[start : start + self.MAX_REQUESTS])
+        return self.requests
+
+    def _execute_chunk(self, chunk: list) -> None:
+        in_chunk = {request.id for request in chunk}
+        payload = []
+        for request in chunk:
+            failed = [dependency.id for dependency in request.depends_on if dependency.error is not None]
+            if failed:
+                request.error = exceptions.FailedDependency({"error": {"code": "424", "dependsOn": failed}})
+                continue
+            depends_on = [dependency.id for dependency in request.depends_on if dependency.id in in_chunk]
+            payload.append(request.to_dict(depends_on))
+
+        if not payload:
+            return
+
+        response = self._client._post(self.base_url + "$batch", json={"requests": payload})
+        by_id = {request.id: request for request in chunk}
+        for item in response.data.get("responses", []):
+            request = by_id[item["id"]]
+            try:
+                request.response = self._client._parse(self._raw_response(item))
+            except Exception as e:
+                # A malformed sub-response only fails its own request.
+                request.error = e
+
+    def _raw_response(self, item: dict) -> RawResponse:
+        raw = RawResponse(item["status"], headers=item.get("headers"))
+        body = item.get("body")
+        if body is None:
+            return raw
+        if "application/json" in raw.headers.get("Content-Type", "") or not isinstance(body, str):
+            raw.content = self._client.json_codec.dumps(body)
+        else:
+            raw.content = base64.b64decode(body)
+        return raw
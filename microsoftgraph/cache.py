@@ -0,0 +1,102 @@
+import abc
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Short-lived pre-authenticated urls expire without any change of the item ETag, a cached body would serve stale ones.
+UNCACHEABLE_PROPERTIES = ("@microsoft.graph.downloadUrl",)
+
+
+class CacheEntry(object):
+    __slots__ = ("etag", "status_code", "headers", "content", "stored_at")
+
+    def __init__(self, etag: str, status_code: int, headers: dict, content: bytes, stored_at: float = None) -> None:
+        """A cached GET response and its ETag.
+
+        Args:
+            etag (str): Entity tag sent back in If-None-Match.
+            status_code (int): HTTP status code.
+            headers (dict): Response headers.
+            content (bytes): Raw body.
+            stored_at (float, optional): Epoch time of storage. Defaults to now.
+        """
+        self.etag = etag
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at if stored_at is not None else time.time()
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+class ResponseCache(abc.ABC):
+    """Stores GET responses for conditional requests. Subclass it to back the cache with a shared store."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class LRUCache(ResponseCache):
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: float = None) -> None:
+        """Thread safe in-memory cache evicting the least recently used entries.
+
+        Args:
+            max_entries (int, optional): Maximum number of entries. Defaults to 1024.
+            max_bytes (int, optional): Maximum total size of the cached bodies. Defaults to 64 MiB.
+            ttl (float, optional): Seconds after which an entry is dropped. Defaults to None, no expiry.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry.stored_at > self.ttl:
+                self._pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
@@ -1,6 +1,8 @@
 from datetime import datetime
+from typing import Iterator
 
 from microsoftgraph.decorators import token_required
+from microsoftgraph.models import Event
 from microsoftgraph.response import Response
 from microsoftgraph.utils import format_time
 
@@ -33,6 +35,28 @@ class Calendar(object):
         url = "me/calendars/{}/events".format(calendar_id) if calendar_id else "me/events"
         return self._client._get(self._client.base_url + url, params=params)
 
+    @token_required
+    def iter_events(
+        self, calendar_id: str = None, params: dict = None, prefetch: int = 0, as_model: bool = False
+    ) -> Iterator:
+        """Lazily iterate over the event objects in the user's mailbox, requesting one page at a time.
+
+        https://docs.microsoft.com/en-us/graph/api/user-list-events?view=graph-rest-1.0&tabs=http
+
+        Args:
+            calendar_id (str): Calendar ID.
+            params (dict, optional): Query. Defaults to None.
+            prefetch (int, optional): Number of pages to download ahead in the background. Defaults to 0.
+            as_model (bool, optional): Yield compact Event models, requesting only their properties. Defaults to
+            False.
+
+        Yields:
+            dict or Event: Event.
+        """
+        url = "me/calendars/{}/events".format(calendar_id) if calendar_id else "me/events"
+        model = Event if as_model else None
+        return self._client._iter(self._client.base_url + url, params=params, prefetch=prefetch, model=model)
+
     @token_required
     def get_event(self, event_id: str, params: dict = None) -> Response:
         """Get the properties and relationships of the specified event object.
@@ -48,6 +72,43 @@ class Calendar(object):
         """
         return self._client._get(self._client.base_url + "me/events/{}".format(event_id), params=params)
 
+    @token_required
+    def list_events_delta(
+        self,
+        start_datetime: datetime = None,
+        end_datetime: datetime = None,
+        calendar_id: str = None,
+        delta_link: str = None,
+        params: dict = None,
+    ) -> Response:
+        """Get a set of events that have been added, deleted, or updated in a calendarView (a range of events) of the
+        user's calendar. The last page holds an @odata.deltaLink to request the next changes with.
+
+        https://docs.microsoft.com/en-us/graph/api/event-delta?view=graph-rest-1.0&tabs=http
+
+        Args:
+            start_datetime (datetime, optional): Start of the time range. Required in the initial round.
+            end_datetime (datetime, optional): End of the time range. Required in the initial round.
+            calendar_id (str, optional): Calendar ID. Defaults to None.
+            delta_link (str, optional): @odata.deltaLink of a previous round. Defaults to None, initial round.
+            params (dict, optional): Query, only used in the initial round. Defaults to None.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        if delta_link:
+            return self._client._get(delta_link)
+        if isinstance(start_datetime, datetime):
+            start_datetime = format_time(start_datetime)
+        if isinstance(end_datetime, datetime):
+            end_datetime = format_time(end_datetime)
+
+        params = dict(params or {})
+        params["startDateTime"] = start_datetime
+        params["endDateTime"] = end_datetime
+        url = "me/calendars/{}/calendarView/delta".format(calendar_id) if calendar_id else "me/calendarView/delta"
+        return self._client._get(self._client.base_url + url, params=params)
+
     @token_required
     def create_event(
         self,
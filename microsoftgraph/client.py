@@ -1,15 +1,29 @@
-from typing import Optional
+import contextlib
+import contextvars
+import queue
+import threading
+import time
+from typing import Callable, Iterator, Optional
 from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from microsoftgraph import exceptions
+from microsoftgraph.batch import Batch
+from microsoftgraph.cache import UNCACHEABLE_PROPERTIES, CacheEntry, ResponseCache
 from microsoftgraph.calendar import Calendar
 from microsoftgraph.contacts import Contacts
+from microsoftgraph.delta import DeltaStateStore, DeltaSync
 from microsoftgraph.files import Files
+from microsoftgraph.jsoncodec import JSONCodec, default_codec
 from microsoftgraph.mail import Mail
 from microsoftgraph.notes import Notes
-from microsoftgraph.response import Response
+from microsoftgraph.ratelimit import RateLimiter
+from microsoftgraph.response import RawResponse, Response
+from microsoftgraph.retry import Retry
+from microsoftgraph.scheduler import BULK, Scheduler, priority
+from microsoftgraph.token_cache import TokenCache
 from microsoftgraph.users import Users
 from microsoftgraph.webhooks import Webhooks
 from microsoftgraph.workbooks import Workbooks
@@ -29,6 +43,23 @@ class Client(object):
         account_type: str = "common",
         requests_hooks: dict = None,
         paginate: bool = True,
+        session: requests.Session = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout=None,
+        retry: Retry = None,
+        rate_limiter: RateLimiter = None,
+        scheduler: Scheduler = None,
+        redirect_uri: str = None,
+        token_refresh_margin: int = 300,
+        on_token_refresh: Callable = None,
+        token_cache: TokenCache = None,
+        account: str = None,
+        scope: list = None,
+        response_cache: ResponseCache = None,
+        json_codec: JSONCodec = None,
     ) -> None:
         """Instantiates library.
 
@@ -38,6 +69,36 @@ class Client(object):
             api_version (str, optional): v1.0 or beta. Defaults to "v1.0".
             account_type (str, optional): common, organizations or consumers. Defaults to "common".
             requests_hooks (dict, optional): Requests library event hooks. Defaults to None.
+            paginate (bool, optional): Follow @odata.nextLink and return every page at once. Defaults to True.
+            session (requests.Session, optional): Session to send every request through. If given, the pool
+            parameters below are ignored. Defaults to None.
+            pool_connections (int, optional): Number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of connections kept open per host. Defaults to 10.
+            pool_block (bool, optional): Wait for a free connection instead of opening a throwaway one when the
+            pool is exhausted. Defaults to False.
+            keep_alive (bool, optional): Reuse connections between requests. Defaults to True.
+            timeout (float or tuple, optional): Default (connect, read) timeout for every request. Defaults to None.
+            retry (Retry, optional): Retry policy for throttled (429) or unavailable (503, 504) requests. Defaults to
+            None, no retries.
+            rate_limiter (RateLimiter, optional): Rate limiter every request waits for, it can be shared by several
+            clients. Defaults to None.
+            scheduler (Scheduler, optional): Caps in-flight requests per mailbox and serves them by priority. Defaults
+            to None.
+            redirect_uri (str, optional): Redirect uri used to refresh the token automatically. Defaults to the one
+            given to exchange_code.
+            token_refresh_margin (int, optional): Seconds before expiry at which the token is refreshed. Defaults to
+            300.
+            on_token_refresh (Callable, optional): Called with the new token dict after an automatic refresh, for e.g.
+            to persist it. Defaults to None.
+            token_cache (TokenCache, optional): Cache shared with other clients or processes. The cached token is
+            loaded on instantiation, set_token stores into it and refreshes are coordinated through it. Defaults to
+            None.
+            account (str, optional): Account part of the token cache key. Defaults to None.
+            scope (list, optional): Scope part of the token cache key. Defaults to None.
+            response_cache (ResponseCache, optional): Cache of GET responses revalidated with If-None-Match. Keys
+            include the token cache key, so set account when several users share a cache. Defaults to None.
+            json_codec (JSONCodec, optional): Codec encoding request bodies and decoding responses. Defaults to orjson
+            when installed, the standard library otherwise.
 
         Raises:
             Exception: requests_hooks is not a dict.
@@ -50,7 +111,24 @@ class Client(object):
         self.base_url = self.RESOURCE + self.api_version + "/"
         self.token = None
         self.workbook_session_id = None
+        self.workbook_sessions = None
         self.paginate = paginate
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
+        self.redirect_uri = redirect_uri
+        self.token_refresh_margin = token_refresh_margin
+        self.on_token_refresh = on_token_refresh
+        self._token_lock = threading.Lock()
+        self.token_cache = token_cache
+        self.token_cache_key = TokenCache.make_key(client_id, account, scope)
+        self.response_cache = response_cache
+        self.json_codec = json_codec or default_codec()
 
         self.calendar = Calendar(self)
         self.contacts = Contacts(self)
@@ -66,6 +144,35 @@ class Client(object):
                 'requests_hooks must be a dict. e.g. {"response": func}. http://docs.python-requests.org/en/master/user/advanced/#event-hooks'
             )
         self.requests_hooks = requests_hooks
+        self.session = session if session is not None else self._create_session()
+        if self.token_cache:
+            self.load_token()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _create_session(self) -> requests.Session:
+        """Builds the pooled session shared by every module of this client.
+
+        Returns:
+            requests.Session: Session with a connection pool mounted for http and https.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        """Closes every pooled connection held by this client."""
+        self.session.close()
 
     def authorization_url(self, redirect_uri: str, scope: list, state: str = None) -> str:
         """Generates an Authorization URL.
@@ -128,8 +235,9 @@ class Client(object):
             "code": code,
             "grant_type": "authorization_code",
         }
-        response = requests.post(self.AUTHORITY_URL + self.account_type + self.TOKEN_ENDPOINT, data=data)
-        return self._parse(response)
+        if self.redirect_uri is None:
+            self.redirect_uri = redirect_uri
+        return self._token_request(data)
 
     def refresh_token(self, redirect_uri: str, refresh_token: str) -> Response:
         """Exchanges a refresh token for an user token.
@@ -157,16 +265,92 @@ class Client(object):
             "refresh_token": refresh_token,
             "grant_type": "refresh_token",
         }
-        response = requests.post(self.AUTHORITY_URL + self.account_type + self.TOKEN_ENDPOINT, data=data)
+        return self._token_request(data)
+
+    def _token_request(self, data: dict) -> Response:
+        response = self.session.post(
+            self.AUTHORITY_URL + self.account_type + self.TOKEN_ENDPOINT, data=data, timeout=self.timeout
+        )
         return self._parse(response)
 
     def set_token(self, token: dict) -> None:
         """Sets the User token for its use in this library.
 
+        When the token has an expires_in (or expires_at) and a refresh_token, it is refreshed automatically shortly
+        before it expires, or once after a 401 response.
+
         Args:
             token (dict): User token data.
         """
+        if token and "expires_at" not in token and "expires_in" in token:
+            token = dict(token, expires_at=time.time() + int(token["expires_in"]))
         self.token = token
+        if self.token_cache and token:
+            self.token_cache.set(self.token_cache_key, token)
+
+    def load_token(self) -> Optional[dict]:
+        """Loads the token stored in the token cache, if any, for e.g. one stored by another process.
+
+        Returns:
+            Optional[dict]: Token data, None if the cache has no token for this client.
+        """
+        token = self.token_cache.get(self.token_cache_key)
+        if token:
+            self.token = token
+        return token
+
+    def _token_expiring(self, token: dict = None) -> bool:
+        expires_at = (token or self.token).get("expires_at")
+        return expires_at is not None and float(expires_at) - self.token_refresh_margin <= time.time()
+
+    def _can_refresh_token(self) -> bool:
+        return bool(self.token and self.token.get("refresh_token") and self.redirect_uri)
+
+    def _ensure_token(self) -> None:
+        if self._can_refresh_token() and self._token_expiring():
+            self._refresh_stale_token(self.token["access_token"])
+
+    def _refresh_stale_token(self, stale_access_token: str) -> None:
+        """Refreshes the token unless another thread already replaced the stale access token. Concurrent callers wait
+        for the refresh in flight instead of sending their own.
+
+        Args:
+            stale_access_token (str): Access token found expired or rejected by the caller.
+        """
+        with self._token_lock, self._token_cache_lock():
+            if self.token["access_token"] != stale_access_token or self._adopt_cached_token(stale_access_token):
+                return
+            response = self.refresh_token(self.redirect_uri, self.token["refresh_token"])
+            self._set_refreshed_token(response.data)
+
+    def _token_cache_lock(self):
+        if self.token_cache:
+            return self.token_cache.lock(self.token_cache_key)
+        return contextlib.nullcontext()
+
+    def _adopt_cached_token(self, stale_access_token: str) -> bool:
+        """Uses the cached token if another client or process already refreshed it.
+
+        Args:
+            stale_access_token (str): Access token found expired or rejected by the caller.
+
+        Returns:
+            bool: True if the cached token was adopted.
+        """
+        if not self.token_cache:
+            return False
+        token = self.token_cache.get(self.token_cache_key)
+        if not token or token.get("access_token") == stale_access_token or self._token_expiring(token):
+            return False
+        self.token = token
+        return True
+
+    def _set_refreshed_token(self, token: dict) -> None:
+        token = dict(token)
+        token.setdefault("refresh_token", self.token["refresh_token"])
+        self.set_token(token)
+        if self.on_token_refresh:
+            self.on_token_refresh(self.token)
 
     def set_workbook_session_id(self, workbook_session_id: dict) -> None:
         """Sets the Workbook Session Id token for its use in this library.
@@ -176,6 +360,43 @@ class Client(object):
         """
         self.workbook_session_id = workbook_session_id
 
+    def get_workbook_session_id(self, workbook_id: str = None) -> Optional[str]:
+        """Workbook session to use for a workbook: its session in the attached WorkbookSessions if any, the Workbook
+        Session Id set with set_workbook_session_id otherwise.
+
+        Args:
+            workbook_id (str, optional): Excel file ID. Defaults to None.
+
+        Returns:
+            Optional[str]: Workbook Session ID.
+        """
+        if self.workbook_sessions is not None and workbook_id is not None:
+            return self.workbook_sessions.get(workbook_id)
+        return self.workbook_session_id
+
+    def batch(self) -> Batch:
+        """Starts a JSON batch. Module methods called on it are queued and sent together by `Batch.execute`.
+
+        https://docs.microsoft.com/en-us/graph/json-batching
+
+        Returns:
+            Batch: Empty batch bound to this client.
+        """
+        return Batch(self)
+
+    def delta(self, store: DeltaStateStore = None) -> DeltaSync:
+        """Starts an incremental synchronization helper based on delta queries.
+
+        https://docs.microsoft.com/en-us/graph/delta-query-overview
+
+        Args:
+            store (DeltaStateStore, optional): Where delta links are kept. Defaults to in memory.
+
+        Returns:
+            DeltaSync: Delta synchronization bound to this client.
+        """
+        return DeltaSync(self, store)
+
     def get_next(self, response: Response) -> Optional[Response]:
         """Retrieves the next page for the argument response if any. This allows to perform a loop in case you
         want to paginate the response yourself.
@@ -192,7 +413,8 @@ class Client(object):
         if "@odata.nextLink" not in response.data:
             return None
 
-        return self._do_get(response.data["@odata.nextLink"])
+        with priority(BULK, override=False):
+            return self._do_get(response.data["@odata.nextLink"])
 
     def _paginate_response(self, response: Response) -> Response:
         """Some queries against Microsoft Graph return multiple pages of data either due to server-side paging or due to
@@ -212,16 +434,90 @@ class Client(object):
             return response
 
         # Copy data to avoid side effects
-        data = list(response.data["value"])
-
-        while "@odata.nextLink" in response.data:
-            response = self.get_next(response)
+        data = []
+        for response in self.iter_pages(response):
             if isinstance(response.data, dict) and "value" in response.data:
                 data.extend(response.data["value"])
 
         response.data["value"] = data
         return response
 
+    def iter_pages(self, response: Response, prefetch: int = 0) -> Iterator[Response]:
+        """Lazily yields the argument response and then every following page. The next page is only requested once
+        the previous one has been consumed, so stopping the loop stops the requests.
+
+        With prefetch, a background thread downloads up to that many pages ahead while the caller processes the
+        current one.
+
+        https://docs.microsoft.com/en-us/graph/paging?context=graph%2Fapi%2F1.0&view=graph-rest-1.0
+
+        Args:
+            response (Response): Graph API Response, usually the first page.
+            prefetch (int, optional): Number of pages to fetch ahead in the background. Defaults to 0.
+
+        Yields:
+            Response: Graph API Response of each page.
+        """
+        if prefetch > 0:
+            yield from self._prefetch_pages(response, prefetch)
+            return
+
+        while response is not None:
+            yield response
+            response = self.get_next(response)
+
+    def _prefetch_pages(self, response: Response, prefetch: int) -> Iterator[Response]:
+        pages = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch(page: Response) -> None:
+            try:
+                while page is not None and not stop.is_set():
+                    page = self.get_next(page)
+                    if page is not None and not put((page, None)):
+                        return
+            except Exception as e:
+                put((None, e))
+                return
+            put((None, None))
+
+        worker = threading.Thread(target=contextvars.copy_context().run, args=(fetch, response), daemon=True)
+        worker.start()
+        try:
+            yield response
+            while True:
+                page, error = pages.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+        finally:
+            stop.set()
+
+    def iter_values(self, response: Response, prefetch: int = 0) -> Iterator[dict]:
+        """Lazily yields the items of the argument response and of every following page.
+
+        Args:
+            response (Response): Graph API Response, usually the first page.
+            prefetch (int, optional): Number of pages to fetch ahead in the background. Defaults to 0.
+
+        Yields:
+            dict: Each item of the collection.
+        """
+        for page in self.iter_pages(response, prefetch=prefetch):
+            if isinstance(page.data, dict):
+                yield from page.data.get("value", [])
+
     def _get(self, url, **kwargs) -> Response:
         response = self._do_get(url, **kwargs)
         if self.paginate:
@@ -229,8 +525,69 @@ class Client(object):
 
         return response
 
+    def _iter(self, url, prefetch: int = 0, model: type = None, **kwargs) -> Iterator:
+        if model is None:
+            yield from self.iter_values(self._do_get(url, **kwargs), prefetch=prefetch)
+            return
+
+        kwargs["params"] = dict(kwargs.get("params") or {})
+        kwargs["params"].setdefault("$select", model.select())
+        for value in self.iter_values(self._do_get(url, **kwargs), prefetch=prefetch):
+            yield model.from_dict(value)
+
     def _do_get(self, url, **kwargs) -> Response:
-        return self._request("GET", url, **kwargs)
+        if self.response_cache is None:
+            return self._request("GET", url, **kwargs)
+
+        key, entry = self._cache_lookup(url, kwargs)
+        return self._cache_store(key, entry, self._request("GET", url, **kwargs))
+
+    def _cache_lookup(self, url, kwargs: dict) -> tuple:
+        """Finds the cached entry of a GET request and makes the request conditional on its ETag.
+
+        Args:
+            url (str): Requested url.
+            kwargs (dict): Request arguments, updated with the If-None-Match header.
+
+        Returns:
+            tuple: Cache key and entry, (None, None) if the request is not cacheable.
+        """
+        headers = kwargs.get("headers") or {}
+        if "Range" in headers or kwargs.get("stream"):
+            return None, None
+        select = str((kwargs.get("params") or {}).get("$select", ""))
+        if any(prop in select for prop in UNCACHEABLE_PROPERTIES):
+            return None, None
+
+        params = sorted((kwargs.get("params") or {}).items())
+        key = "{} {}?{}".format(self.token_cache_key, url, urlencode(params))
+        entry = self.response_cache.get(key)
+        if entry is not None:
+            kwargs["headers"] = dict(headers, **{"If-None-Match": entry.etag})
+        return key, entry
+
+    def _cache_store(self, key: str, entry: CacheEntry, response: Response) -> Response:
+        if key is None:
+            return response
+        if response.status_code == 304 and entry is not None:
+            original = RawResponse(entry.status_code, entry.headers, entry.content)
+            cached = Response(original=original, codec=self.json_codec)
+            cached.retries = response.retries
+            return cached
+
+        headers = response.original.headers
+        if response.status_code != 200 or "application/json" not in headers.get("Content-Type", ""):
+            return response
+        content = response.original.content
+        if any(prop.encode() in content for prop in UNCACHEABLE_PROPERTIES):
+            # For e.g. a driveItem fetched without $select.
+            return response
+        etag = headers.get("ETag")
+        if not etag and isinstance(response.data, dict):
+            etag = response.data.get("@odata.etag")
+        if etag:
+            self.response_cache.set(key, CacheEntry(etag, 200, dict(headers), content))
+        return response
 
     def _post(self, url, **kwargs):
         return self._request("POST", url, **kwargs)
@@ -245,6 +602,103 @@ class Client(object):
         return self._request("DELETE", url, **kwargs)
 
     def _request(self, method, url, headers=None, **kwargs) -> Response:
+        self._ensure_token()
+        _headers = self._prepare_headers(headers)
+        self._encode_json(kwargs)
+        if self.requests_hooks:
+            kwargs.update({"hooks": self.requests_hooks})
+        kwargs.setdefault("timeout", self.timeout)
+
+        attempt = 0
+        replayed = False
+        started = time.monotonic()
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire(method, url)
+            response = self._send(method, url, headers=_headers, **kwargs)
+            if response.status_code == 401 and not replayed and self._can_refresh_token():
+                # Replay once with a fresh token.
+                replayed = True
+                response.close()
+                self._refresh_stale_token(_headers["Authorization"][len("Bearer ") :])
+                _headers["Authorization"] = "Bearer " + self.token["access_token"]
+                continue
+            delay = self._retry_delay(method, url, response, attempt, started)
+            if delay is None:
+                break
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+        r = self._parse(response)
+        r.retries = attempt
+        return r
+
+    def _stream(self, url, chunk_size: int = 1024 * 1024, headers: dict = None) -> Iterator[bytes]:
+        """Streams the body of a pre-authenticated url, for e.g. an @microsoft.graph.downloadUrl, chunk by chunk.
+
+        Args:
+            url (str): Pre-authenticated url.
+            chunk_size (int, optional): Size of the yielded chunks. Defaults to 1 MiB.
+            headers (dict, optional): Extra headers, for e.g. Range. Defaults to None.
+
+        Yields:
+            bytes: Chunks of the body.
+        """
+        response = self._request_pre_authenticated("GET", url, headers=headers, stream=True)
+        try:
+            for chunk in response.iter_content(chunk_size):
+                yield chunk
+        finally:
+            response.close()
+
+    def _request_pre_authenticated(self, method, url, headers: dict = None, **kwargs):
+        """Sends a request to a pre-authenticated url, for e.g. a download url or an upload session url. The bearer
+        token is not sent, the url carries its own short-lived authentication.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Pre-authenticated url.
+            headers (dict, optional): Request headers. Defaults to None.
+
+        Returns:
+            The raw response, the matching exception is raised for error statuses.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        started = time.monotonic()
+        while True:
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            delay = self._retry_delay(method, url, response, attempt, started)
+            if delay is None:
+                break
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+        if response.status_code >= 299:
+            # Raises the matching exception, error bodies are small.
+            self._parse(response)
+        return response
+
+    def _send(self, method, url, **kwargs):
+        if self.scheduler:
+            with self.scheduler.slot(method, url):
+                return self.session.request(method, url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def _retry_delay(self, method, url, response, attempt: int, started: float) -> Optional[float]:
+        if self.retry is None:
+            return None
+        return self.retry.next_delay(method, url, response, attempt, time.monotonic() - started)
+
+    def _encode_json(self, kwargs: dict) -> None:
+        if kwargs.get("json") is not None:
+            kwargs["data"] = self.json_codec.dumps(kwargs.pop("json"))
+        else:
+            kwargs.pop("json", None)
+
+    def _prepare_headers(self, headers: dict = None) -> dict:
         _headers = {
             "Accept": "application/json",
         }
@@ -254,63 +708,70 @@ class Client(object):
 
         _headers["Authorization"] = "Bearer " + self.token["access_token"]
 
-        if self.requests_hooks:
-            kwargs.update({"hooks": self.requests_hooks})
         if "Content-Type" not in _headers:
             _headers["Content-Type"] = "application/json"
-        return self._parse(requests.request(method, url, headers=_headers, **kwargs))
+        return _headers
 
     def _parse(self, response) -> Response:
-        status_code = response.status_code
-        r = Response(original=response)
-        if status_code < 299:
+        r = Response(original=response, codec=self.json_codec)
+        if r.status_code < 299 or r.status_code == 304:
             return r
-        elif status_code == 400:
-            raise exceptions.BadRequest(r.data)
+        error = self._error(r)
+        # Kept for the retries made outside of the Retry policy, to wait for the Retry-After of the response.
+        error.response = r
+        raise error
+
+    def _error(self, r: Response) -> exceptions.BaseError:
+        status_code = r.status_code
+        if status_code == 400:
+            return exceptions.BadRequest(r.data)
         elif status_code == 401:
-            raise exceptions.Unauthorized(r.data)
+            return exceptions.Unauthorized(r.data)
         elif status_code == 403:
-            raise exceptions.Forbidden(r.data)
+            return exceptions.Forbidden(r.data)
         elif status_code == 404:
-            raise exceptions.NotFound(r.data)
+            return exceptions.NotFound(r.data)
         elif status_code == 405:
-            raise exceptions.MethodNotAllowed(r.data)
+            return exceptions.MethodNotAllowed(r.data)
         elif status_code == 406:
-            raise exceptions.NotAcceptable(r.data)
+            return exceptions.NotAcceptable(r.data)
         elif status_code == 409:
-            raise exceptions.Conflict(r.data)
+            return exceptions.Conflict(r.data)
         elif status_code == 410:
-            raise exceptions.Gone(r.data)
+            return exceptions.Gone(r.data)
         elif status_code == 411:
-            raise exceptions.LengthRequired(r.data)
+            return exceptions.LengthRequired(r.data)
         elif status_code == 412:
-            raise exceptions.PreconditionFailed(r.data)
+            return exceptions.PreconditionFailed(r.data)
         elif status_code == 413:
-            raise exceptions.RequestEntityTooLarge(r.data)
+            return exceptions.RequestEntityTooLarge(r.data)
         elif status_code == 415:
-            raise exceptions.UnsupportedMediaType(r.data)
+            return exceptions.UnsupportedMediaType(r.data)
         elif status_code == 416:
-            raise exceptions.RequestedRangeNotSatisfiable(r.data)
+            return exceptions.RequestedRangeNotSatisfiable(r.data)
         elif status_code == 422:
-            raise exceptions.UnprocessableEntity(r.data)
+            return exceptions.UnprocessableEntity(r.data)
+        elif status_code == 424:
+            return exceptions.FailedDependency(r.data)
         elif status_code == 429:
-            raise exceptions.TooManyRequests(r.data)
+            return exceptions.TooManyRequests(r.data)
         elif status_code == 500:
-            raise exceptions.InternalServerError(r.data)
+            return exceptions.InternalServerError(r.data)
         elif status_code == 501:
-            raise exceptions.NotImplemented(r.data)
+            return exceptions.NotImplemented(r.data)
         elif status_code == 503:
-            raise exceptions.ServiceUnavailable(r.data)
+            return exceptions.ServiceUnavailable(r.data)
         elif status_code == 504:
-            raise exceptions.GatewayTimeout(r.data)
+            return exceptions.GatewayTimeout(r.data)
         elif status_code == 507:
-            raise exceptions.InsufficientStorage(r.data)
+            return exceptions.InsufficientStorage(r.data)
         elif status_code == 509:
-            raise exceptions.BandwidthLimitExceeded(r.data)
+            return exceptions.BandwidthLimitExceeded(r.data)
         else:
-            if r["error"]["innerError"]["code"] == "lockMismatch":
+            error = (r.data.get("error") or {}) if isinstance(r.data, dict) else {}
+            if (error.get("innerError") or {}).get("code") == "lockMismatch":
                 # File is currently locked due to being open in the web browser
                 # while attempting to reupload a new version to the drive.
                 # Thus temporarily unavailable.
-                raise exceptions.ServiceUnavailable(r.data)
-            raise exceptions.UnknownError(r.data)
+                return exceptions.ServiceUnavailable(r.data)
+            return exceptions.UnknownError(r.data)
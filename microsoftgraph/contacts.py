@@ -1,4 +1,7 @@
+from typing import Iterator
+
 from microsoftgraph.decorators import token_required
+from microsoftgraph.models import Contact
 from microsoftgraph.response import Response
 
 
@@ -44,6 +47,48 @@ class Contacts(object):
         url = "me/contactfolders/{}/contacts".format(folder_id) if folder_id else "me/contacts"
         return self._client._get(self._client.base_url + url, params=params)
 
+    @token_required
+    def iter_contacts(
+        self, folder_id: str = None, params: dict = None, prefetch: int = 0, as_model: bool = False
+    ) -> Iterator:
+        """Lazily iterate over the contacts of the signed-in user, requesting one page at a time.
+
+        https://docs.microsoft.com/en-us/graph/api/user-list-contacts?view=graph-rest-1.0&tabs=http
+
+        Args:
+            folder_id (str): Folder ID.
+            params (dict, optional): Query. Defaults to None.
+            prefetch (int, optional): Number of pages to download ahead in the background. Defaults to 0.
+            as_model (bool, optional): Yield compact Contact models, requesting only their properties. Defaults to
+            False.
+
+        Yields:
+            dict or Contact: Contact.
+        """
+        url = "me/contactfolders/{}/contacts".format(folder_id) if folder_id else "me/contacts"
+        model = Contact if as_model else None
+        return self._client._iter(self._client.base_url + url, params=params, prefetch=prefetch, model=model)
+
+    @token_required
+    def list_contacts_delta(self, folder_id: str = None, delta_link: str = None, params: dict = None) -> Response:
+        """Get a set of contacts that have been added, deleted, or updated in a specified folder. The last page holds
+        an @odata.deltaLink to request the next changes with.
+
+        https://docs.microsoft.com/en-us/graph/api/contact-delta?view=graph-rest-1.0&tabs=http
+
+        Args:
+            folder_id (str, optional): Folder ID. Defaults to None, default contacts folder.
+            delta_link (str, optional): @odata.deltaLink of a previous round. Defaults to None, initial round.
+            params (dict, optional): Query, only used in the initial round. Defaults to None.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        if delta_link:
+            return self._client._get(delta_link)
+        url = "me/contactFolders/{}/contacts/delta".format(folder_id) if folder_id else "me/contacts/delta"
+        return self._client._get(self._client.base_url + url, params=params)
+
     @token_required
     def create_contact(
         self,
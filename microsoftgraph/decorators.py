@@ -1,4 +1,5 @@
-from microsoftgraph.exceptions import TokenRequired
+from microsoftgraph.exceptions import BaseError, TokenRequired
+from microsoftgraph.workbook_sessions import is_session_error
 from functools import wraps
 
 
@@ -17,8 +18,20 @@ def workbook_session_id_required(func):
     @wraps(func)
     def helper(*args, **kwargs):
         module = args[0]
-        if not module._client.workbook_session_id:
+        workbook_id = kwargs.get("workbook_id", args[1] if len(args) > 1 else None)
+        session_id = module._client.get_workbook_session_id(workbook_id)
+        if not session_id:
             raise TokenRequired("You must set the Workbook Session Id.")
-        return func(*args, **kwargs)
+        sessions = getattr(module._client, "workbook_sessions", None)
+        if sessions is None or workbook_id is None:
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        except BaseError as e:
+            if not is_session_error(e):
+                raise
+            # The pooled session expired, retry once within a new one.
+            sessions.invalidate(workbook_id, session_id)
+            return func(*args, **kwargs)
 
     return helper
@@ -0,0 +1,246 @@
+import abc
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Optional
+
+from microsoftgraph import exceptions
+from microsoftgraph.utils import format_time, require_sync_client
+
+
+class DeltaStateStore(abc.ABC):
+    """Stores the @odata.deltaLink of each synchronized collection. Subclass it to use another store."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, delta_link: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryDeltaStateStore(DeltaStateStore):
+    def __init__(self) -> None:
+        """Delta state kept in memory, for the lifetime of the process."""
+        self._links = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self._links.get(key)
+
+    def set(self, key: str, delta_link: str) -> None:
+        self._links[key] = delta_link
+
+    def delete(self, key: str) -> None:
+        self._links.pop(key, None)
+
+
+class FileDeltaStateStore(DeltaStateStore):
+    def __init__(self, path: str) -> None:
+        """Delta state stored in a JSON file, rewritten atomically on every change.
+
+        Args:
+            path (str): Path of the JSON file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._read().get(key)
+
+    def set(self, key: str, delta_link: str) -> None:
+        with self._lock:
+            links = self._read()
+            links[key] = delta_link
+            self._write(links)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            links = self._read()
+            if links.pop(key, None) is not None:
+                self._write(links)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, links: dict) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".delta-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(links, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class DeltaResult(object):
+    def __init__(self, key: str) -> None:
+        """Outcome of a delta round.
+
+        Args:
+            key (str): State key of the collection.
+        """
+        self.key = key
+        self.changed = []
+        self.removed = []
+        self.full_sync = False
+        self.delta_link = None
+
+    def __repr__(self) -> str:
+        return "<DeltaResult [{}: {} changed, {} removed{}]>".format(
+            self.key, len(self.changed), len(self.removed), ", full sync" if self.full_sync else ""
+        )
+
+
+class DeltaSync(object):
+    def __init__(self, client, store: DeltaStateStore = None, namespace: str = None) -> None:
+        """Incremental synchronization of collections with delta queries.
+
+        The first round lists the whole collection, next rounds only fetch what changed since the previous one. The
+        @odata.deltaLink is stored once every page of a round has been read. When Graph no longer accepts a stored
+        link (410 Gone), the state is dropped and a full synchronization is made, flagged with full_sync.
+
+        https://docs.microsoft.com/en-us/graph/delta-query-overview
+
+        Args:
+            client (Client): Library Client.
+            store (DeltaStateStore, optional): Where delta links are kept. Defaults to a MemoryDeltaStateStore.
+            namespace (str, optional): Prefix of the state keys. Defaults to the client token cache key.
+        """
+        require_sync_client(client, "DeltaSync")
+        self._client = client
+        self.store = store if store is not None else MemoryDeltaStateStore()
+        self.namespace = namespace if namespace is not None else client.token_cache_key
+
+    def messages(self, folder_id: str, params: dict = None) -> DeltaResult:
+        """Messages added, updated or removed in a mail folder.
+
+        Args:
+            folder_id (str): Mail Folder ID.
+            params (dict, optional): Query of the initial round, for e.g. $select. Defaults to None.
+
+        Returns:
+            DeltaResult: Changes since the previous round.
+        """
+        url = "me/mailFolders/{}/messages/delta".format(folder_id)
+        return self.run("mail:" + folder_id, self._client.base_url + url, params=params)
+
+    def events(
+        self, start_datetime: datetime, end_datetime: datetime, calendar_id: str = None, params: dict = None
+    ) -> DeltaResult:
+        """Events added, updated or removed in a calendar view.
+
+        Args:
+            start_datetime (datetime): Start of the time range.
+            end_datetime (datetime): End of the time range.
+            calendar_id (str, optional): Calendar ID. Defaults to None.
+            params (dict, optional): Query of the initial round. Defaults to None.
+
+        Returns:
+            DeltaResult: Changes since the previous round.
+        """
+        if isinstance(start_datetime, datetime):
+            start_datetime = format_time(start_datetime)
+        if isinstance(end_datetime, datetime):
+            end_datetime = format_time(end_datetime)
+
+        params = dict(params or {})
+        params["startDateTime"] = start_datetime
+        params["endDateTime"] = end_datetime
+        url = "me/calendars/{}/calendarView/delta".format(calendar_id) if calendar_id else "me/calendarView/delta"
+        key = "calendar:{}:{}:{}".format(calendar_id or "", params["startDateTime"], params["endDateTime"])
+        return self.run(key, self._client.base_url + url, params=params)
+
+    def contacts(self, folder_id: str = None, params: dict = None) -> DeltaResult:
+        """Contacts added, updated or removed in a contact folder.
+
+        Args:
+            folder_id (str, optional): Folder ID. Defaults to None, default contacts folder.
+            params (dict, optional): Query of the initial round. Defaults to None.
+
+        Returns:
+            DeltaResult: Changes since the previous round.
+        """
+        url = "me/contactFolders/{}/contacts/delta".format(folder_id) if folder_id else "me/contacts/delta"
+        return self.run("contacts:" + (folder_id or ""), self._client.base_url + url, params=params)
+
+    def drive_items(self, folder_id: str = None, params: dict = None) -> DeltaResult:
+        """DriveItems added, updated or removed under a folder.
+
+        Args:
+            folder_id (str, optional): Unique identifier of the folder. Defaults to None, drive root.
+            params (dict, optional): Query of the initial round. Defaults to None.
+
+        Returns:
+            DeltaResult: Changes since the previous round.
+        """
+        url = "me/drive/items/{}/delta".format(folder_id) if folder_id else "me/drive/root/delta"
+        return self.run("drive:" + (folder_id or ""), self._client.base_url + url, params=params)
+
+    def reset(self, key: str) -> None:
+        """Forgets the state of a collection, the next round will be a full synchronization.
+
+        Args:
+            key (str): State key, for e.g. "mail:inbox".
+        """
+        self.store.delete(self._state_key(key))
+
+    def run(self, key: str, url: str, params: dict = None) -> DeltaResult:
+        """Runs a delta round for any delta url.
+
+        Args:
+            key (str): State key of the collection.
+            url (str): Delta url of the initial round.
+            params (dict, optional): Query of the initial round. Defaults to None.
+
+        Returns:
+            DeltaResult: Changes since the previous round.
+        """
+        state_key = self._state_key(key)
+        delta_link = self.store.get(state_key)
+        result = DeltaResult(key)
+        result.full_sync = delta_link is None
+        try:
+            self._collect(result, self._client._do_get(delta_link) if delta_link else None, url, params)
+        except exceptions.Gone:
+            if delta_link is None:
+                raise
+            # The sync state expired or was invalidated: start over.
+            self.store.delete(state_key)
+            result = DeltaResult(key)
+            result.full_sync = True
+            self._collect(result, None, url, params)
+
+        if result.delta_link:
+            self.store.set(state_key, result.delta_link)
+        return result
+
+    def _collect(self, result: DeltaResult, response, url: str, params: dict = None) -> None:
+        if response is None:
+            response = self._client._do_get(url, params=params)
+        for page in self._client.iter_pages(response):
+            if not isinstance(page.data, dict):
+                continue
+            for item in page.data.get("value", []):
+                if "@removed" in item or "deleted" in item:
+                    result.removed.append(item)
+                else:
+                    result.changed.append(item)
+            if "@odata.deltaLink" in page.data:
+                result.delta_link = page.data["@odata.deltaLink"]
+
+    def _state_key(self, key: str) -> str:
+        return "{}|{}".format(self.namespace, key) if self.namespace else key
@@ -66,6 +66,10 @@ class UnprocessableEntity(BaseError):
     pass
 
 
+class FailedDependency(BaseError):
+    pass
+
+
 class TooManyRequests(BaseError):
     pass
 
@@ -92,3 +96,7 @@ class InsufficientStorage(BaseError):
 
 class BandwidthLimitExceeded(BaseError):
     pass
+
+
+class IntegrityError(BaseError):
+    pass
@@ -1,10 +1,72 @@
 import base64
+from typing import BinaryIO, Iterator, Union
 
-import requests
-
+from microsoftgraph import exceptions
 from microsoftgraph.decorators import token_required
+from microsoftgraph.models import DriveItem
+from microsoftgraph.quickxor import QuickXorHash
 from microsoftgraph.response import Response
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_SELECT = "id,name,size,file,@microsoft.graph.downloadUrl"
+
+
+def encode_share_url(share_url: str) -> str:
+    """Encodes a sharing url into a share id usable with the shares API.
+
+    https://docs.microsoft.com/en-us/graph/api/shares-get?view=graph-rest-1.0&tabs=http#encoding-sharing-urls
+
+    Args:
+        share_url (str): Sharing url.
+
+    Returns:
+        str: Share id.
+    """
+    base64_value = base64.b64encode(share_url.encode()).decode()
+    return "u!" + base64_value.rstrip("=").replace("/", "_").replace("+", "-")
+
+
+def write_chunks(chunks: Iterator[bytes], destination: Union[str, BinaryIO], hasher=None) -> int:
+    """Writes chunks to a path or a binary file object.
+
+    Args:
+        chunks (Iterator[bytes]): Chunks to write.
+        destination (str or BinaryIO): File path or object opened in binary mode.
+        hasher (optional): Updated with every chunk on the fly, for e.g. a QuickXorHash. Defaults to None.
+
+    Returns:
+        int: Number of bytes written.
+    """
+    if hasattr(destination, "write"):
+        written = 0
+        for chunk in chunks:
+            destination.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+            written += len(chunk)
+        return written
+
+    with open(destination, "wb") as f:
+        return write_chunks(chunks, f, hasher=hasher)
+
+
+def verify_quickxor(drive_item: dict, hasher: QuickXorHash) -> None:
+    """Checks the quickXorHash of transferred content against the one Graph reports, if any.
+
+    Args:
+        drive_item (dict): DriveItem with its file facet.
+        hasher (QuickXorHash): Hash of the transferred content.
+
+    Raises:
+        IntegrityError: The hashes differ.
+    """
+    expected = ((drive_item.get("file") or {}).get("hashes") or {}).get("quickXorHash")
+    if not expected:
+        return
+    actual = hasher.b64digest()
+    if actual != expected:
+        raise exceptions.IntegrityError("quickXorHash mismatch: expected {}, got {}".format(expected, actual))
+
 
 class Files(object):
     def __init__(self, client) -> None:
@@ -61,6 +123,49 @@ class Files(object):
         url = "me/drive/items/{}/children".format(folder_id)
         return self._client._get(self._client.base_url + url, params=params)
 
+    @token_required
+    def drive_iter_children(
+        self, folder_id: str = None, params: dict = None, prefetch: int = 0, as_model: bool = False
+    ) -> Iterator:
+        """Lazily iterate over the DriveItems in the children relationship of a folder, or of the drive root if no
+        folder is given, requesting one page at a time.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-list-children?view=graph-rest-1.0&tabs=http
+
+        Args:
+            folder_id (str, optional): Unique identifier of the folder. Defaults to None.
+            params (dict, optional): Query. Defaults to None.
+            prefetch (int, optional): Number of pages to download ahead in the background. Defaults to 0.
+            as_model (bool, optional): Yield compact DriveItem models, requesting only their properties. Defaults to
+            False.
+
+        Yields:
+            dict or DriveItem: DriveItem.
+        """
+        url = "me/drive/items/{}/children".format(folder_id) if folder_id else "me/drive/root/children"
+        model = DriveItem if as_model else None
+        return self._client._iter(self._client.base_url + url, params=params, prefetch=prefetch, model=model)
+
+    @token_required
+    def drive_delta(self, folder_id: str = None, delta_link: str = None, params: dict = None) -> Response:
+        """Track changes in a driveItem and its children over time. Deleted items carry a deleted facet. The last page
+        holds an @odata.deltaLink to request the next changes with.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-delta?view=graph-rest-1.0&tabs=http
+
+        Args:
+            folder_id (str, optional): Unique identifier of the folder. Defaults to None, drive root.
+            delta_link (str, optional): @odata.deltaLink of a previous round. Defaults to None, initial round.
+            params (dict, optional): Query, only used in the initial round. Defaults to None.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        if delta_link:
+            return self._client._get(delta_link)
+        url = "me/drive/items/{}/delta".format(folder_id) if folder_id else "me/drive/root/delta"
+        return self._client._get(self._client.base_url + url, params=params)
+
     @token_required
     def drive_get_item(self, item_id: str, params: dict = None, **kwargs) -> Response:
         """Retrieve the metadata for a driveItem in a drive by file system path or ID. It may also be the unique ID of a
@@ -109,12 +214,11 @@ class Files(object):
         Returns:
             Response: Microsoft Graph Response.
         """
-        base64_value = base64.b64encode(share_id.encode()).decode()
-        encoded_share_url = "u!" + base64_value.rstrip("=").replace("/", "_").replace("+", "-")
-        url = self._client.base_url + "shares/{}/driveItem".format(encoded_share_url)
+        url = self._client.base_url + "shares/{}/driveItem".format(encode_share_url(share_id))
         drive_item = self._client._get(url)
-        file_download_url = drive_item["@microsoft.graph.downloadUrl"]
-        return drive_item["name"], requests.get(file_download_url).content
+        file_download_url = drive_item.data["@microsoft.graph.downloadUrl"]
+        response = self._client.session.get(file_download_url, timeout=self._client.timeout)
+        return drive_item.data["name"], response.content
 
     @token_required
     def drive_download_large_contents(self, downloadUrl: str, offset: int, size: int) -> Response:
@@ -134,6 +238,103 @@ class Files(object):
         headers = {"Range": f"bytes={offset}-{size + offset - 1}"}
         return self._client._get(downloadUrl, headers=headers)
 
+    @token_required
+    def drive_iter_contents(self, item_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """Stream the contents of a DriveItem chunk by chunk, memory stays flat whatever the size of the file. The
+        pre-authenticated @microsoft.graph.downloadUrl is followed without the bearer token.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-get-content?view=graph-rest-1.0&tabs=http
+
+        Args:
+            item_id (str): ID of a driveItem.
+            chunk_size (int, optional): Size of the yielded chunks. Defaults to 1 MiB.
+
+        Returns:
+            Iterator[bytes]: Chunks of the file.
+        """
+        drive_item = self.drive_get_item(item_id, params={"$select": DOWNLOAD_SELECT})
+        return self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size=chunk_size)
+
+    @token_required
+    def drive_download_to(
+        self,
+        item_id: str,
+        destination: Union[str, BinaryIO],
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        verify: bool = True,
+    ) -> Response:
+        """Stream the contents of a DriveItem to a file path or a binary file object.
+
+        Args:
+            item_id (str): ID of a driveItem.
+            destination (str or BinaryIO): File path or object opened in binary mode.
+            chunk_size (int, optional): Size of the chunks read and written. Defaults to 1 MiB.
+            verify (bool, optional): Check the quickXorHash of the content on the fly. Defaults to True.
+
+        Raises:
+            IntegrityError: The content does not match the quickXorHash of the driveItem.
+
+        Returns:
+            Response: Microsoft Graph Response of the driveItem.
+        """
+        drive_item = self.drive_get_item(item_id, params={"$select": DOWNLOAD_SELECT})
+        chunks = self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size=chunk_size)
+        hasher = QuickXorHash() if verify else None
+        write_chunks(chunks, destination, hasher=hasher)
+        if hasher is not None:
+            verify_quickxor(drive_item.data, hasher)
+        return drive_item
+
+    @token_required
+    def drive_iter_shared_contents(self, share_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """Stream the contents of a shared DriveItem chunk by chunk.
+
+        https://docs.microsoft.com/en-us/graph/api/shares-get?view=graph-rest-1.0&tabs=http
+
+        Args:
+            share_id (str): Sharing url of a driveItem.
+            chunk_size (int, optional): Size of the yielded chunks. Defaults to 1 MiB.
+
+        Returns:
+            Iterator[bytes]: Chunks of the file.
+        """
+        drive_item = self._get_shared_item(share_id)
+        return self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size=chunk_size)
+
+    @token_required
+    def drive_download_shared_to(
+        self,
+        share_id: str,
+        destination: Union[str, BinaryIO],
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        verify: bool = True,
+    ) -> Response:
+        """Stream the contents of a shared DriveItem to a file path or a binary file object.
+
+        Args:
+            share_id (str): Sharing url of a driveItem.
+            destination (str or BinaryIO): File path or object opened in binary mode.
+            chunk_size (int, optional): Size of the chunks read and written. Defaults to 1 MiB.
+            verify (bool, optional): Check the quickXorHash of the content on the fly. Defaults to True.
+
+        Raises:
+            IntegrityError: The content does not match the quickXorHash of the driveItem.
+
+        Returns:
+            Response: Microsoft Graph Response of the driveItem.
+        """
+        drive_item = self._get_shared_item(share_id)
+        chunks = self._client._stream(drive_item.data["@microsoft.graph.downloadUrl"], chunk_size=chunk_size)
+        hasher = QuickXorHash() if verify else None
+        write_chunks(chunks, destination, hasher=hasher)
+        if hasher is not None:
+            verify_quickxor(drive_item.data, hasher)
+        return drive_item
+
+    def _get_shared_item(self, share_id: str) -> Response:
+        url = self._client.base_url + "shares/{}/driveItem".format(encode_share_url(share_id))
+        return self._client._get(url, params={"$select": DOWNLOAD_SELECT})
+
     @token_required
     def drive_upload_new_file(self, filename: str, file_path: str, params: dict = None, **kwargs) -> Response:
         """The simple upload API allows you to provide the contents of a new file in a single API call. This method only
@@ -174,6 +375,99 @@ class Files(object):
         url = "me/drive/items/{}/content".format(item_id)
         return self._client._put(self._client.base_url + url, params=params, data=content, **kwargs)
 
+    @token_required
+    def drive_create_folder(
+        self, name: str, parent_id: str = None, parent_path: str = None, conflict_behavior: str = "fail", **kwargs
+    ) -> Response:
+        """Create a new folder in the drive root, under a parent folder id or under a parent path.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-post-children?view=graph-rest-1.0&tabs=http
+
+        Args:
+            name (str): Name of the folder.
+            parent_id (str, optional): Id of the parent folder. Defaults to None.
+            parent_path (str, optional): Path of the parent folder from the drive root, for e.g. "/Documents".
+            Defaults to None, the drive root.
+            conflict_behavior (str, optional): fail, replace or rename. Defaults to "fail".
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        if parent_id:
+            url = "me/drive/items/{}/children".format(parent_id)
+        elif parent_path and parent_path.strip("/"):
+            url = "me/drive/root:/{}:/children".format(parent_path.strip("/"))
+        else:
+            url = "me/drive/root/children"
+        data = {"name": name, "folder": {}, "@microsoft.graph.conflictBehavior": conflict_behavior}
+        return self._client._post(self._client.base_url + url, json=data, **kwargs)
+
+    @token_required
+    def drive_move_item(self, item_id: str, name: str = None, parent_id: str = None, **kwargs) -> Response:
+        """Rename a driveItem and/or move it to another folder, without transferring its content.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-move?view=graph-rest-1.0&tabs=http
+
+        Args:
+            item_id (str): Id of the driveItem.
+            name (str, optional): New name. Defaults to None, unchanged.
+            parent_id (str, optional): Id of the new parent folder. Defaults to None, unchanged.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        data = {}
+        if name:
+            data["name"] = name
+        if parent_id:
+            data["parentReference"] = {"id": parent_id}
+        url = "me/drive/items/{}".format(item_id)
+        return self._client._patch(self._client.base_url + url, json=data, **kwargs)
+
+    @token_required
+    def drive_delete_item(self, item_id: str, **kwargs) -> Response:
+        """Delete a driveItem, it is moved to the recycle bin.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-delete?view=graph-rest-1.0&tabs=http
+
+        Args:
+            item_id (str): Id of the driveItem.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        url = "me/drive/items/{}".format(item_id)
+        return self._client._delete(self._client.base_url + url, **kwargs)
+
+    @token_required
+    def drive_create_upload_session(
+        self, filename: str = None, item_id: str = None, conflict_behavior: str = "replace", **kwargs
+    ) -> Response:
+        """Create an upload session to upload a file of any size, in chunks sent to the returned uploadUrl.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-createuploadsession?view=graph-rest-1.0
+
+        Args:
+            filename (str, optional): Path of a new file from the drive root, for e.g. "/Documents/report.pdf".
+            Defaults to None.
+            item_id (str, optional): Id of an existing driveItem to replace. Defaults to None.
+            conflict_behavior (str, optional): fail, replace or rename. Defaults to "replace".
+
+        Returns:
+            Response: Microsoft Graph Response.
+
+        Raises:
+            ValueError: Neither filename nor item_id is given.
+        """
+        if item_id:
+            url = "me/drive/items/{}/createUploadSession".format(item_id)
+        elif not filename:
+            raise ValueError("filename or item_id is required.")
+        else:
+            url = "me/drive/root:{}:/createUploadSession".format(filename)
+        data = {"item": {"@microsoft.graph.conflictBehavior": conflict_behavior}}
+        return self._client._post(self._client.base_url + url, json=data, **kwargs)
+
     @token_required
     def search_items(self, q: str, params: dict = None, **kwargs) -> Response:
         """Search the hierarchy of items for items matching a query. You can search within a folder hierarchy, a whole
@@ -0,0 +1,42 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec(object):
+    """Encodes request bodies and decodes responses with the standard library json module."""
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    def __init__(self) -> None:
+        """Encodes and decodes with orjson: pip install microsoftgraph-python[orjson]
+
+        Raises:
+            ImportError: orjson is not installed.
+        """
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson. pip install microsoftgraph-python[orjson]")
+
+    def loads(self, data: bytes):
+        return orjson.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj)
+
+
+def default_codec() -> JSONCodec:
+    """Returns the fastest codec available: orjson when installed, the standard library otherwise.
+
+    Returns:
+        JSONCodec: Codec instance.
+    """
+    return OrjsonCodec() if orjson is not None else JSONCodec()
@@ -1,7 +1,9 @@
 import base64
 import mimetypes
+from typing import Iterator
 
 from microsoftgraph.decorators import token_required
+from microsoftgraph.models import Message
 from microsoftgraph.response import Response
 
 
@@ -32,6 +34,28 @@ class Mail(object):
         url = "me/mailFolders/{}/messages".format(folder_id) if folder_id else "me/messages"
         return self._client._get(self._client.base_url + url, params=params)
 
+    @token_required
+    def iter_messages(
+        self, folder_id: str = None, params: dict = None, prefetch: int = 0, as_model: bool = False
+    ) -> Iterator:
+        """Lazily iterate over the messages in the signed-in user's mailbox, requesting one page at a time.
+
+        https://docs.microsoft.com/en-us/graph/api/user-list-messages?view=graph-rest-1.0&tabs=http
+
+        Args:
+            folder_id (str, optional): Mail Folder ID.
+            params (dict, optional): Query. Defaults to None.
+            prefetch (int, optional): Number of pages to download ahead in the background. Defaults to 0.
+            as_model (bool, optional): Yield compact Message models, requesting only their properties. Defaults to
+            False.
+
+        Yields:
+            dict or Message: Message.
+        """
+        url = "me/mailFolders/{}/messages".format(folder_id) if folder_id else "me/messages"
+        model = Message if as_model else None
+        return self._client._iter(self._client.base_url + url, params=params, prefetch=prefetch, model=model)
+
     @token_required
     def get_message(self, message_id: str, params: dict = None) -> Response:
         """Retrieve the properties and relationships of a message object.
@@ -47,6 +71,26 @@ class Mail(object):
         """
         return self._client._get(self._client.base_url + "me/messages/" + message_id, params=params)
 
+    @token_required
+    def list_messages_delta(self, folder_id: str, delta_link: str = None, params: dict = None) -> Response:
+        """Get a set of messages that have been added, deleted, or updated in a specified folder. The last page holds
+        an @odata.deltaLink to request the next changes with.
+
+        https://docs.microsoft.com/en-us/graph/api/message-delta?view=graph-rest-1.0&tabs=http
+
+        Args:
+            folder_id (str): Mail Folder ID.
+            delta_link (str, optional): @odata.deltaLink of a previous round. Defaults to None, initial round.
+            params (dict, optional): Query, only used in the initial round. Defaults to None.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        if delta_link:
+            return self._client._get(delta_link)
+        url = "me/mailFolders/{}/messages/delta".format(folder_id)
+        return self._client._get(self._client.base_url + url, params=params)
+
     @token_required
     def send_mail(
         self,
@@ -0,0 +1,198 @@
+class Nested(object):
+    def __init__(self, model: type, key: str, many: bool = False) -> None:
+        """Nested structure of a Model, kept as raw data until first accessed.
+
+        Args:
+            model (type): Model class of the nested value.
+            key (str): Graph property name.
+            many (bool, optional): The property is a collection. Defaults to False.
+        """
+        self.model = model
+        self.key = key
+        self.many = many
+        self.slot = None
+
+    def __set_name__(self, owner, name) -> None:
+        self.slot = "_" + name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if value is None or isinstance(value, (Model, tuple)):
+            return value
+        if self.many:
+            value = tuple(self.model.from_dict(item) for item in value)
+        else:
+            value = self.model.from_dict(value)
+        setattr(instance, self.slot, value)
+        return value
+
+
+class ModelMeta(type):
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get("FIELDS", {})
+        nested = {attr: value for attr, value in namespace.items() if isinstance(value, Nested)}
+        namespace["__slots__"] = tuple(fields) + tuple("_" + attr for attr in nested)
+        namespace["_nested"] = tuple(nested.items())
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class Model(object, metaclass=ModelMeta):
+    """Compact, __slots__ based representation of a Graph entity.
+
+    Only the properties declared in FIELDS (attribute name to Graph property) and the Nested ones are kept, every other
+    property of the source dict is dropped. Nested structures are only turned into models when accessed.
+    """
+
+    FIELDS = {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Model":
+        """Builds a model from a Graph dict.
+
+        Args:
+            data (dict): Entity as returned by Graph.
+
+        Returns:
+            Model: Model instance.
+        """
+        instance = cls.__new__(cls)
+        for attr, key in cls.FIELDS.items():
+            setattr(instance, attr, data.get(key))
+        for attr, nested in cls._nested:
+            setattr(instance, nested.slot, data.get(nested.key))
+        return instance
+
+    @classmethod
+    def select(cls) -> str:
+        """Value for the $select query parameter fetching only the properties of this model.
+
+        Returns:
+            str: Comma separated Graph properties.
+        """
+        return ",".join(list(cls.FIELDS.values()) + [nested.key for _, nested in cls._nested])
+
+    def to_dict(self) -> dict:
+        data = {key: getattr(self, attr) for attr, key in self.FIELDS.items()}
+        for attr, nested in self._nested:
+            value = getattr(self, attr)
+            if isinstance(value, tuple):
+                value = [item.to_dict() for item in value]
+            elif isinstance(value, Model):
+                value = value.to_dict()
+            data[nested.key] = value
+        return data
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        attr = next(iter(self.FIELDS), None)
+        return "<{} [{}]>".format(type(self).__name__, getattr(self, attr) if attr else "")
+
+
+class EmailAddress(Model):
+    FIELDS = {"name": "name", "address": "address"}
+
+
+class Recipient(Model):
+    email_address = Nested(EmailAddress, "emailAddress")
+
+
+class ItemBody(Model):
+    FIELDS = {"content_type": "contentType", "content": "content"}
+
+
+class DateTimeTimeZone(Model):
+    FIELDS = {"date_time": "dateTime", "time_zone": "timeZone"}
+
+
+class Location(Model):
+    FIELDS = {"display_name": "displayName"}
+
+
+class Message(Model):
+    FIELDS = {
+        "id": "id",
+        "subject": "subject",
+        "received_date_time": "receivedDateTime",
+        "sent_date_time": "sentDateTime",
+        "is_read": "isRead",
+        "has_attachments": "hasAttachments",
+        "conversation_id": "conversationId",
+        "parent_folder_id": "parentFolderId",
+    }
+    sender = Nested(Recipient, "from")
+    to_recipients = Nested(Recipient, "toRecipients", many=True)
+    cc_recipients = Nested(Recipient, "ccRecipients", many=True)
+    body = Nested(ItemBody, "body")
+
+
+class Event(Model):
+    FIELDS = {
+        "id": "id",
+        "subject": "subject",
+        "is_all_day": "isAllDay",
+        "is_cancelled": "isCancelled",
+        "web_link": "webLink",
+    }
+    start = Nested(DateTimeTimeZone, "start")
+    end = Nested(DateTimeTimeZone, "end")
+    location = Nested(Location, "location")
+    organizer = Nested(Recipient, "organizer")
+    body = Nested(ItemBody, "body")
+
+
+class Contact(Model):
+    FIELDS = {
+        "id": "id",
+        "display_name": "displayName",
+        "given_name": "givenName",
+        "surname": "surname",
+        "company_name": "companyName",
+        "business_phones": "businessPhones",
+        "mobile_phone": "mobilePhone",
+    }
+    email_addresses = Nested(EmailAddress, "emailAddresses", many=True)
+
+
+class Hashes(Model):
+    FIELDS = {"quick_xor_hash": "quickXorHash", "sha1_hash": "sha1Hash", "sha256_hash": "sha256Hash"}
+
+
+class FileFacet(Model):
+    FIELDS = {"mime_type": "mimeType"}
+    hashes = Nested(Hashes, "hashes")
+
+
+class FolderFacet(Model):
+    FIELDS = {"child_count": "childCount"}
+
+
+class ItemReference(Model):
+    FIELDS = {"id": "id", "drive_id": "driveId", "path": "path"}
+
+
+class DriveItem(Model):
+    FIELDS = {
+        "id": "id",
+        "name": "name",
+        "size": "size",
+        "e_tag": "eTag",
+        "c_tag": "cTag",
+        "web_url": "webUrl",
+        "created_date_time": "createdDateTime",
+        "last_modified_date_time": "lastModifiedDateTime",
+    }
+    file = Nested(FileFacet, "file")
+    folder = Nested(FolderFacet, "folder")
+    parent_reference = Nested(ItemReference, "parentReference")
+
+
+class Worksheet(Model):
+    FIELDS = {"id": "id", "name": "name", "position": "position", "visibility": "visibility"}
+
+
+class TableRow(Model):
+    FIELDS = {"index": "index", "values": "values"}
@@ -0,0 +1,168 @@
+import base64
+import mmap
+import os
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+WIDTH_IN_BITS = 160
+SHIFT = 11
+ROW_SIZE = WIDTH_IN_BITS  # Bytes sharing the same shift are 160 bytes apart.
+ROW_BITS = ROW_SIZE * 8
+ROWS_MASK = (1 << ROW_BITS) - 1
+WIDTH_MASK = (1 << WIDTH_IN_BITS) - 1
+FILE_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+class QuickXorHash(object):
+    name = "quickxor"
+    digest_size = WIDTH_IN_BITS // 8
+
+    def __init__(self, data: bytes = None) -> None:
+        """quickXorHash of OneDrive for Business and SharePoint, with a hashlib like interface.
+
+        Every byte is XORed into a 160 bit register, rotated by 11 bits per byte position. The bytes 160 positions
+        apart share the same rotation, so each update XOR-folds its data into a single 160 bytes row, with numpy when
+        installed or big integer operations that process whole words at a time otherwise, and the rotations are only
+        applied once by digest.
+
+        Since XOR is commutative, byte ranges can be hashed in any order by passing their offset, for e.g. by parallel
+        range downloads, and hashes of disjoint ranges can be combined with merge.
+
+        https://docs.microsoft.com/en-us/onedrive/developer/code-snippets/quickxorhash
+
+        Args:
+            data (bytes, optional): Initial data. Defaults to None.
+        """
+        self._row = 0
+        self.length = 0
+        if data:
+            self.update(data)
+
+    def update(self, data: bytes, offset: int = None) -> None:
+        """Hashes data.
+
+        Args:
+            data (bytes): Bytes, memoryview or mmap slice.
+            offset (int, optional): Position of data in the content. Defaults to None, right after the data hashed so
+            far.
+        """
+        if not data:
+            return
+        if offset is None:
+            offset = self.length
+        row = fold(data)
+        position = offset % ROW_SIZE
+        if position:
+            row = ((row << (position * 8)) | (row >> ((ROW_SIZE - position) * 8))) & ROWS_MASK
+        self._row ^= row
+        self.length += len(data)
+
+    def merge(self, other: "QuickXorHash") -> None:
+        """Combines the hash of a disjoint range of the same content.
+
+        Args:
+            other (QuickXorHash): Hash of another range, updated with offsets.
+        """
+        self._row ^= other._row
+        self.length += other.length
+
+    def copy(self) -> "QuickXorHash":
+        other = QuickXorHash()
+        other._row = self._row
+        other.length = self.length
+        return other
+
+    def digest(self) -> bytes:
+        register = 0
+        row = self._row
+        for column in range(ROW_SIZE):
+            value = (row >> (column * 8)) & 0xFF
+            if value:
+                shift = (column * SHIFT) % WIDTH_IN_BITS
+                register ^= ((value << shift) | (value >> (WIDTH_IN_BITS - shift))) & WIDTH_MASK
+        digest = bytearray(register.to_bytes(self.digest_size, "little"))
+        for i, value in enumerate(self.length.to_bytes(8, "little")):
+            digest[self.digest_size - 8 + i] ^= value
+        return bytes(digest)
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def b64digest(self) -> str:
+        """Digest in the base64 form of the quickXorHash property of Graph.
+
+        Returns:
+            str: Base64 digest.
+        """
+        return base64.b64encode(self.digest()).decode()
+
+    def get_state(self) -> dict:
+        """State of the hash, to be persisted and restored with set_state, for e.g. when resuming a transfer.
+
+        Returns:
+            dict: JSON serializable state.
+        """
+        return {"row": format(self._row, "x"), "length": self.length}
+
+    def set_state(self, state: dict) -> None:
+        self._row = int(state["row"], 16)
+        self.length = state["length"]
+
+
+def fold(data: bytes) -> int:
+    """XORs together the 160 bytes rows of data, with numpy when installed.
+
+    Args:
+        data (bytes): Bytes, memoryview or mmap slice, the last row is zero padded.
+
+    Returns:
+        int: Folded row, byte i of the row in bits 8i to 8i + 7.
+    """
+    data = memoryview(data).cast("B")
+    rows = len(data) // ROW_SIZE
+    if numpy is not None and rows > 1:
+        matrix = numpy.frombuffer(data, dtype="<u8", count=rows * ROW_SIZE // 8).reshape(rows, ROW_SIZE // 8)
+        row = numpy.bitwise_xor.reduce(matrix, axis=0).tobytes()
+        return int.from_bytes(row, "little") ^ int.from_bytes(data[rows * ROW_SIZE :], "little")
+
+    folded = int.from_bytes(data[rows * ROW_SIZE :], "little")
+    if rows < 2:
+        return folded ^ int.from_bytes(data[: rows * ROW_SIZE], "little")
+
+    # Halve the number of rows at each step, peeling the last row off when it is odd. The first step XORs the two
+    # halves of the buffer, the next ones the two halves of the resulting integer.
+    if rows % 2:
+        rows -= 1
+        folded ^= int.from_bytes(data[rows * ROW_SIZE : (rows + 1) * ROW_SIZE], "little")
+    rows //= 2
+    half = rows * ROW_SIZE
+    value = int.from_bytes(data[:half], "little") ^ int.from_bytes(data[half : 2 * half], "little")
+    while rows > 1:
+        if rows % 2:
+            rows -= 1
+            folded ^= value >> (rows * ROW_BITS)
+            value &= (1 << (rows * ROW_BITS)) - 1
+        rows //= 2
+        value = (value >> (rows * ROW_BITS)) ^ (value & ((1 << (rows * ROW_BITS)) - 1))
+    return value ^ folded
+
+
+def quickxor_file(path: str, chunk_size: int = FILE_CHUNK_SIZE) -> str:
+    """quickXorHash of a file, read through a memory map.
+
+    Args:
+        path (str): File path.
+        chunk_size (int, optional): Bytes hashed per update. Defaults to 16 MiB.
+
+    Returns:
+        str: Base64 digest, as the quickXorHash property of Graph.
+    """
+    hasher = QuickXorHash()
+    if os.path.getsize(path):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            for offset in range(0, len(content), chunk_size):
+                hasher.update(content[offset : offset + chunk_size])
+    return hasher.b64digest()
@@ -0,0 +1,376 @@
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
+from urllib.parse import quote_plus
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from microsoftgraph.response import Response
+from microsoftgraph.utils import column_letter, parse_cell, parse_range, range_address, require_sync_client
+from microsoftgraph.workbook_sessions import WorkbookSessions, session_request
+
+# Graph rejects request bodies above 4 MB, the margin covers the JSON envelope.
+MAX_PAYLOAD_BYTES = 4 * 1000 * 1000 - 1024
+READ_BLOCK_CELLS = 100000
+
+
+def to_rows(values) -> list:
+    """Converts 2D data into a list of rows: a list of lists, a NumPy array or a pandas DataFrame.
+
+    Args:
+        values: 2D data, DataFrame index and header are not included.
+
+    Returns:
+        list: Rows, padded with None to the widest row. NaN cells become None, empty cells for Excel.
+    """
+    if hasattr(values, "to_numpy"):
+        values = values.to_numpy()
+    if hasattr(values, "tolist"):
+        values = values.tolist()
+    rows = [list(row) for row in values]
+    width = max((len(row) for row in rows), default=0)
+    for row in rows:
+        for i, value in enumerate(row):
+            if isinstance(value, float) and math.isnan(value):
+                row[i] = None
+        if len(row) < width:
+            row.extend([None] * (width - len(row)))
+    return rows
+
+
+def values_body(encoded: list) -> bytes:
+    """JSON body {"values": rows} built from rows already encoded one by one.
+
+    Args:
+        encoded (list): Encoded rows.
+
+    Returns:
+        bytes: Request body.
+    """
+    return b'{"values":[' + b",".join(encoded) + b"]}"
+
+
+class RangeWriter(object):
+    def __init__(
+        self,
+        client,
+        max_payload_bytes: int = MAX_PAYLOAD_BYTES,
+        max_rows: int = None,
+        max_workers: int = 1,
+        max_retries: int = 3,
+    ) -> None:
+        """Writes large 2D datasets into a worksheet, split in blocks of rows each sent in its own PATCH request.
+
+        Blocks are sized from the encoded JSON of their rows so that no request body exceeds max_payload_bytes. They
+        are written within a workbook session: the one of the client WorkbookSessions or the global one when set,
+        otherwise one created for the write and closed afterwards. A failed block is retried on its own, the blocks
+        already written are kept.
+
+        https://docs.microsoft.com/en-us/graph/api/range-update?view=graph-rest-1.0&tabs=http
+
+        Args:
+            client (Client): Library Client.
+            max_payload_bytes (int, optional): Largest request body. Defaults to just under 4 MB.
+            max_rows (int, optional): Largest number of rows per block. Defaults to None, only bounded by size.
+            max_workers (int, optional): Blocks written concurrently. Excel serializes the writes to a workbook, more
+            than a few workers rarely helps. Defaults to 1.
+            max_retries (int, optional): Retries of a block failing with a throttling, server or network error.
+            Defaults to 3.
+        """
+        require_sync_client(client, "RangeWriter")
+        self._client = client
+        self.max_payload_bytes = max_payload_bytes
+        self.max_rows = max_rows
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+
+    def write(
+        self, workbook_id: str, worksheet_id: str, values, start_cell: str = "A1", session_id: str = None
+    ) -> List[Response]:
+        """Writes values into the range starting at start_cell.
+
+        Args:
+            workbook_id (str): Excel file ID.
+            worksheet_id (str): Excel worksheet ID.
+            values: 2D data, a list of lists, a NumPy array or a pandas DataFrame.
+            start_cell (str, optional): Top left cell. Defaults to "A1".
+            session_id (str, optional): Workbook session ID. Defaults to None, the client session or a new one.
+
+        Returns:
+            List[Response]: Microsoft Graph Response of each block, in order.
+
+        Raises:
+            ValueError: A row alone makes a body larger than max_payload_bytes, nothing is sent.
+        """
+        rows = to_rows(values)
+        if not rows or not rows[0]:
+            return []
+        row, column = parse_cell(start_cell)
+        blocks = list(self._blocks(rows, row, column))
+
+        sessions = None
+        if not session_id and self._client.get_workbook_session_id(workbook_id) is None:
+            sessions = WorkbookSessions(self._client, [workbook_id], attach=False)
+            sessions.start()
+        try:
+            if self.max_workers > 1 and len(blocks) > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    futures = [
+                        pool.submit(self._write_block, workbook_id, worksheet_id, address, body, session_id, sessions)
+                        for address, body in blocks
+                    ]
+                    return [future.result() for future in futures]
+            return [
+                self._write_block(workbook_id, worksheet_id, address, body, session_id, sessions)
+                for address, body in blocks
+            ]
+        finally:
+            if sessions is not None:
+                sessions.stop()
+
+    def _blocks(self, rows: list, row: int, column: int):
+        """Yields the address and encoded body of each block."""
+        dumps = self._client.json_codec.dumps
+        columns = len(rows[0])
+        # Validates the whole target range before anything is sent.
+        range_address(row, column, len(rows), columns)
+
+        envelope = len(values_body([]))
+        start = 0
+        encoded = []
+        # Exact body size: envelope, rows and the commas between them.
+        size = envelope
+        for i, values in enumerate(rows):
+            data = dumps(values)
+            if len(data) + envelope > self.max_payload_bytes:
+                raise ValueError(
+                    "Row {} is {} bytes once encoded, above max_payload_bytes {}".format(
+                        row + i + 1, len(data), self.max_payload_bytes
+                    )
+                )
+            full = encoded and (
+                size + 1 + len(data) > self.max_payload_bytes or (self.max_rows and len(encoded) >= self.max_rows)
+            )
+            if full:
+                yield range_address(row + start, column, len(encoded), columns), values_body(encoded)
+                start, encoded, size = i, [], envelope
+            size += len(data) + (1 if encoded else 0)
+            encoded.append(data)
+        yield range_address(row + start, column, len(encoded), columns), values_body(encoded)
+
+    def _write_block(
+        self,
+        workbook_id: str,
+        worksheet_id: str,
+        address: str,
+        body: bytes,
+        session_id: str = None,
+        sessions: WorkbookSessions = None,
+    ) -> Response:
+        url = "me/drive/items/{}/workbook/worksheets/{}/range(address='{}')".format(
+            workbook_id, quote_plus(worksheet_id), address
+        )
+        url = self._client.base_url + url
+        if sessions is not None:
+            return sessions.request(workbook_id, "PATCH", url, max_retries=self.max_retries, data=body)
+        return session_request(
+            self._client, workbook_id, "PATCH", url, session_id=session_id, max_retries=self.max_retries, data=body
+        )
+
+
+class RangeReader(object):
+    def __init__(self, client, block_cells: int = READ_BLOCK_CELLS, max_workers: int = 2, max_retries: int = 3) -> None:
+        """Reads large worksheet ranges in blocks of rows, fetching only their values.
+
+        The dimensions of the range are requested first, then each block with $select=values, so neither text,
+        formulas nor number formats are transferred. Blocks are fetched up to max_workers at a time ahead of the
+        consumer and yielded in order, at most max_workers + 1 of them are held in memory. The workbook session of the
+        client WorkbookSessions or the global one is used when set.
+
+        https://docs.microsoft.com/en-us/graph/api/resources/range?view=graph-rest-1.0
+
+        Args:
+            client (Client): Library Client.
+            block_cells (int, optional): Cells per block, rounded to whole rows. Defaults to 100000.
+            max_workers (int, optional): Blocks fetched concurrently. Defaults to 2.
+            max_retries (int, optional): Retries of a block failing with a throttling, server or network error.
+            Defaults to 3.
+        """
+        require_sync_client(client, "RangeReader")
+        self._client = client
+        self.block_cells = block_cells
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+
+    def dimensions(self, workbook_id: str, worksheet_id: str, address: str = None, session_id: str = None) -> tuple:
+        """Position and size of a range, the used range of the worksheet by default.
+
+        Args:
+            workbook_id (str): Excel file ID.
+            worksheet_id (str): Excel worksheet ID.
+            address (str, optional): Range address. Defaults to None, the cells holding values.
+            session_id (str, optional): Workbook session ID. Defaults to None, the client session if any.
+
+        Returns:
+            tuple: Zero based first (row, column) and number of (rows, columns).
+        """
+        url = self._range_url(workbook_id, worksheet_id, address)
+        params = {"$select": "address"}
+        response = session_request(
+            self._client, workbook_id, "GET", url, session_id=session_id, max_retries=self.max_retries, params=params
+        )
+        return parse_range(response.data["address"])
+
+    def iter_blocks(self, workbook_id: str, worksheet_id: str, address: str = None, session_id: str = None) -> Iterator:
+        """Yields the values of the range, one block of rows at a time.
+
+        Args:
+            workbook_id (str): Excel file ID.
+            worksheet_id (str): Excel worksheet ID.
+            address (str, optional): Range address. Defaults to None, the used range of the worksheet.
+            session_id (str, optional): Workbook session ID. Defaults to None, the client session if any.
+
+        Yields:
+            list: Rows of the block.
+        """
+        dimensions = self.dimensions(workbook_id, worksheet_id, address, session_id)
+        return self._iter_blocks(workbook_id, worksheet_id, dimensions, session_id)
+
+    def _iter_blocks(self, workbook_id: str, worksheet_id: str, dimensions: tuple, session_id: str = None):
+        row, column, rows, columns = dimensions
+        block_rows = max(1, self.block_cells // columns)
+        blocks = (
+            range_address(start, column, min(block_rows, row + rows - start), columns)
+            for start in range(row, row + rows, block_rows)
+        )
+
+        def fetch(block: str) -> list:
+            url = self._range_url(workbook_id, worksheet_id, block)
+            response = session_request(
+                self._client,
+                workbook_id,
+                "GET",
+                url,
+                session_id=session_id,
+                max_retries=self.max_retries,
+                params={"$select": "values"},
+            )
+            return response.data["values"]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = deque()
+            try:
+                for block in blocks:
+                    pending.append(pool.submit(fetch, block))
+                    if len(pending) >= self.max_workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def read_columns(
+        self,
+        workbook_id: str,
+        worksheet_id: str,
+        address: str = None,
+        header: bool = True,
+        as_numpy: bool = False,
+        session_id: str = None,
+    ) -> dict:
+        """Reads the range into typed columns.
+
+        The type of each column is inferred from its non empty cells: bool, int, float (ints mixed with floats), str
+        or object (mixed). Empty cells become None, or NaN in numeric NumPy columns.
+
+        Args:
+            workbook_id (str): Excel file ID.
+            worksheet_id (str): Excel worksheet ID.
+            address (str, optional): Range address. Defaults to None, the used range of the worksheet.
+            header (bool, optional): The first row holds the column names. Defaults to True, otherwise the columns are
+            named after their letters.
+            as_numpy (bool, optional): Build NumPy arrays instead of lists: pip install microsoftgraph-python[numpy].
+            Defaults to False.
+            session_id (str, optional): Workbook session ID. Defaults to None, the client session if any.
+
+        Returns:
+            dict: Column name to values, in worksheet order.
+        """
+        if as_numpy and numpy is None:
+            raise ImportError("as_numpy requires numpy. pip install microsoftgraph-python[numpy]")
+
+        dimensions = self.dimensions(workbook_id, worksheet_id, address, session_id)
+        names = None
+        columns = []
+        for block in self._iter_blocks(workbook_id, worksheet_id, dimensions, session_id):
+            if names is None:
+                if header:
+                    names, block = [str(name) for name in block[0]], block[1:]
+                else:
+                    names = [column_letter(dimensions[1] + i) for i in range(dimensions[3])]
+                columns = [[] for _ in names]
+            for i, column in enumerate(columns):
+                column.extend(row[i] for row in block)
+
+        if names is None:
+            return {}
+        return {name: convert_column(column, as_numpy) for name, column in zip(names, columns)}
+
+    def _range_url(self, workbook_id: str, worksheet_id: str, address: str = None) -> str:
+        url = "me/drive/items/{}/workbook/worksheets/{}/".format(workbook_id, quote_plus(worksheet_id))
+        if address:
+            url += "range(address='{}')".format(address)
+        else:
+            url += "usedRange(valuesOnly=true)"
+        return self._client.base_url + url
+
+
+def column_type(values: list) -> type:
+    """Type shared by the non empty cells of a column: bool, int, float, str, or object when they are mixed.
+
+    Args:
+        values (list): Cell values as returned by Graph, empty cells are "".
+
+    Returns:
+        type: Column type, str for a column without values.
+    """
+    kind = None
+    for value in values:
+        if value == "" or value is None:
+            continue
+        value_type = type(value)
+        if kind is None or kind is value_type:
+            kind = value_type
+        elif {kind, value_type} == {int, float}:
+            kind = float
+        else:
+            return object
+    return kind or str
+
+
+def convert_column(values: list, as_numpy: bool = False):
+    """Converts the cell values of a column to its type, see column_type.
+
+    Args:
+        values (list): Cell values as returned by Graph.
+        as_numpy (bool, optional): Build a NumPy array. Defaults to False.
+
+    Returns:
+        list or numpy.ndarray: Typed column, empty cells are None or NaN.
+    """
+    kind = column_type(values)
+    empty = [value == "" or value is None for value in values]
+    if as_numpy:
+        if kind in (int, float) and (kind is float or any(empty)):
+            return numpy.array([numpy.nan if blank else value for value, blank in zip(values, empty)], dtype=float)
+        if kind in (bool, int) and not any(empty):
+            return numpy.array(values, dtype=kind)
+        return numpy.array([None if blank else value for value, blank in zip(values, empty)], dtype=object)
+    if kind is float:
+        return [None if blank else float(value) for value, blank in zip(values, empty)]
+    return [None if blank else value for value, blank in zip(values, empty)]
@@ -0,0 +1,126 @@
+import threading
+import time
+from typing import Callable, Union
+
+from microsoftgraph.utils import resource_type, target_user
+
+
+class TokenBucket(object):
+    def __init__(self, rate: float, capacity: float = None) -> None:
+        """Thread safe token bucket.
+
+        Args:
+            rate (float): Tokens added per second, i.e. the sustained requests per second.
+            capacity (float, optional): Maximum burst size. Defaults to rate.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Takes tokens from the bucket, going into debt if there are not enough of them.
+
+        Callers are served in order: a reservation made while the bucket is in debt waits for the previous ones.
+
+        Args:
+            tokens (float, optional): Tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Blocks until the requested tokens are available.
+
+        Args:
+            tokens (float, optional): Tokens to take. Defaults to 1.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimiter(object):
+    GLOBAL = "global"
+    RESOURCE = "resource"
+    USER = "user"
+    USER_RESOURCE = "user_resource"
+
+    def __init__(
+        self, rate: float, capacity: float = None, key: Union[str, Callable] = GLOBAL, rates: dict = None
+    ) -> None:
+        """Client side rate limiter keeping requests under Graph throttling limits.
+
+        One instance can be shared by several Client instances and threads, its buckets are then shared too.
+
+        https://docs.microsoft.com/en-us/graph/throttling-limits
+
+        Args:
+            rate (float): Requests per second allowed for each bucket.
+            capacity (float, optional): Burst size of each bucket. Defaults to rate.
+            key (str or Callable, optional): How requests are grouped into buckets: "global", "resource" (mail,
+            calendar, drive, workbook...), "user" or "user_resource", or a callable key(method, url). Defaults to
+            "global".
+            rates (dict, optional): Requests per second for specific bucket keys, for e.g. {"workbook": 1}. With
+            "user_resource" keys, the resource type is looked up too. Defaults to None.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.key = key
+        self.rates = rates or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def key_for(self, method: str, url: str) -> str:
+        if callable(self.key):
+            return self.key(method, url)
+        if self.key == self.RESOURCE:
+            return resource_type(url)
+        if self.key == self.USER:
+            return target_user(url) or self.GLOBAL
+        if self.key == self.USER_RESOURCE:
+            return "{}:{}".format(target_user(url) or self.GLOBAL, resource_type(url))
+        return self.GLOBAL
+
+    def bucket(self, key: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate = self.rates.get(key, self.rates.get(key.rsplit(":", 1)[-1], self.rate))
+                bucket = self._buckets[key] = TokenBucket(rate, self.capacity)
+            return bucket
+
+    def reserve(self, method: str, url: str) -> float:
+        """Takes a token for the request.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Requested url.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+        """
+        return self.bucket(self.key_for(method, url)).reserve()
+
+    def acquire(self, method: str, url: str) -> None:
+        """Blocks until the request can be sent.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Requested url.
+        """
+        delay = self.reserve(method, url)
+        if delay > 0:
+            time.sleep(delay)
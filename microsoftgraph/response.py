@@ -1,18 +1,39 @@
+import json
 from datetime import datetime, timedelta
 
+from requests.structures import CaseInsensitiveDict
+
+from microsoftgraph.jsoncodec import JSONCodec, default_codec
+from microsoftgraph.utils import parse_retry_after
+
+_DEFAULT_CODEC = default_codec()
+_UNSET = object()
+
 
 class Response:
-    def __init__(self, original) -> None:
+    def __init__(self, original, codec: JSONCodec = None) -> None:
         self.original = original
-
-        if "application/json" in self.original.headers.get("Content-Type", ""):
-            self.data = self.original.json()
-        else:
-            self.data = self.original.content
+        self.retries = 0
+        self.codec = codec or _DEFAULT_CODEC
+        self._data = _UNSET
 
     def __repr__(self) -> str:
         return "<Response [{}]>".format(self.status_code)
 
+    @property
+    def data(self):
+        """Response body, decoded on first access: a dict for JSON responses, bytes otherwise."""
+        if self._data is _UNSET:
+            if "application/json" in self.original.headers.get("Content-Type", ""):
+                self._data = self.codec.loads(self.original.content)
+            else:
+                self._data = self.original.content
+        return self._data
+
+    @data.setter
+    def data(self, value) -> None:
+        self._data = value
+
     @property
     def status_code(self):
         return self.original.status_code
@@ -26,6 +47,37 @@ class Response:
         Returns:
             datetime: Retry after.
         """
-        if "Retry-After" in self.original.headers:
-            return datetime.now() + timedelta(seconds=self.original.headers["Retry-After"])
+        retry_after = self.retry_after
+        if retry_after is not None:
+            return datetime.now() + timedelta(seconds=retry_after)
         return None
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds to wait before retrying, from the Retry-After header.
+
+        Returns:
+            float: Seconds, None if the header is missing.
+        """
+        return parse_retry_after(self.original.headers.get("Retry-After"))
+
+
+class RawResponse:
+    def __init__(self, status_code: int, headers: dict = None, content: bytes = b"") -> None:
+        """Minimal stand-in for a requests Response, used for replies that did not come straight off the wire, for
+        e.g. the sub-responses of a $batch request.
+
+        Args:
+            status_code (int): HTTP status code.
+            headers (dict, optional): Response headers. Defaults to None.
+            content (bytes, optional): Raw body. Defaults to b"".
+        """
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self) -> None:
+        pass
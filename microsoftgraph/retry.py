@@ -0,0 +1,123 @@
+import random
+import threading
+from typing import Callable, Iterable, Optional
+
+from microsoftgraph.utils import parse_retry_after
+
+
+class Retry(object):
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+    STATUS_CODES = frozenset([429, 503, 504])
+
+    def __init__(
+        self,
+        total: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        max_elapsed: float = 300.0,
+        status_codes: Iterable[int] = None,
+        methods: Iterable[str] = None,
+        respect_retry_after: bool = True,
+        on_retry: Callable = None,
+    ) -> None:
+        """Retry policy for throttled or temporarily unavailable requests.
+
+        The Retry-After header sent by Graph is honored when present, otherwise an exponential backoff with full jitter
+        is used: random(0, min(max_backoff, backoff_factor * 2 ** attempt)).
+
+        https://docs.microsoft.com/en-us/graph/throttling#best-practices-to-handle-throttling
+
+        Args:
+            total (int, optional): Maximum number of retries per request. Defaults to 5.
+            backoff_factor (float, optional): Base delay in seconds of the exponential backoff. Defaults to 0.5.
+            max_backoff (float, optional): Maximum delay in seconds between two attempts. Defaults to 60.0.
+            max_elapsed (float, optional): No retry is made if it would end after this many seconds since the first
+            attempt. Defaults to 300.0.
+            status_codes (Iterable[int], optional): Status codes to retry. Defaults to 429, 503 and 504.
+            methods (Iterable[str], optional): HTTP methods to retry. Defaults to the idempotent methods.
+            respect_retry_after (bool, optional): Wait for the Retry-After header if any. Defaults to True.
+            on_retry (Callable, optional): Called as on_retry(method, url, attempt, delay, status_code) before each
+            retry. Defaults to None.
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.status_codes = frozenset(status_codes) if status_codes is not None else self.STATUS_CODES
+        self.methods = frozenset(m.upper() for m in methods) if methods is not None else self.IDEMPOTENT_METHODS
+        self.respect_retry_after = respect_retry_after
+        self.on_retry = on_retry
+
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def is_retryable(self, method: str, status_code: int) -> bool:
+        return method.upper() in self.methods and status_code in self.status_codes
+
+    def get_backoff(self, attempt: int, retry_after: str = None) -> float:
+        """Seconds to wait before the given retry attempt.
+
+        Args:
+            attempt (int): Number of retries already made for the request.
+            retry_after (str, optional): Value of the Retry-After header. Defaults to None.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        if self.respect_retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2**attempt)))
+
+    def next_delay(self, method: str, url: str, response, attempt: int, elapsed: float) -> Optional[float]:
+        """Decides whether a response must be retried.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Requested url.
+            response: requests or httpx response.
+            attempt (int): Number of retries already made for the request.
+            elapsed (float): Seconds since the first attempt.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, None if the response must be returned as is.
+        """
+        if attempt >= self.total or not self.is_retryable(method, response.status_code):
+            return None
+
+        delay = self.get_backoff(attempt, response.headers.get("Retry-After"))
+        if elapsed + delay > self.max_elapsed:
+            return None
+
+        with self._lock:
+            self.retries += 1
+        if self.on_retry:
+            self.on_retry(method, url, attempt + 1, delay, response.status_code)
+        return delay
+
+
+# Backoff of the retries made outside of the client Retry loop when the client has no policy.
+_DEFAULT_RETRY = Retry(max_backoff=30.0)
+
+
+def retry_backoff(client, attempt: int, error: Exception = None) -> float:
+    """Seconds to wait before retrying a call that failed outside of the client Retry loop, for e.g. a download range or
+    an upload chunk.
+
+    The Retry-After of the failed response is honored when the policy respects it, otherwise the backoff of the client
+    Retry policy is used.
+
+    Args:
+        client (Client): Library Client.
+        attempt (int): Number of retries already made for the call.
+        error (Exception, optional): Error of the failed attempt. Defaults to None.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    retry = client.retry or _DEFAULT_RETRY
+    response = getattr(error, "response", None)
+    if retry.respect_retry_after and response is not None and response.retry_after is not None:
+        return response.retry_after
+    return retry.get_backoff(attempt)
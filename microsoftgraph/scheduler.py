@@ -0,0 +1,198 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Union
+
+from microsoftgraph.utils import resource_type, target_user
+
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+
+_priority = contextvars.ContextVar("microsoftgraph_priority", default=None)
+
+
+@contextmanager
+def priority(value: int, override: bool = True):
+    """Sets the priority of the requests made inside the block, in the current thread or task.
+
+    Args:
+        value (int): INTERACTIVE, NORMAL or BULK. Lower values are served first.
+        override (bool, optional): Replace a priority already set by an outer block. Defaults to True.
+    """
+    if not override and _priority.get() is not None:
+        yield
+        return
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority(default: int = NORMAL) -> int:
+    value = _priority.get()
+    return default if value is None else value
+
+
+class _Lane(object):
+    __slots__ = ("in_flight", "waiting", "served")
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.waiting = []
+        self.served = 0
+
+
+class Scheduler(object):
+    USER = "user"
+    RESOURCE = "resource"
+    USER_RESOURCE = "user_resource"
+    GLOBAL = "global"
+
+    def __init__(
+        self, max_concurrency: int = 4, key: Union[str, Callable] = USER, default_priority: int = NORMAL
+    ) -> None:
+        """Caps the number of in-flight requests per mailbox (or drive, resource...) and serves waiting requests by
+        priority, so interactive calls overtake bulk pagination. Pages fetched through Client.get_next are BULK unless
+        an explicit priority is set.
+
+        https://docs.microsoft.com/en-us/graph/throttling-limits#outlook-service-limits
+
+        Args:
+            max_concurrency (int, optional): Maximum in-flight requests per key. Defaults to 4.
+            key (str or Callable, optional): "user", "resource", "user_resource", "global" or a callable
+            key(method, url). Defaults to "user".
+            default_priority (int, optional): Priority of requests made outside a priority block. Defaults to NORMAL.
+        """
+        self.max_concurrency = max_concurrency
+        self.key = key
+        self.default_priority = default_priority
+        self._lanes = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    priority = staticmethod(priority)
+
+    def key_for(self, method: str, url: str) -> str:
+        if callable(self.key):
+            return self.key(method, url)
+        if self.key == self.USER:
+            return target_user(url) or self.GLOBAL
+        if self.key == self.RESOURCE:
+            return resource_type(url)
+        if self.key == self.USER_RESOURCE:
+            return "{}:{}".format(target_user(url) or self.GLOBAL, resource_type(url))
+        return self.GLOBAL
+
+    def stats(self) -> dict:
+        """Queue depth metrics.
+
+        Returns:
+            dict: Per key, the in-flight requests, the queued requests (total and per priority) and the number of
+            requests served so far.
+        """
+        with self._lock:
+            stats = {}
+            for key, lane in self._lanes.items():
+                by_priority = {}
+                for entry in lane.waiting:
+                    if entry[2] is not None:
+                        by_priority[entry[0]] = by_priority.get(entry[0], 0) + 1
+                stats[key] = {
+                    "in_flight": lane.in_flight,
+                    "queued": sum(by_priority.values()),
+                    "queued_by_priority": by_priority,
+                    "served": lane.served,
+                }
+            return stats
+
+    @contextmanager
+    def slot(self, method: str, url: str, priority: int = None):
+        """Blocks until the request may be sent and holds its slot for the duration of the block.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Requested url.
+            priority (int, optional): Overrides the current priority. Defaults to None.
+        """
+        key = self.key_for(method, url)
+        event = threading.Event()
+        if self._acquire(key, self._priority(priority), event.set) is not None:
+            event.wait()
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    @asynccontextmanager
+    async def aslot(self, method: str, url: str, priority: int = None):
+        """Asyncio flavour of slot.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Requested url.
+            priority (int, optional): Overrides the current priority. Defaults to None.
+        """
+        key = self.key_for(method, url)
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        entry = self._acquire(key, self._priority(priority), wake)
+        if entry is not None:
+            try:
+                await granted
+            except asyncio.CancelledError:
+                if not self._cancel(key, entry):
+                    self._release(key)
+                raise
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    def _priority(self, priority: int = None) -> int:
+        return priority if priority is not None else current_priority(self.default_priority)
+
+    def _acquire(self, key: str, priority: int, wake: Callable):
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = _Lane()
+            if lane.in_flight < self.max_concurrency and not lane.waiting:
+                lane.in_flight += 1
+                lane.served += 1
+                return None
+            entry = [priority, next(self._counter), wake]
+            heapq.heappush(lane.waiting, entry)
+            return entry
+
+    def _cancel(self, key: str, entry: list) -> bool:
+        with self._lock:
+            if entry[2] is None:
+                return False
+            # Lazily removed by _release.
+            entry[2] = None
+            return True
+
+    def _release(self, key: str) -> None:
+        wake = None
+        with self._lock:
+            lane = self._lanes[key]
+            while lane.waiting:
+                entry = heapq.heappop(lane.waiting)
+                if entry[2] is not None:
+                    # The slot is handed over, in_flight is unchanged.
+                    wake, entry[2] = entry[2], None
+                    lane.served += 1
+                    break
+            else:
+                lane.in_flight -= 1
+        if wake is not None:
+            wake()
@@ -0,0 +1,402 @@
+import json
+import os
+import posixpath
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import quote
+
+from microsoftgraph import exceptions
+from microsoftgraph.files import DOWNLOAD_CHUNK_SIZE, verify_quickxor, write_chunks
+from microsoftgraph.quickxor import QuickXorHash
+from microsoftgraph.transfers import ChunkedUploader, same_content
+from microsoftgraph.utils import require_sync_client
+from microsoftgraph.walker import DriveWalker
+
+MANIFEST_NAME = ".microsoftgraph-mirror.json"
+TEMP_PREFIX = ".mirror-"
+MIRROR_SELECT = "id,name,size,eTag,cTag,file,folder,parentReference"
+
+
+class _LocalConflict(Exception):
+    """A download would replace a local file the manifest does not know as the synchronized copy of the item."""
+
+
+class MirrorManifest(object):
+    def __init__(self, path: str) -> None:
+        """Last synchronized state of each mirrored file, stored in a JSON file rewritten atomically.
+
+        Entries are keyed by DriveItem id and hold the local path, size and modification time of the local copy and
+        the cTag and eTag of the remote item.
+
+        Args:
+            path (str): Path of the JSON file.
+        """
+        self.path = path
+        self.items = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as f:
+                self.items = json.load(f).get("items", {})
+        except (FileNotFoundError, ValueError):
+            self.items = {}
+
+    def save(self) -> None:
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"items": self.items}, f)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def track(self, item_id: str, path: str, local_path: str, item: dict) -> None:
+        stat = os.stat(local_path)
+        with self._lock:
+            self.items[item_id] = {
+                "path": path,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "ctag": item.get("cTag"),
+                "etag": item.get("eTag"),
+            }
+
+    def untrack(self, item_id: str) -> None:
+        with self._lock:
+            self.items.pop(item_id, None)
+
+    def is_synced(self, item_id: str, path: str, local_path: str) -> bool:
+        # The file at local_path is the unmodified copy of item_id last synchronized at path.
+        with self._lock:
+            entry = self.items.get(item_id)
+        if entry is None or entry["path"] != path:
+            return False
+        try:
+            stat = os.stat(local_path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (entry["size"], entry["mtime_ns"])
+
+
+class MirrorResult(object):
+    def __init__(self) -> None:
+        """Outcome of a mirror round, each list holds relative paths."""
+        self.downloaded = []
+        self.uploaded = []
+        self.moved = []
+        self.moved_remote = []
+        self.deleted = []
+        self.deleted_remote = []
+        self.conflicts = []
+        self.failed = []
+        self.unchanged = 0
+
+    def __repr__(self) -> str:
+        return "<MirrorResult [{} downloaded, {} uploaded, {} moved, {} deleted, {} conflicts, {} failed]>".format(
+            len(self.downloaded),
+            len(self.uploaded),
+            len(self.moved) + len(self.moved_remote),
+            len(self.deleted) + len(self.deleted_remote),
+            len(self.conflicts),
+            len(self.failed),
+        )
+
+
+class DriveMirror(object):
+    def __init__(
+        self,
+        client,
+        local_root: str,
+        folder_id: str = None,
+        manifest_path: str = None,
+        max_workers: int = 4,
+        upload: bool = True,
+        delete_remote: bool = False,
+        uploader: ChunkedUploader = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> None:
+        """Keeps a local directory and a drive folder in sync, transferring only what changed since the last round.
+
+        The remote tree is compared with a manifest of the previous round: a changed cTag means new content, a
+        different path with the same cTag is a rename or a move, applied locally without downloading. Local files are
+        compared on size and modification time. Transfers run concurrently, downloads are written to a temporary file
+        renamed over the destination once complete. A file changed on both sides is reported as a conflict and left
+        untouched, as is a local file not in the manifest that a download or a move would replace.
+
+        Args:
+            client (Client): Library Client.
+            local_root (str): Local directory.
+            folder_id (str, optional): Unique identifier of the drive folder. Defaults to None, the drive root.
+            manifest_path (str, optional): Path of the manifest. Defaults to a hidden file in local_root.
+            max_workers (int, optional): Number of concurrent transfers. Defaults to 4.
+            upload (bool, optional): Upload new and modified local files, and apply local renames remotely. Defaults
+            to True.
+            delete_remote (bool, optional): Delete remote items whose local copy was deleted, they are downloaded
+            again otherwise. Defaults to False.
+            uploader (ChunkedUploader, optional): Uploader of local files. Defaults to a ChunkedUploader.
+            chunk_size (int, optional): Size of the chunks of downloads. Defaults to 1 MiB.
+        """
+        require_sync_client(client, "DriveMirror")
+        self._client = client
+        self.local_root = local_root
+        self.folder_id = folder_id
+        self.manifest = MirrorManifest(manifest_path or os.path.join(local_root, MANIFEST_NAME))
+        self.max_workers = max_workers
+        self.upload = upload
+        self.delete_remote = delete_remote
+        self.uploader = uploader if uploader is not None else ChunkedUploader(client)
+        self.chunk_size = chunk_size
+        self._folders_lock = threading.Lock()
+
+    def sync(self) -> MirrorResult:
+        """Runs a synchronization round. The manifest is saved even if some transfers fail.
+
+        Returns:
+            MirrorResult: What was transferred, moved or deleted.
+        """
+        os.makedirs(self.local_root, exist_ok=True)
+        self.manifest.load()
+        result = MirrorResult()
+        start_id, start_path = self._start()
+        remote_files, remote_folders = self._scan_remote(start_path)
+        remote_folders[""] = start_id
+        local = self._scan_local()
+
+        moves = []
+        # (path, list of the result, task) of each transfer.
+        transfers = []
+        claimed = set()
+        missing = {}
+        for item_id, entry in list(self.manifest.items.items()):
+            state = local.get(entry["path"])
+            local_changed = state != (entry["size"], entry["mtime_ns"])
+            if item_id not in remote_files:
+                # Deleted remotely, a modified local copy is kept and uploaded again as a new file.
+                self.manifest.untrack(item_id)
+                if state is not None and not local_changed:
+                    self._delete_local(entry["path"])
+                    local.pop(entry["path"])
+                    result.deleted.append(entry["path"])
+                continue
+
+            path, item = remote_files[item_id]
+            claimed.update((path, entry["path"]))
+            remote_changed = item.get("cTag") != entry["ctag"]
+            if state is None:
+                if remote_changed or not self.upload:
+                    transfers.append((path, result.downloaded, partial(self._download, item_id, path, item)))
+                else:
+                    # Maybe renamed locally, matched with the new local files below.
+                    missing.setdefault((entry["size"], entry["mtime_ns"]), []).append((item_id, path, item))
+            elif remote_changed and local_changed:
+                result.conflicts.append(path)
+            elif remote_changed:
+                task = partial(self._download, item_id, path, item, stale_path=entry["path"])
+                transfers.append((path, result.downloaded, task))
+            else:
+                if path != entry["path"]:
+                    moves.append((item_id, entry["path"], path, item))
+                if local_changed and self.upload:
+                    transfers.append((path, result.uploaded, partial(self._upload, path, item_id=item_id)))
+                elif not local_changed and path == entry["path"]:
+                    result.unchanged += 1
+
+        for item_id, (path, item) in remote_files.items():
+            if item_id in self.manifest.items:
+                continue
+            claimed.add(path)
+            if path not in local:
+                transfers.append((path, result.downloaded, partial(self._download, item_id, path, item)))
+            elif same_content(self._local_path(path), item):
+                self.manifest.track(item_id, path, self._local_path(path), item)
+                result.unchanged += 1
+            else:
+                result.conflicts.append(path)
+
+        if self.upload:
+            for path, state in local.items():
+                if path in claimed:
+                    continue
+                candidates = missing.get(state)
+                if candidates:
+                    item_id = candidates.pop()[0]
+                    task = partial(self._move_remote, item_id, path, start_path, remote_folders)
+                    transfers.append((path, result.moved_remote, task))
+                else:
+                    transfers.append((path, result.uploaded, partial(self._upload, path, start_path=start_path)))
+
+        for candidates in missing.values():
+            for item_id, path, item in candidates:
+                if self.delete_remote:
+                    transfers.append((path, result.deleted_remote, partial(self._delete_remote, item_id)))
+                else:
+                    transfers.append((path, result.downloaded, partial(self._download, item_id, path, item)))
+
+        try:
+            self._apply_moves(moves, result)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [(pool.submit(task), path, done) for path, done, task in transfers]
+                for future, path, done in futures:
+                    error = future.exception()
+                    if error is None:
+                        done.append(path)
+                    elif isinstance(error, _LocalConflict):
+                        result.conflicts.append(path)
+                    else:
+                        result.failed.append((path, error))
+        finally:
+            self.manifest.save()
+        return result
+
+    def _start(self) -> tuple:
+        url = "me/drive/items/{}".format(self.folder_id) if self.folder_id else "me/drive/root"
+        item = self._client._get(self._client.base_url + url, params={"$select": "id,name,parentReference"}).data
+        if not self.folder_id:
+            return item["id"], ""
+        return item["id"], self._item_path(item)
+
+    def _scan_remote(self, start_path: str) -> tuple:
+        files = {}
+        folders = {}
+        walker = DriveWalker(self._client, max_workers=self.max_workers, select=MIRROR_SELECT)
+        for item in walker.walk(self.folder_id):
+            path = self._item_path(item)[len(start_path) :].lstrip("/")
+            if "folder" in item:
+                folders[path] = item["id"]
+            elif "file" in item:
+                files[item["id"]] = (path, item)
+        return files, folders
+
+    @staticmethod
+    def _item_path(item: dict) -> str:
+        parent = (item.get("parentReference") or {}).get("path") or ""
+        parent = parent.split("root:", 1)[1] if "root:" in parent else ""
+        return parent + "/" + item["name"]
+
+    def _scan_local(self) -> dict:
+        files = {}
+        manifest_path = os.path.abspath(self.manifest.path)
+        for directory, _, filenames in os.walk(self.local_root):
+            relative = os.path.relpath(directory, self.local_root)
+            for filename in filenames:
+                local_path = os.path.join(directory, filename)
+                if filename.startswith(TEMP_PREFIX) or os.path.abspath(local_path) == manifest_path:
+                    continue
+                path = filename if relative == "." else posixpath.join(*relative.split(os.sep), filename)
+                stat = os.stat(local_path)
+                files[path] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def _local_path(self, path: str) -> str:
+        return os.path.join(self.local_root, *path.split("/"))
+
+    def _apply_moves(self, moves: list, result: MirrorResult) -> None:
+        # Two phases, so that swapped names do not overwrite each other.
+        staged = []
+        placed = []
+        try:
+            for item_id, old_path, new_path, item in moves:
+                source = self._local_path(old_path)
+                temp_path = os.path.join(os.path.dirname(source), TEMP_PREFIX + uuid.uuid4().hex)
+                os.replace(source, temp_path)
+                staged.append((item_id, old_path, temp_path, new_path, item))
+            for item_id, old_path, temp_path, new_path, item in staged:
+                destination = self._local_path(new_path)
+                if os.path.exists(destination):
+                    # Not moved away in the first phase: a local file unknown to the manifest, kept along with ours.
+                    self._restore(temp_path, old_path)
+                    result.conflicts.append(new_path)
+                    continue
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                os.replace(temp_path, destination)
+                placed.append((item_id, temp_path, new_path, destination, item))
+        except BaseException:
+            # Undone as a whole, a file placed on the previous path of another would leave the manifest wrong. Staged
+            # files are skipped by the local scan, they all go back to their previous path.
+            for item_id, temp_path, new_path, destination, item in reversed(placed):
+                os.replace(destination, temp_path)
+            for item_id, old_path, temp_path, new_path, item in staged:
+                if os.path.exists(temp_path):
+                    self._restore(temp_path, old_path)
+            raise
+
+        for item_id, temp_path, new_path, destination, item in placed:
+            self.manifest.track(item_id, new_path, destination, item)
+            result.moved.append(new_path)
+
+    def _download(self, item_id: str, path: str, item: dict, stale_path: str = None) -> None:
+        destination = self._local_path(path)
+        directory = os.path.dirname(destination)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+        try:
+            hasher = QuickXorHash()
+            with os.fdopen(fd, "wb") as f:
+                written = write_chunks(self._client.files.drive_iter_contents(item_id, self.chunk_size), f, hasher)
+            if written != item["size"]:
+                raise exceptions.IntegrityError("Expected {} bytes, got {}".format(item["size"], written))
+            verify_quickxor(item, hasher)
+            if os.path.exists(destination) and not self.manifest.is_synced(item_id, path, destination):
+                raise _LocalConflict(path)
+            os.replace(temp_path, destination)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.manifest.track(item_id, path, destination, item)
+        if stale_path and stale_path != path:
+            # Renamed remotely as well.
+            self._delete_local(stale_path)
+
+    def _upload(self, path: str, item_id: str = None, start_path: str = None) -> None:
+        local_path = self._local_path(path)
+        if item_id:
+            response = self.uploader.upload(local_path, item_id=item_id)
+        else:
+            response = self.uploader.upload(local_path, filename=quote(start_path + "/" + path))
+        self.manifest.track(response.data["id"], path, local_path, response.data)
+
+    def _move_remote(self, item_id: str, path: str, start_path: str, remote_folders: dict) -> None:
+        parent, name = posixpath.split(path)
+        parent_id = self._remote_folder(parent, start_path, remote_folders)
+        response = self._client.files.drive_move_item(item_id, name=name, parent_id=parent_id)
+        self.manifest.track(item_id, path, self._local_path(path), response.data)
+
+    def _remote_folder(self, path: str, start_path: str, remote_folders: dict) -> str:
+        with self._folders_lock:
+            if path in remote_folders:
+                return remote_folders[path]
+        parent, name = posixpath.split(path)
+        parent_id = self._remote_folder(parent, start_path, remote_folders)
+        try:
+            folder_id = self._client.files.drive_create_folder(name, parent_id=parent_id).data["id"]
+        except exceptions.Conflict:
+            # Created meanwhile by another transfer.
+            url = self._client.base_url + "me/drive/root:{}:".format(quote(start_path + "/" + path))
+            folder_id = self._client._get(url, params={"$select": "id"}).data["id"]
+        with self._folders_lock:
+            return remote_folders.setdefault(path, folder_id)
+
+    def _delete_remote(self, item_id: str) -> None:
+        self._client.files.drive_delete_item(item_id)
+        self.manifest.untrack(item_id)
+
+    def _restore(self, temp_path: str, path: str) -> None:
+        local_path = self._local_path(path)
+        if os.path.exists(local_path):
+            # Taken meanwhile, the file is kept next to it.
+            root, extension = os.path.splitext(local_path)
+            local_path = "{} (conflict {}){}".format(root, uuid.uuid4().hex[:8], extension)
+        os.replace(temp_path, local_path)
+
+    def _delete_local(self, path: str) -> None:
+        try:
+            os.unlink(self._local_path(path))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,235 @@
+import queue
+import threading
+import time
+
+import requests
+
+from microsoftgraph import exceptions
+from microsoftgraph.ranges import MAX_PAYLOAD_BYTES, to_rows, values_body
+from microsoftgraph.utils import require_sync_client
+from microsoftgraph.workbook_sessions import WorkbookSessions, session_request
+
+# Adding rows is not idempotent: only the errors of requests Graph did not process are retried.
+APPEND_RETRYABLE_ERRORS = (
+    exceptions.TooManyRequests,
+    exceptions.ServiceUnavailable,
+    requests.exceptions.ConnectTimeout,
+)
+
+_FLUSH = object()
+_CLOSE = object()
+
+
+class TableAppender(object):
+    def __init__(
+        self,
+        client,
+        workbook_id: str,
+        table_id: str,
+        max_rows: int = 1000,
+        max_payload_bytes: int = MAX_PAYLOAD_BYTES,
+        flush_interval: float = 5.0,
+        max_queued_rows: int = 10000,
+        max_retries: int = 5,
+        session_id: str = None,
+    ) -> None:
+        """Appends rows to a table in batches, each sent as a single multi-row request by a background thread.
+
+        A batch is sent once it holds max_rows rows, once one more row would make its body exceed max_payload_bytes,
+        or flush_interval seconds after its first row, whichever comes first. When the service falls behind, append
+        blocks as soon as max_queued_rows rows are waiting.
+
+        Since adding rows is not idempotent, a batch is only retried when Graph rejected it without processing it:
+        throttled (429), unavailable (503), connection timeout or expired session. After any other failure nothing more
+        is sent, the error is raised by the next append, flush or close and the rows not added are kept in
+        failed_rows.
+
+        Rows are added within the session of the workbook in the client WorkbookSessions, the global session, or else
+        one opened by the appender and closed with it.
+
+        https://docs.microsoft.com/en-us/graph/api/table-post-rows?view=graph-rest-1.0&tabs=http
+
+        Args:
+            client (Client): Library Client.
+            workbook_id (str): Excel file ID.
+            table_id (str): Excel table ID.
+            max_rows (int, optional): Largest number of rows per request. Defaults to 1000.
+            max_payload_bytes (int, optional): Largest request body. Defaults to just under 4 MB.
+            flush_interval (float, optional): Longest time in seconds a row is buffered. Defaults to 5.
+            max_queued_rows (int, optional): Rows waiting to be sent before append blocks. Defaults to 10000.
+            max_retries (int, optional): Retries of a rejected batch. Defaults to 5.
+            session_id (str, optional): Workbook session ID. Defaults to None.
+        """
+        require_sync_client(client, "TableAppender")
+        self._client = client
+        self.workbook_id = workbook_id
+        self.table_id = table_id
+        self.max_rows = max_rows
+        self.max_payload_bytes = max_payload_bytes
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.session_id = session_id
+        self.rows_appended = 0
+        self.requests = 0
+        self.failed_rows = []
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_queued_rows)
+        self._flushed = threading.Condition()
+        self._flush_requests = 0
+        self._flushes = 0
+        self._sessions = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        try:
+            self.close()
+        except Exception:
+            # The exception of the with block propagates, the failure stays in error and failed_rows.
+            if exc_type is None:
+                raise
+
+    def start(self) -> None:
+        """Opens a session if needed and starts the background thread, done by the first append otherwise."""
+        if self._thread is not None:
+            return
+        if not self.session_id and self._client.get_workbook_session_id(self.workbook_id) is None:
+            self._sessions = WorkbookSessions(self._client, [self.workbook_id], attach=False)
+            self._sessions.start()
+        self._thread = threading.Thread(target=self._run, name="table-appender", daemon=True)
+        self._thread.start()
+
+    def append(self, row: list, timeout: float = None) -> None:
+        """Queues a row, blocking while max_queued_rows rows are waiting.
+
+        Args:
+            row (list): Cell values, as many as the table has columns.
+            timeout (float, optional): Longest wait in seconds for room in the queue. Defaults to None, no limit.
+
+        Raises:
+            ValueError: The row alone makes a body larger than max_payload_bytes.
+            queue.Full: No room was made within timeout.
+        """
+        self._raise_error()
+        row = list(row)
+        data = self._client.json_codec.dumps(row)
+        if len(data) + len(values_body([])) > self.max_payload_bytes:
+            raise ValueError(
+                "Row is {} bytes once encoded, above max_payload_bytes {}".format(len(data), self.max_payload_bytes)
+            )
+        if self._thread is None:
+            self.start()
+        self._queue.put((row, data), timeout=timeout)
+
+    def extend(self, rows) -> None:
+        """Queues rows, a list of lists, a NumPy array or a pandas DataFrame.
+
+        Args:
+            rows: 2D data.
+        """
+        for row in to_rows(rows):
+            self.append(row)
+
+    def flush(self) -> None:
+        """Sends every queued row and waits until they are added."""
+        if self._thread is not None:
+            with self._flushed:
+                self._flush_requests += 1
+                target = self._flush_requests
+            self._queue.put(_FLUSH)
+            with self._flushed:
+                self._flushed.wait_for(lambda: self._flushes >= target)
+        self._raise_error()
+
+    def close(self) -> None:
+        """Sends every queued row, stops the background thread and closes the session opened by the appender."""
+        try:
+            if self._thread is not None:
+                self._queue.put(_CLOSE)
+                self._thread.join()
+                self._thread = None
+        finally:
+            if self._sessions is not None:
+                self._sessions.stop()
+                self._sessions = None
+        self._raise_error()
+
+    def _run(self) -> None:
+        envelope = len(values_body([]))
+        rows = []
+        encoded = []
+        # Exact body size: envelope, rows and the commas between them.
+        size = envelope
+        deadline = None
+        while True:
+            try:
+                timeout = None if deadline is None else max(0, deadline - time.monotonic())
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # The oldest buffered row waited flush_interval.
+                self._send(rows, encoded)
+                rows, encoded, size, deadline = [], [], envelope, None
+                continue
+
+            if item is _FLUSH or item is _CLOSE:
+                self._send(rows, encoded)
+                rows, encoded, size, deadline = [], [], envelope, None
+                if item is _CLOSE:
+                    return
+                with self._flushed:
+                    self._flushes += 1
+                    self._flushed.notify_all()
+                continue
+
+            row, data = item
+            if encoded and size + 1 + len(data) > self.max_payload_bytes:
+                self._send(rows, encoded)
+                rows, encoded, size, deadline = [], [], envelope, None
+            size += len(data) + (1 if encoded else 0)
+            rows.append(row)
+            encoded.append(data)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(encoded) >= self.max_rows:
+                self._send(rows, encoded)
+                rows, encoded, size, deadline = [], [], envelope, None
+
+    def _send(self, rows: list, encoded: list) -> None:
+        if not rows:
+            return
+        if self.error is not None:
+            self.failed_rows.extend(rows)
+            return
+
+        url = "me/drive/items/{}/workbook/tables/{}/rows".format(self.workbook_id, self.table_id)
+        url = self._client.base_url + url
+        body = values_body(encoded)
+        try:
+            if self._sessions is not None:
+                self._sessions.request(
+                    self.workbook_id, "POST", url, self.max_retries, APPEND_RETRYABLE_ERRORS, data=body
+                )
+            else:
+                session_request(
+                    self._client,
+                    self.workbook_id,
+                    "POST",
+                    url,
+                    session_id=self.session_id,
+                    max_retries=self.max_retries,
+                    retryable=APPEND_RETRYABLE_ERRORS,
+                    data=body,
+                )
+        except Exception as e:
+            self.error = e
+            self.failed_rows.extend(rows)
+            return
+        self.requests += 1
+        self.rows_appended += len(rows)
+
+    def _raise_error(self) -> None:
+        if self.error is not None:
+            raise self.error
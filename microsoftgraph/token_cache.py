@@ -0,0 +1,227 @@
+import abc
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+
+class TokenCache(abc.ABC):
+    """Stores tokens shared by several clients or processes.
+
+    Subclasses implement get, set and delete, and lock when the storage is shared between processes. lock is reentrant
+    within a thread, so get and set can be called while holding it.
+    """
+
+    @staticmethod
+    def make_key(client_id: str, account: str = None, scope: list = None) -> str:
+        """Builds the cache key of a token.
+
+        Args:
+            client_id (str): Application client id.
+            account (str, optional): Account the token belongs to, for e.g. the user principal name. Defaults to None.
+            scope (list, optional): Scopes of the token. Defaults to None.
+
+        Returns:
+            str: Cache key.
+        """
+        return "|".join([client_id, (account or "").lower(), " ".join(sorted(scope or []))])
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, token: dict) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key: str):
+        yield
+
+
+class MemoryTokenCache(TokenCache):
+    def __init__(self) -> None:
+        """Token cache shared by the clients of a single process."""
+        self._tokens = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            token = self._tokens.get(key)
+            return dict(token) if token else None
+
+    def set(self, key: str, token: dict) -> None:
+        with self._lock:
+            self._tokens[key] = dict(token)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    @contextmanager
+    def lock(self, key: str):
+        with self._lock:
+            yield
+
+
+class FileTokenCache(TokenCache):
+    def __init__(self, path: str) -> None:
+        """Token cache stored in a JSON file, locked across processes with a sibling .lock file.
+
+        Args:
+            path (str): Path of the JSON file.
+        """
+        self.path = path
+        self._local = threading.local()
+        self._thread_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self.lock(key):
+            return self._read().get(key)
+
+    def set(self, key: str, token: dict) -> None:
+        with self.lock(key):
+            tokens = self._read()
+            tokens[key] = token
+            self._write(tokens)
+
+    def delete(self, key: str) -> None:
+        with self.lock(key):
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                self._write(tokens)
+
+    @contextmanager
+    def lock(self, key: str):
+        if getattr(self._local, "depth", 0):
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+
+        with self._thread_lock, open(self.path + ".lock", "a+b") as lock_file:
+            self._lock_file(lock_file)
+            self._local.depth = 1
+            try:
+                yield
+            finally:
+                self._local.depth = 0
+                self._unlock_file(lock_file)
+
+    @staticmethod
+    def _lock_file(lock_file) -> None:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    time.sleep(0.05)
+
+    @staticmethod
+    def _unlock_file(lock_file) -> None:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, tokens: dict) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(tokens, f)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class SQLiteTokenCache(TokenCache):
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        """Token cache stored in a SQLite database. lock holds the database write lock, which serializes refreshes
+        across processes.
+
+        Args:
+            path (str): Path of the database file.
+            timeout (float, optional): Seconds to wait for the database lock. Defaults to 30.0.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        # Created owner-only before SQLite creates it with the umask, the tokens are credentials.
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, token TEXT NOT NULL, updated_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.connection = connection
+            self._local.depth = 0
+        return connection
+
+    def get(self, key: str) -> Optional[dict]:
+        row = self._connection().execute("SELECT token FROM tokens WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, token: dict) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO tokens (key, token, updated_at) VALUES (?, ?, ?)",
+            (key, json.dumps(token), time.time()),
+        )
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM tokens WHERE key = ?", (key,))
+
+    @contextmanager
+    def lock(self, key: str):
+        connection = self._connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield
+        except BaseException:
+            self._local.depth = 0
+            connection.execute("ROLLBACK")
+            raise
+        self._local.depth = 0
+        connection.execute("COMMIT")
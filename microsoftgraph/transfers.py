@@ -0,0 +1,713 @@
+import hashlib
+import json
+import mmap
+import os
+import posixpath
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+from urllib.parse import quote
+
+from microsoftgraph import exceptions
+from microsoftgraph.files import DOWNLOAD_CHUNK_SIZE, DOWNLOAD_SELECT, verify_quickxor
+from microsoftgraph.quickxor import QuickXorHash, quickxor_file
+from microsoftgraph.response import Response
+from microsoftgraph.retry import retry_backoff
+from microsoftgraph.utils import require_sync_client
+
+DOWNLOAD_RANGE_SIZE = 8 * 1024 * 1024
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+UPLOAD_CHUNK_MULTIPLE = 320 * 1024
+UPLOAD_CHUNK_SIZE = 32 * UPLOAD_CHUNK_MULTIPLE
+SIMPLE_UPLOAD_MAX_SIZE = 4 * 1024 * 1024
+
+
+class OutputFile(object):
+    def __init__(self, path: str, size: int) -> None:
+        """File preallocated to its final size, written in place at arbitrary offsets by several threads.
+
+        Args:
+            path (str): File path, created if missing and truncated or extended to size.
+            size (int): Final size in bytes.
+        """
+        self.path = path
+        self.size = size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        self._lock = threading.Lock()
+        if os.fstat(self._fd).st_size != size:
+            os.ftruncate(self._fd, size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write_at(self, data: bytes, offset: int) -> None:
+        view = memoryview(data)
+        while view:
+            if hasattr(os, "pwrite"):
+                written = os.pwrite(self._fd, view, offset)
+            else:  # pragma: no cover
+                with self._lock:
+                    os.lseek(self._fd, offset, os.SEEK_SET)
+                    written = os.write(self._fd, view)
+            view = view[written:]
+            offset += written
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+
+class DownloadProgress(object):
+    def __init__(self, path: str, etag: str, size: int, range_size: int) -> None:
+        """Sidecar JSON file recording the ranges already written, so an interrupted download can resume. The
+        combined quickXorHash of those ranges is kept along, so the download is verified without reading it back.
+
+        Args:
+            path (str): Path of the progress file.
+            etag (str): ETag of the item, a changed item restarts from scratch.
+            size (int): Size of the item.
+            range_size (int): Size of the ranges.
+        """
+        self.path = path
+        self.etag = etag
+        self.size = size
+        self.range_size = range_size
+        self.done = set()
+        self.hasher = QuickXorHash()
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if [state.get("etag"), state.get("size"), state.get("range_size")] == [self.etag, self.size, self.range_size]:
+            self.done = set(state.get("done", []))
+            if state.get("quickxor"):
+                self.hasher.set_state(state["quickxor"])
+            elif self.done:
+                self.hasher = None
+
+    def mark_done(self, offset: int, hasher: QuickXorHash = None) -> None:
+        with self._lock:
+            self.done.add(offset)
+            if self.hasher is not None and hasher is not None:
+                self.hasher.merge(hasher)
+            else:
+                self.hasher = None
+            state = {"etag": self.etag, "size": self.size, "range_size": self.range_size, "done": sorted(self.done)}
+            if self.hasher is not None:
+                state["quickxor"] = self.hasher.get_state()
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".progress-")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(state, f)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def delete(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class RangeDownloader(object):
+    def __init__(
+        self,
+        client,
+        range_size: int = DOWNLOAD_RANGE_SIZE,
+        max_workers: int = 4,
+        max_retries: int = 3,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        verify: bool = True,
+        progress: Callable = None,
+    ) -> None:
+        """Downloads large files as byte ranges fetched concurrently and written in place into a preallocated file.
+
+        The content is written to "<path>.part" next to a "<path>.part.progress" file listing the finished ranges. A
+        failed range is retried on its own, and a new call with the same path resumes where the previous one stopped.
+        Once complete, the size and, when Graph provides one, the hash are checked before the file is renamed to path.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-get-content?view=graph-rest-1.0&tabs=http#partial-range-downloads
+
+        Args:
+            client (Client): Library Client.
+            range_size (int, optional): Size of the ranges. Defaults to 8 MiB.
+            max_workers (int, optional): Number of ranges downloaded concurrently. Defaults to 4.
+            max_retries (int, optional): Retries of a failed range. Defaults to 3.
+            chunk_size (int, optional): Size of the chunks read from the network. Defaults to 1 MiB.
+            verify (bool, optional): Check the hash of the downloaded file. Defaults to True.
+            progress (Callable, optional): Called as progress(bytes_done, total) after each range. Defaults to None.
+        """
+        require_sync_client(client, "RangeDownloader")
+        self._client = client
+        self.range_size = range_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.verify = verify
+        self.progress = progress
+
+    def download(self, item_id: str, path: str, resume: bool = True) -> Response:
+        """Downloads a DriveItem to path.
+
+        Args:
+            item_id (str): ID of a driveItem.
+            path (str): Destination file path.
+            resume (bool, optional): Continue a previous partial download of the same item. Defaults to True.
+
+        Raises:
+            IntegrityError: The size or hash of the downloaded file does not match the item.
+
+        Returns:
+            Response: Microsoft Graph Response of the driveItem.
+        """
+        params = {"$select": DOWNLOAD_SELECT + ",eTag"}
+        drive_item = self._client.files.drive_get_item(item_id, params=params)
+
+        def refresh_url() -> str:
+            # Sent without the response cache, whose revalidation would give back the expired url.
+            url = self._client.base_url + "me/drive/items/{}".format(item_id)
+            return self._client._request("GET", url, params=params).data["@microsoft.graph.downloadUrl"]
+
+        data = drive_item.data
+        self.download_url(
+            data["@microsoft.graph.downloadUrl"],
+            path,
+            data["size"],
+            hashes=(data.get("file") or {}).get("hashes"),
+            etag=data.get("eTag"),
+            resume=resume,
+            refresh_url=refresh_url,
+        )
+        return drive_item
+
+    def download_url(
+        self,
+        url: str,
+        path: str,
+        size: int,
+        hashes: dict = None,
+        etag: str = None,
+        resume: bool = True,
+        refresh_url: Callable = None,
+    ) -> None:
+        """Downloads a pre-authenticated url, for e.g. an @microsoft.graph.downloadUrl, to path.
+
+        Args:
+            url (str): Pre-authenticated url.
+            path (str): Destination file path.
+            size (int): Size of the content.
+            hashes (dict, optional): Graph hashes facet, used to verify the file. Defaults to None.
+            etag (str, optional): Version of the content, a partial download of another version is discarded.
+            Defaults to None.
+            resume (bool, optional): Continue a previous partial download. Defaults to True.
+            refresh_url (Callable, optional): Returns a new url when the current one expired. Defaults to None.
+
+        Raises:
+            IntegrityError: The size or hash of the downloaded file does not match.
+        """
+        part_path = path + ".part"
+        progress = DownloadProgress(part_path + ".progress", etag, size, self.range_size)
+        if resume and os.path.exists(part_path):
+            progress.load()
+        else:
+            progress.delete()
+
+        offsets = [offset for offset in range(0, size, self.range_size) if offset not in progress.done]
+        resumed = sum(min(self.range_size, size - offset) for offset in progress.done if offset < size)
+        job = _DownloadJob(url, refresh_url, resumed)
+        with OutputFile(part_path, size) as output:
+            if offsets:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    futures = [pool.submit(self._download_range, job, output, progress, offset) for offset in offsets]
+                    errors = [future.exception() for future in futures]
+                errors = [error for error in errors if error is not None]
+                if job.range_ignored:
+                    self._download_stream(job, output)
+                    progress.hasher = job.hasher
+                elif errors:
+                    raise errors[0]
+
+        self._verify(part_path, size, hashes, progress.hasher)
+        os.replace(part_path, path)
+        progress.delete()
+
+    def _download_range(self, job: "_DownloadJob", output: OutputFile, progress: DownloadProgress, offset: int) -> None:
+        end = min(offset + self.range_size, output.size) - 1
+        attempt = 0
+        while True:
+            if job.range_ignored:
+                return
+            url = job.url
+            hasher = QuickXorHash()
+            try:
+                position = offset
+                headers = {"Range": "bytes={}-{}".format(offset, end)}
+                response = self._client._request_pre_authenticated("GET", url, headers=headers, stream=True)
+                try:
+                    if response.status_code != 206:
+                        # The full content would overwrite the other ranges.
+                        job.range_ignored = True
+                        return
+                    content_range = response.headers.get("Content-Range")
+                    if content_range and not content_range.startswith("bytes {}-".format(offset)):
+                        message = "Range {}-{} answered with {}".format(offset, end, content_range)
+                        raise exceptions.IntegrityError(message)
+                    for chunk in response.iter_content(self.chunk_size):
+                        output.write_at(chunk, position)
+                        hasher.update(chunk, offset=position)
+                        position += len(chunk)
+                finally:
+                    response.close()
+                if position != end + 1:
+                    raise exceptions.IntegrityError("Range {}-{} ended at {}".format(offset, end, position))
+                break
+            # requests errors are OSError subclasses.
+            except (exceptions.BaseError, OSError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                if isinstance(e, (exceptions.Unauthorized, exceptions.Forbidden, exceptions.NotFound)):
+                    # The pre-authenticated url expired.
+                    job.refresh(url)
+                time.sleep(retry_backoff(self._client, attempt, e))
+                attempt += 1
+
+        progress.mark_done(offset, hasher)
+        done = job.add(end + 1 - offset)
+        if self.progress:
+            self.progress(done, output.size)
+
+    def _download_stream(self, job: "_DownloadJob", output: OutputFile) -> None:
+        """Downloads the whole content as a single stream, when the server does not honour Range."""
+        attempt = 0
+        while True:
+            url = job.url
+            hasher = QuickXorHash()
+            try:
+                position = 0
+                for chunk in self._client._stream(url, chunk_size=self.chunk_size):
+                    output.write_at(chunk, position)
+                    hasher.update(chunk)
+                    position += len(chunk)
+                if position != output.size:
+                    raise exceptions.IntegrityError("Expected {} bytes, got {}".format(output.size, position))
+                break
+            # requests errors are OSError subclasses.
+            except (exceptions.BaseError, OSError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                if isinstance(e, (exceptions.Unauthorized, exceptions.Forbidden, exceptions.NotFound)):
+                    job.refresh(url)
+                time.sleep(retry_backoff(self._client, attempt, e))
+                attempt += 1
+
+        job.hasher = hasher
+        if self.progress:
+            self.progress(output.size, output.size)
+
+    def _verify(self, path: str, size: int, hashes: dict = None, hasher: QuickXorHash = None) -> None:
+        actual_size = os.path.getsize(path)
+        if actual_size != size:
+            raise exceptions.IntegrityError("Expected {} bytes, got {}".format(size, actual_size))
+        if not self.verify or not hashes:
+            return
+
+        if hashes.get("quickXorHash"):
+            # Without hash state, for e.g. resumed from an older progress file, the file is read back.
+            actual = hasher.b64digest() if hasher is not None else quickxor_file(path)
+            if actual != hashes["quickXorHash"]:
+                raise exceptions.IntegrityError(
+                    "quickXorHash mismatch: expected {}, got {}".format(hashes["quickXorHash"], actual)
+                )
+            return
+
+        for key, algorithm in (("sha256Hash", "sha256"), ("sha1Hash", "sha1")):
+            if hashes.get(key):
+                expected = hashes[key].lower()
+                actual = file_digest(path, hashlib.new(algorithm))
+                if actual != expected:
+                    raise exceptions.IntegrityError("{} mismatch: expected {}, got {}".format(key, expected, actual))
+                return
+
+
+class ChunkedUploader(object):
+    def __init__(
+        self,
+        client,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_retries: int = 5,
+        simple_upload_max_size: int = SIMPLE_UPLOAD_MAX_SIZE,
+        progress: Callable = None,
+        verify: bool = True,
+    ) -> None:
+        """Uploads files of any size through an upload session, one chunk at a time read from a memory map.
+
+        When a chunk fails, the session is asked for its nextExpectedRanges and the upload resumes from there. Files
+        up to simple_upload_max_size are sent in a single simple upload request instead. The quickXorHash of the
+        content is computed while it is sent and checked against the uploaded driveItem.
+
+        https://docs.microsoft.com/en-us/graph/api/driveitem-createuploadsession?view=graph-rest-1.0
+
+        Args:
+            client (Client): Library Client.
+            chunk_size (int, optional): Size of the chunks, a multiple of 320 KiB up to 60 MiB. Defaults to 10 MiB.
+            max_retries (int, optional): Consecutive failures of a chunk before giving up. Defaults to 5.
+            simple_upload_max_size (int, optional): Largest file sent with a simple upload. Defaults to 4 MiB.
+            progress (Callable, optional): Called as progress(bytes_done, total) after each chunk. Defaults to None.
+            verify (bool, optional): Check the quickXorHash of the uploaded driveItem, when Graph returns it. Defaults
+            to True.
+
+        Raises:
+            ValueError: chunk_size is not a multiple of 320 KiB.
+        """
+        if chunk_size <= 0 or chunk_size % UPLOAD_CHUNK_MULTIPLE:
+            raise ValueError("chunk_size must be a multiple of 320 KiB (327680 bytes).")
+        require_sync_client(client, "ChunkedUploader")
+        self._client = client
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.simple_upload_max_size = simple_upload_max_size
+        self.progress = progress
+        self.verify = verify
+
+    def upload(
+        self,
+        file_path: str,
+        filename: str = None,
+        item_id: str = None,
+        conflict_behavior: str = "replace",
+        upload_url: str = None,
+        on_session: Callable = None,
+    ) -> Response:
+        """Uploads a local file to a new path or over an existing item.
+
+        Args:
+            file_path (str): Local file path.
+            filename (str, optional): Path of a new file from the drive root, for e.g. "/Documents/report.pdf".
+            Defaults to None.
+            item_id (str, optional): Id of an existing driveItem to replace. Defaults to None.
+            conflict_behavior (str, optional): fail, replace or rename. Defaults to "replace".
+            upload_url (str, optional): Upload url of a previous session to resume. Defaults to None.
+            on_session (Callable, optional): Called with the upload url once the session is created, for e.g. to
+            persist it and resume after a crash. Defaults to None.
+
+        Returns:
+            Response: Microsoft Graph Response of the uploaded driveItem.
+
+        Raises:
+            ValueError: None of filename, item_id or upload_url is given.
+        """
+        if not (filename or item_id or upload_url):
+            raise ValueError("filename, item_id or upload_url is required.")
+        size = os.path.getsize(file_path)
+        if upload_url is None and size <= self.simple_upload_max_size:
+            return self._simple_upload(file_path, filename, item_id, conflict_behavior)
+
+        if upload_url is None:
+            session = self._client.files.drive_create_upload_session(
+                filename=filename, item_id=item_id, conflict_behavior=conflict_behavior
+            )
+            upload_url = session.data["uploadUrl"]
+            if on_session:
+                on_session(upload_url)
+            offset = 0
+        else:
+            # Asked to the session by the first attempt.
+            offset = None
+
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return self._upload_chunks(upload_url, content, size, offset)
+
+    def _upload_chunks(self, upload_url: str, content: mmap.mmap, size: int, offset: int = None) -> Response:
+        """Sends the chunks from offset, or from the nextExpectedRanges of the session when offset is None."""
+        failures = 0
+        hasher = QuickXorHash()
+        while True:
+            try:
+                if offset is None:
+                    offset = self._next_offset(upload_url)
+                end = min(offset + self.chunk_size, size) - 1
+                headers = {"Content-Range": "bytes {}-{}/{}".format(offset, end, size)}
+                chunk = content[offset : end + 1]
+                if self.verify and end + 1 > hasher.length:
+                    # Bytes sent again after a failure are only hashed once, bytes skipped by a resume are read here.
+                    if offset > hasher.length:
+                        hasher.update(content[hasher.length : offset])
+                    hasher.update(chunk[hasher.length - offset :] if hasher.length > offset else chunk)
+                response = self._client._request_pre_authenticated("PUT", upload_url, headers=headers, data=chunk)
+            # requests errors are OSError subclasses.
+            except (exceptions.BaseError, OSError) as e:
+                failures += 1
+                if failures > self.max_retries or isinstance(e, exceptions.NotFound):
+                    # The session expired or was cancelled.
+                    raise
+                time.sleep(retry_backoff(self._client, failures - 1, e))
+                # The session tells where to resume, its own failures count as attempts.
+                offset = None
+                continue
+
+            failures = 0
+            if response.status_code in (200, 201):
+                if self.progress:
+                    self.progress(size, size)
+                result = self._client._parse(response)
+                if self.verify:
+                    verify_quickxor(result.data, hasher)
+                return result
+            offset = self._parse_next_offset(self._client._parse(response).data, end + 1)
+            if self.progress:
+                self.progress(offset, size)
+
+    def _next_offset(self, upload_url: str) -> int:
+        response = self._client._request_pre_authenticated("GET", upload_url)
+        return self._parse_next_offset(self._client._parse(response).data, 0)
+
+    @staticmethod
+    def _parse_next_offset(session: dict, default: int) -> int:
+        ranges = session.get("nextExpectedRanges") if isinstance(session, dict) else None
+        if not ranges:
+            return default
+        return int(ranges[0].split("-", 1)[0])
+
+    def _simple_upload(self, file_path: str, filename: str, item_id: str, conflict_behavior: str) -> Response:
+        if item_id:
+            url = "me/drive/items/{}/content".format(item_id)
+        else:
+            url = "me/drive/root:{}:/content".format(filename)
+        with open(file_path, "rb") as f:
+            content = f.read()
+        response = self._client._put(
+            self._client.base_url + url,
+            params={"@microsoft.graph.conflictBehavior": conflict_behavior},
+            data=content,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        if self.progress:
+            self.progress(len(content), len(content))
+        if self.verify:
+            verify_quickxor(response.data, QuickXorHash(content))
+        return response
+
+
+class UploadResult(object):
+    UPLOADED = "uploaded"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+    def __init__(self, local_path: str, remote_path: str) -> None:
+        """Outcome of the upload of one file of a tree.
+
+        Args:
+            local_path (str): Local file path.
+            remote_path (str): Path in the drive.
+        """
+        self.local_path = local_path
+        self.remote_path = remote_path
+        self.status = None
+        self.response = None
+        self.error = None
+
+    def __repr__(self) -> str:
+        return "<UploadResult [{}: {}]>".format(self.status, self.remote_path)
+
+
+class TreeUploader(object):
+    def __init__(
+        self,
+        client,
+        max_workers: int = 8,
+        skip_unchanged: bool = True,
+        uploader: ChunkedUploader = None,
+        on_result: Callable = None,
+    ) -> None:
+        """Mirrors a local directory tree into the drive.
+
+        Folders are created level by level, the folders of a level in parallel. Files are then uploaded concurrently
+        on a bounded pool, skipping those whose size and hash already match the remote item. A failed file is reported
+        in its result and does not stop the others. When a folder cannot be created, its subfolders are not attempted
+        and every file under it is reported failed with the error of the folder.
+
+        Args:
+            client (Client): Library Client.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 8.
+            skip_unchanged (bool, optional): Skip files already in the drive with the same size and hash. Defaults to
+            True.
+            uploader (ChunkedUploader, optional): Uploader of each file. Defaults to a ChunkedUploader.
+            on_result (Callable, optional): Called with each UploadResult as soon as it is known. Defaults to None.
+        """
+        require_sync_client(client, "TreeUploader")
+        self._client = client
+        self.max_workers = max_workers
+        self.skip_unchanged = skip_unchanged
+        self.uploader = uploader if uploader is not None else ChunkedUploader(client)
+        self.on_result = on_result
+
+    def upload(self, local_dir: str, remote_path: str) -> List[UploadResult]:
+        """Uploads the content of local_dir into the remote_path folder, created if missing.
+
+        Args:
+            local_dir (str): Local directory.
+            remote_path (str): Path of the destination folder from the drive root, for e.g. "/Backups/site".
+
+        Returns:
+            List[UploadResult]: One result per file.
+        """
+        remote_root = "/" + remote_path.strip("/")
+        levels = {}
+        files = []
+        for directory, _, filenames in os.walk(local_dir):
+            relative = os.path.relpath(directory, local_dir)
+            remote_dir = remote_root if relative == "." else posixpath.join(remote_root, *relative.split(os.sep))
+            levels.setdefault(remote_dir.count("/"), []).append(remote_dir)
+            for filename in filenames:
+                files.append((os.path.join(directory, filename), posixpath.join(remote_dir, filename)))
+
+        # Parents of the root may be missing as well.
+        parents = remote_root.split("/")[1:-1]
+        for depth in range(1, len(parents) + 1):
+            levels.setdefault(depth, []).append("/" + "/".join(parents[:depth]))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            existing = {}
+            failed = {}
+            for depth in sorted(levels):
+                pending = []
+                for remote_dir in levels[depth]:
+                    parent = posixpath.dirname(remote_dir)
+                    if parent in failed:
+                        failed[remote_dir] = failed[parent]
+                    else:
+                        pending.append(remote_dir)
+                for remote_dir, (created, error) in zip(pending, pool.map(self._create_folder, pending)):
+                    if error is not None:
+                        failed[remote_dir] = error
+                    else:
+                        existing[remote_dir] = not created
+            remote_items = {}
+            if self.skip_unchanged:
+                listed = [remote_dir for remote_dir, exists in existing.items() if exists]
+                for children in pool.map(self._list_files, listed):
+                    remote_items.update(children)
+            return list(pool.map(lambda file: self._upload_file(file[0], file[1], remote_items, failed), files))
+
+    def _create_folder(self, remote_dir: str) -> tuple:
+        # Returns whether the folder was created, and the error that prevented it.
+        if remote_dir == "/":
+            return False, None
+        parent, name = posixpath.split(remote_dir)
+        try:
+            self._client.files.drive_create_folder(name, parent_path=quote(parent))
+        except exceptions.Conflict:
+            return False, None
+        except Exception as e:
+            return False, e
+        return True, None
+
+    def _list_files(self, remote_dir: str) -> dict:
+        if remote_dir == "/":
+            url = self._client.base_url + "me/drive/root/children"
+        else:
+            url = self._client.base_url + "me/drive/root:{}:/children".format(quote(remote_dir))
+        children = {}
+        try:
+            for item in self._client._iter(url, params={"$select": "name,size,file"}):
+                if "file" in item:
+                    children[posixpath.join(remote_dir, item["name"])] = item
+        except Exception:
+            # The listing only serves to skip unchanged files, the files of the folder are all uploaded instead.
+            return {}
+        return children
+
+    def _upload_file(self, local_path: str, remote_path: str, remote_items: dict, failed: dict) -> UploadResult:
+        result = UploadResult(local_path, remote_path)
+        folder_error = failed.get(posixpath.dirname(remote_path))
+        if folder_error is not None:
+            result.status = UploadResult.FAILED
+            result.error = folder_error
+        else:
+            try:
+                if self._unchanged(local_path, remote_items.get(remote_path)):
+                    result.status = UploadResult.SKIPPED
+                else:
+                    result.response = self.uploader.upload(local_path, filename=quote(remote_path))
+                    result.status = UploadResult.UPLOADED
+            except Exception as e:
+                result.status = UploadResult.FAILED
+                result.error = e
+        if self.on_result:
+            self.on_result(result)
+        return result
+
+    @staticmethod
+    def _unchanged(local_path: str, item: dict = None) -> bool:
+        return item is not None and same_content(local_path, item)
+
+
+class _DownloadJob(object):
+    def __init__(self, url: str, refresh_url: Optional[Callable], done: int) -> None:
+        self.url = url
+        self.done = done
+        self.range_ignored = False
+        self.hasher = None
+        self._refresh_url = refresh_url
+        self._lock = threading.Lock()
+
+    def refresh(self, stale_url: str) -> None:
+        with self._lock:
+            if self._refresh_url and self.url == stale_url:
+                self.url = self._refresh_url()
+
+    def add(self, size: int) -> int:
+        with self._lock:
+            self.done += size
+            return self.done
+
+
+def same_content(local_path: str, item: dict) -> bool:
+    """Tells whether a local file has the size and hash of a DriveItem. False when Graph gives no usable hash.
+
+    Args:
+        local_path (str): Local file path.
+        item (dict): DriveItem with its size and file facet.
+
+    Returns:
+        bool: The contents are identical.
+    """
+    if item.get("size") != os.path.getsize(local_path):
+        return False
+    hashes = (item.get("file") or {}).get("hashes") or {}
+    for key, algorithm in (("sha256Hash", "sha256"), ("sha1Hash", "sha1")):
+        if hashes.get(key):
+            return file_digest(local_path, hashlib.new(algorithm)) == hashes[key].lower()
+    if hashes.get("quickXorHash"):
+        return quickxor_file(local_path) == hashes["quickXorHash"]
+    return False
+
+
+def file_digest(path: str, hasher) -> str:
+    """Hashes a file without loading it in memory.
+
+    Args:
+        path (str): File path.
+        hasher: hashlib object, or any object with update and hexdigest.
+
+    Returns:
+        str: Hex digest.
+    """
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
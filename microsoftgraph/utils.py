@@ -1,7 +1,199 @@
-from datetime import datetime
+import inspect
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlsplit
 
 
 def format_time(value: datetime, is_webhook: bool = False) -> str:
     if is_webhook:
         return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
     return value.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (str): Header value.
+
+    Returns:
+        Optional[float]: Seconds to wait, None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def require_sync_client(client, name: str) -> None:
+    """Rejects an AsyncClient, whose request methods are coroutines, in helpers built on the synchronous Client.
+
+    Args:
+        client (Client): Library Client.
+        name (str): Name of the helper, for the error message.
+
+    Raises:
+        TypeError: The client is asynchronous.
+    """
+    if inspect.iscoroutinefunction(client._request):
+        raise TypeError("{} requires the synchronous Client".format(name))
+
+
+def resource_type(url: str) -> str:
+    """Classifies a Graph url by the kind of resource it targets, for e.g. mail, calendar, drive or workbook.
+
+    Args:
+        url (str): Absolute or version relative url.
+
+    Returns:
+        str: Resource type, "other" if unknown.
+    """
+    segments = _path_segments(url)
+    if not segments:
+        return "other"
+    if "workbook" in segments:
+        return "workbook"
+
+    if segments[0] in ("me", "users", "groups", "sites"):
+        segments = segments[1:] if segments[0] == "me" else segments[2:]
+    if not segments:
+        return "user"
+
+    head = segments[0].lower()
+    if head in ("drive", "drives", "shares", "items"):
+        return "drive"
+    if head in ("messages", "mailfolders", "sendmail", "mailboxsettings"):
+        return "mail"
+    if head in ("events", "calendar", "calendars", "calendarview", "calendargroups"):
+        return "calendar"
+    if head in ("contacts", "contactfolders"):
+        return "contacts"
+    if head == "onenote":
+        return "notes"
+    if head == "subscriptions":
+        return "webhooks"
+    return "other"
+
+
+def target_user(url: str) -> str:
+    """Returns the user a Graph url targets: "me", the id or principal name after /users/, None otherwise.
+
+    Args:
+        url (str): Absolute or version relative url.
+
+    Returns:
+        str: User key.
+    """
+    segments = _path_segments(url)
+    if segments and segments[0] == "me":
+        return "me"
+    if len(segments) > 1 and segments[0] == "users":
+        return segments[1].lower()
+    return None
+
+
+def _path_segments(url: str) -> list:
+    path = urlsplit(url).path if "://" in url else url.split("?", 1)[0]
+    segments = [segment for segment in path.split("/") if segment]
+    if segments and segments[0] in ("v1.0", "beta"):
+        segments = segments[1:]
+    return [segment.split(":", 1)[0].split("(", 1)[0] for segment in segments]
+
+
+MAX_ROWS = 1048576
+MAX_COLUMNS = 16384
+
+
+def column_letter(index: int) -> str:
+    """Converts a zero based column index into its A1 letters, for e.g. 0 into "A" and 27 into "AB".
+
+    Args:
+        index (int): Zero based column index.
+
+    Returns:
+        str: Column letters.
+    """
+    if not 0 <= index < MAX_COLUMNS:
+        raise ValueError("Column index out of the worksheet: {}".format(index))
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(letters: str) -> int:
+    """Converts A1 column letters into a zero based column index, for e.g. "AB" into 27.
+
+    Args:
+        letters (str): Column letters, case insensitive.
+
+    Returns:
+        int: Zero based column index.
+    """
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - 64
+    return index - 1
+
+
+def parse_cell(cell: str) -> tuple:
+    """Parses an A1 cell reference, for e.g. "B3" or "$B$3" into (2, 1).
+
+    Args:
+        cell (str): Cell reference.
+
+    Returns:
+        tuple: Zero based (row, column).
+    """
+    cell = cell.replace("$", "").strip()
+    letters = cell.rstrip("0123456789")
+    digits = cell[len(letters) :]
+    if not letters.isalpha() or not digits:
+        raise ValueError("Invalid cell reference: {}".format(cell))
+    return int(digits) - 1, column_index(letters)
+
+
+def range_address(row: int, column: int, rows: int, columns: int) -> str:
+    """Builds the A1 address of a block of cells, for e.g. (2, 1, 3, 2) into "B3:C5".
+
+    Args:
+        row (int): Zero based first row.
+        column (int): Zero based first column.
+        rows (int): Number of rows.
+        columns (int): Number of columns.
+
+    Returns:
+        str: A1 address.
+    """
+    if row < 0 or rows < 1 or row + rows > MAX_ROWS:
+        raise ValueError("Rows out of the worksheet: {} to {}".format(row + 1, row + rows))
+    start = "{}{}".format(column_letter(column), row + 1)
+    end = "{}{}".format(column_letter(column + columns - 1), row + rows)
+    return start if start == end else "{}:{}".format(start, end)
+
+
+def parse_range(address: str) -> tuple:
+    """Parses an A1 range address, optionally prefixed by its worksheet, for e.g. "Sheet1!B3:C5" into (2, 1, 3, 2).
+
+    Args:
+        address (str): Range address, as the address property of a Graph range.
+
+    Returns:
+        tuple: Zero based first (row, column) and number of (rows, columns).
+    """
+    cells = address.rsplit("!", 1)[-1].split(":")
+    row, column = parse_cell(cells[0])
+    last_row, last_column = parse_cell(cells[-1])
+    return row, column, last_row - row + 1, last_column - column + 1
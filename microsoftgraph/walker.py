@@ -0,0 +1,153 @@
+import contextvars
+import fnmatch
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from microsoftgraph.scheduler import BULK, priority
+from microsoftgraph.utils import require_sync_client
+
+DEFAULT_SELECT = "id,name,size,eTag,cTag,lastModifiedDateTime,file,folder,parentReference"
+
+_DONE = object()
+
+
+class DriveWalker(object):
+    FILE = "file"
+    FOLDER = "folder"
+
+    def __init__(
+        self,
+        client,
+        drive_id: str = None,
+        max_workers: int = 8,
+        max_depth: int = None,
+        min_depth: int = 0,
+        name: str = None,
+        item_type: str = None,
+        select: str = DEFAULT_SELECT,
+        page_size: int = None,
+        buffer_size: int = 64,
+    ) -> None:
+        """Crawls a drive breadth-first, listing several folders concurrently, and streams out the items as they are
+        discovered. Folders are listed at BULK priority unless an explicit priority is set.
+
+        Depth 0 is the content of the start folder, depth 1 the content of its subfolders and so on.
+
+        Args:
+            client (Client): Library Client.
+            drive_id (str, optional): Drive to crawl, for e.g. a SharePoint document library. Defaults to None, the
+            signed-in user's drive.
+            max_workers (int, optional): Number of folders listed concurrently. Defaults to 8.
+            max_depth (int, optional): Deepest level crawled. Defaults to None, no limit.
+            min_depth (int, optional): Shallowest level yielded. Defaults to 0.
+            name (str, optional): Case insensitive glob pattern the yielded items must match, for e.g. "*.xlsx".
+            Defaults to None.
+            item_type (str, optional): Only yield "file" or "folder" items. Defaults to None, both.
+            select (str, optional): $select projection of the listed items, id and folder are always added. Defaults
+            to id, name, size, eTag, cTag, lastModifiedDateTime, file, folder and parentReference.
+            page_size (int, optional): $top of each listing request. Defaults to None, the Graph default.
+            buffer_size (int, optional): Pages buffered ahead of the consumer. Defaults to 64.
+        """
+        require_sync_client(client, "DriveWalker")
+        self._client = client
+        self.drive_id = drive_id
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.min_depth = min_depth
+        self.name = name.lower() if name else None
+        self.item_type = item_type
+        self.page_size = page_size
+        self.buffer_size = buffer_size
+
+        fields = [field for field in select.split(",") if field]
+        self.select = ",".join(fields + [field for field in ("id", "folder") if field not in fields])
+
+    def walk(self, folder_id: str = None) -> Iterator[dict]:
+        """Yields every item under a folder. Breaking out of the loop stops the crawl.
+
+        Args:
+            folder_id (str, optional): Unique identifier of the start folder. Defaults to None, the drive root.
+
+        Yields:
+            dict: DriveItem.
+        """
+        results = queue.Queue(maxsize=self.buffer_size)
+        stop = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def list_folder(folder: str, depth: int) -> None:
+            if stop.is_set():
+                return
+            try:
+                with priority(BULK, override=False):
+                    response = self._client._do_get(self._children_url(folder), params=self._params())
+                    for page in self._client.iter_pages(response):
+                        if stop.is_set() or not put((depth, page.data.get("value", []), None)):
+                            return
+            except Exception as e:
+                put((depth, None, e))
+            finally:
+                put(_DONE)
+
+        futures = []
+
+        def submit(folder: str, depth: int) -> None:
+            futures.append(pool.submit(contextvars.copy_context().run, list_folder, folder, depth))
+
+        pending = 1
+        submit(folder_id, 0)
+        try:
+            while pending:
+                message = results.get()
+                if message is _DONE:
+                    pending -= 1
+                    continue
+                depth, items, error = message
+                if error is not None:
+                    raise error
+                for item in items:
+                    if "folder" in item and (self.max_depth is None or depth < self.max_depth):
+                        submit(item["id"], depth + 1)
+                        pending += 1
+                    if self._matches(item, depth):
+                        yield item
+        finally:
+            stop.set()
+            # Listings not started yet are dropped, the running ones end at their next page.
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def _children_url(self, folder_id: str = None) -> str:
+        drive = "drives/{}".format(self.drive_id) if self.drive_id else "me/drive"
+        if folder_id:
+            return self._client.base_url + "{}/items/{}/children".format(drive, folder_id)
+        return self._client.base_url + "{}/root/children".format(drive)
+
+    def _params(self) -> dict:
+        params = {"$select": self.select}
+        if self.page_size:
+            params["$top"] = self.page_size
+        return params
+
+    def _matches(self, item: dict, depth: int) -> bool:
+        if depth < self.min_depth:
+            return False
+        if self.item_type == self.FILE and "file" not in item:
+            return False
+        if self.item_type == self.FOLDER and "folder" not in item:
+            return False
+        if self.name and not fnmatch.fnmatchcase(item.get("name", "").lower(), self.name):
+            return False
+        return True
@@ -0,0 +1,334 @@
+import threading
+import time
+from typing import Iterable, Optional
+
+from microsoftgraph import exceptions
+from microsoftgraph.response import Response
+from microsoftgraph.retry import retry_backoff
+from microsoftgraph.utils import require_sync_client
+
+# Persistent sessions expire after about 5 minutes of inactivity.
+SESSION_REFRESH_INTERVAL = 240
+RETRYABLE_ERRORS = (
+    exceptions.TooManyRequests,
+    exceptions.InternalServerError,
+    exceptions.ServiceUnavailable,
+    exceptions.GatewayTimeout,
+    # requests errors are OSError subclasses.
+    OSError,
+)
+_STATUS_ERRORS = {
+    429: exceptions.TooManyRequests,
+    500: exceptions.InternalServerError,
+    503: exceptions.ServiceUnavailable,
+    504: exceptions.GatewayTimeout,
+}
+
+
+def with_retries(client, call, max_retries: int, *args, retryable: tuple = RETRYABLE_ERRORS, **kwargs):
+    """Calls call(*args, **kwargs), retrying on throttling, server and network errors after the Retry-After of the
+    response or the backoff of the client Retry policy.
+
+    Args:
+        client (Client): Library Client.
+        call (callable): Request method of the client, for e.g. client._patch.
+        max_retries (int): Retries before the last error is raised.
+        retryable (tuple, optional): Exceptions retried. Defaults to throttling, server and network errors.
+
+    Returns:
+        The result of call.
+    """
+    attempt = 0
+    while True:
+        try:
+            return call(*args, **kwargs)
+        except retryable as e:
+            if attempt >= max_retries:
+                raise
+            time.sleep(retry_backoff(client, attempt, e))
+            attempt += 1
+
+
+def request_retryable(client, method: str, retryable: tuple = RETRYABLE_ERRORS) -> tuple:
+    """Errors to retry around a client request, without those of the statuses the client Retry policy already retries
+    for the method: retrying them again would multiply the attempts.
+
+    Args:
+        client (Client): Library Client.
+        method (str): HTTP method.
+        retryable (tuple, optional): Exceptions retried without a client policy. Defaults to throttling, server and
+        network errors.
+
+    Returns:
+        tuple: Exceptions for with_retries.
+    """
+    retry = client.retry
+    if retry is None or method.upper() not in retry.methods:
+        return retryable
+    handled = [error for status, error in _STATUS_ERRORS.items() if status in retry.status_codes]
+    return tuple(error for error in retryable if error not in handled)
+
+
+def is_session_error(error: Exception) -> bool:
+    """Tells whether Graph rejected a request because its workbook session expired or is unknown.
+
+    Args:
+        error (Exception): Raised exception.
+
+    Returns:
+        bool: The error code of the response mentions the session.
+    """
+    if not isinstance(error, exceptions.BaseError) or not error.args or not isinstance(error.args[0], dict):
+        return False
+    code = (error.args[0].get("error") or {}).get("code") or ""
+    return "session" in code.lower()
+
+
+class WorkbookSessions(object):
+    def __init__(
+        self,
+        client,
+        workbook_ids: Iterable[str] = (),
+        persist_changes: bool = True,
+        refresh_interval: float = SESSION_REFRESH_INTERVAL,
+        attach: bool = True,
+    ) -> None:
+        """Pool of workbook sessions, one per workbook, kept alive in the background.
+
+        Used as a context manager, the sessions of workbook_ids are created on enter and every session of the pool is
+        closed on exit. Sessions of other workbooks are created on first use. A background thread refreshes them every
+        refresh_interval seconds, and a session found expired is transparently recreated on its next use.
+
+        While attached, the pool is the client workbook_sessions: Workbooks methods, RangeWriter and RangeReader use
+        the session of the workbook they work on instead of the global workbook_session_id, so several workbooks can
+        be worked on at once. Requires the synchronous Client.
+
+        https://docs.microsoft.com/en-us/graph/api/resources/excel?view=graph-rest-1.0#sessions-and-persistence
+
+        Args:
+            client (Client): Library Client.
+            workbook_ids (Iterable[str], optional): Excel file IDs whose sessions are created on enter. Defaults to ().
+            persist_changes (bool, optional): Create persistent sessions, otherwise changes are discarded when the
+            session closes. Defaults to True.
+            refresh_interval (float, optional): Seconds between keep-alive refreshes, None disables them. Defaults to
+            240.
+            attach (bool, optional): Set the pool as the client workbook_sessions on enter. Defaults to True.
+        """
+        require_sync_client(client, "WorkbookSessions")
+        self._client = client
+        self.workbook_ids = list(workbook_ids)
+        self.persist_changes = persist_changes
+        self.refresh_interval = refresh_interval
+        self.attach = attach
+        self._sessions = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._previous = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Attaches the pool, creates the sessions of workbook_ids and starts the keep-alive thread."""
+        if self.attach:
+            self._previous = self._client.workbook_sessions
+            self._client.workbook_sessions = self
+        for workbook_id in self.workbook_ids:
+            self.get(workbook_id)
+        if self.refresh_interval:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._keep_alive, name="workbook-sessions", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the keep-alive thread, closes every session and detaches the pool."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.close()
+        finally:
+            if self.attach and self._client.workbook_sessions is self:
+                self._client.workbook_sessions = self._previous
+
+    def get(self, workbook_id: str) -> str:
+        """Session of a workbook, created if there is none yet.
+
+        Args:
+            workbook_id (str): Excel file ID.
+
+        Returns:
+            str: Workbook session ID.
+        """
+        session_id = self._sessions.get(workbook_id)
+        if session_id is not None:
+            return session_id
+        with self._lock:
+            lock = self._locks.setdefault(workbook_id, threading.Lock())
+        # Concurrent first uses of a workbook create a single session.
+        with lock:
+            session_id = self._sessions.get(workbook_id)
+            if session_id is None:
+                url = "me/drive/items/{}/workbook/createSession".format(workbook_id)
+                data = {"persistChanges": self.persist_changes}
+                response = self._client._post(self._client.base_url + url, json=data)
+                session_id = response.data["id"]
+                self._sessions[workbook_id] = session_id
+            return session_id
+
+    def invalidate(self, workbook_id: str, session_id: str = None) -> None:
+        """Forgets the session of a workbook, for e.g. expired, the next use creates a new one.
+
+        Args:
+            workbook_id (str): Excel file ID.
+            session_id (str, optional): Only forget this session, not one created meanwhile. Defaults to None.
+        """
+        with self._lock:
+            if session_id is None or self._sessions.get(workbook_id) == session_id:
+                self._sessions.pop(workbook_id, None)
+
+    def request(
+        self,
+        workbook_id: str,
+        method: str,
+        url: str,
+        max_retries: int = 3,
+        retryable: tuple = RETRYABLE_ERRORS,
+        **kwargs,
+    ) -> Response:
+        """Sends a request within the session of a workbook, recreating the session once if it expired.
+
+        Args:
+            workbook_id (str): Excel file ID.
+            method (str): HTTP method.
+            url (str): Full url.
+            max_retries (int, optional): Retries on throttling, server and network errors, except the statuses the
+            client Retry policy already retries for the method. Defaults to 3.
+            retryable (tuple, optional): Exceptions retried. Defaults to throttling, server and network errors.
+
+        Returns:
+            Response: Microsoft Graph Response.
+        """
+        retryable = request_retryable(self._client, method, retryable)
+        extra_headers = kwargs.pop("headers", None) or {}
+        recreated = False
+        while True:
+            session_id = self.get(workbook_id)
+            headers = dict(extra_headers, **{"workbook-session-id": session_id})
+            try:
+                return with_retries(
+                    self._client,
+                    self._client._request,
+                    max_retries,
+                    method,
+                    url,
+                    headers=headers,
+                    retryable=retryable,
+                    **kwargs,
+                )
+            except exceptions.BaseError as e:
+                if recreated or not is_session_error(e):
+                    raise
+                self.invalidate(workbook_id, session_id)
+                recreated = True
+
+    def refresh(self, workbook_id: str = None) -> Optional[Response]:
+        """Refreshes the session of a workbook, or every session. The expired ones are forgotten and recreated on their
+        next use.
+
+        Args:
+            workbook_id (str, optional): Excel file ID. Defaults to None, every workbook.
+
+        Returns:
+            Optional[Response]: Microsoft Graph Response of the refresh of workbook_id, None if it had no live session.
+        """
+        if workbook_id is None:
+            sessions = list(self._sessions.items())
+        else:
+            sessions = [(workbook_id, self._sessions[workbook_id])] if workbook_id in self._sessions else []
+
+        response = None
+        for workbook_id, session_id in sessions:
+            url = "me/drive/items/{}/workbook/refreshSession".format(workbook_id)
+            try:
+                response = self._client._post(self._client.base_url + url, headers={"workbook-session-id": session_id})
+            except exceptions.BaseError as e:
+                if is_session_error(e) or isinstance(e, exceptions.NotFound):
+                    self.invalidate(workbook_id, session_id)
+            except OSError:
+                # Network errors are retried at the next refresh.
+                pass
+        return response if len(sessions) == 1 else None
+
+    def close(self, workbook_id: str = None) -> Optional[Response]:
+        """Closes the session of a workbook, or every session of the pool.
+
+        Args:
+            workbook_id (str, optional): Excel file ID. Defaults to None, every workbook.
+
+        Returns:
+            Optional[Response]: Microsoft Graph Response of the close of workbook_id, None if it had no live session.
+        """
+        with self._lock:
+            if workbook_id is None:
+                sessions, self._sessions = self._sessions, {}
+            else:
+                sessions = {workbook_id: self._sessions.pop(workbook_id)} if workbook_id in self._sessions else {}
+
+        response = None
+        for workbook_id, session_id in sessions.items():
+            url = "me/drive/items/{}/workbook/closeSession".format(workbook_id)
+            try:
+                response = self._client._post(self._client.base_url + url, headers={"workbook-session-id": session_id})
+            except exceptions.BaseError as e:
+                # An expired session is already closed.
+                if not (is_session_error(e) or isinstance(e, exceptions.NotFound)):
+                    raise
+        return response if len(sessions) == 1 else None
+
+    def _keep_alive(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+
+def session_request(
+    client,
+    workbook_id: str,
+    method: str,
+    url: str,
+    session_id: str = None,
+    max_retries: int = 3,
+    retryable: tuple = RETRYABLE_ERRORS,
+    **kwargs,
+) -> Response:
+    """Sends a request with the session for a workbook: session_id when given, otherwise the session of the client
+    WorkbookSessions, recreated if expired, or else the global workbook_session_id if any.
+
+    Args:
+        client (Client): Library Client.
+        workbook_id (str): Excel file ID.
+        method (str): HTTP method.
+        url (str): Full url.
+        session_id (str, optional): Workbook session ID. Defaults to None.
+        max_retries (int, optional): Retries on throttling, server and network errors, except the statuses the client
+        Retry policy already retries for the method. Defaults to 3.
+        retryable (tuple, optional): Exceptions retried. Defaults to throttling, server and network errors.
+
+    Returns:
+        Response: Microsoft Graph Response.
+    """
+    if session_id is None and client.workbook_sessions is not None:
+        return client.workbook_sessions.request(workbook_id, method, url, max_retries, retryable, **kwargs)
+    session_id = session_id or client.workbook_session_id
+    headers = {"workbook-session-id": session_id} if session_id else None
+    retryable = request_retryable(client, method, retryable)
+    return with_retries(
+        client, client._request, max_retries, method, url, headers=headers, retryable=retryable, **kwargs
+    )
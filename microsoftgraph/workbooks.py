@@ -1,6 +1,8 @@
+from typing import Iterator
 from urllib.parse import quote_plus
 
 from microsoftgraph.decorators import token_required, workbook_session_id_required
+from microsoftgraph.models import TableRow, Worksheet
 from microsoftgraph.response import Response
 
 
@@ -31,9 +33,9 @@ class Workbooks(object):
         return self._client._post(self._client.base_url + url, **kwargs)
 
     @token_required
-    @workbook_session_id_required
     def refresh_session(self, workbook_id: str, **kwargs) -> Response:
-        """Refresh an existing workbook session.
+        """Refresh an existing workbook session. With an attached WorkbookSessions, its session of the workbook is
+        refreshed if there is one.
 
         https://docs.microsoft.com/en-us/graph/api/workbook-refreshsession?view=graph-rest-1.0&tabs=http
 
@@ -41,16 +43,17 @@ class Workbooks(object):
             workbook_id (str): Excel file ID.
 
         Returns:
-            Response: Microsoft Graph Response.
+            Response: Microsoft Graph Response, None if the pool had no session for the workbook.
         """
-        headers = {"workbook-session-id": self._client.workbook_session_id}
-        url = "me/drive/items/{}/workbook/refreshSession".format(workbook_id)
-        return self._client._post(self._client.base_url + url, headers=headers, **kwargs)
+        sessions = getattr(self._client, "workbook_sessions", None)
+        if sessions is not None:
+            return sessions.refresh(workbook_id)
+        return self._post_session(workbook_id, "refreshSession", **kwargs)
 
     @token_required
-    @workbook_session_id_required
     def close_session(self, workbook_id: str, **kwargs) -> Response:
-        """Close an existing workbook session.
+        """Close an existing workbook session. With an attached WorkbookSessions, its session of the workbook is closed
+        and forgotten if there is one.
 
         https://docs.microsoft.com/en-us/graph/api/workbook-closesession?view=graph-rest-1.0&tabs=http
 
@@ -58,10 +61,17 @@ class Workbooks(object):
             workbook_id (str): Excel file ID.
 
         Returns:
-            Response: Microsoft Graph Response.
+            Response: Microsoft Graph Response, None if the pool had no session for the workbook.
         """
-        headers = {"workbook-session-id": self._client.workbook_session_id}
-        url = "me/drive/items/{}/workbook/closeSession".format(workbook_id)
+        sessions = getattr(self._client, "workbook_sessions", None)
+        if sessions is not None:
+            return sessions.close(workbook_id)
+        return self._post_session(workbook_id, "closeSession", **kwargs)
+
+    @workbook_session_id_required
+    def _post_session(self, workbook_id: str, action: str, **kwargs) -> Response:
+        headers = {"workbook-session-id": self._client.get_workbook_session_id(workbook_id)}
+        url = "me/drive/items/{}/workbook/{}".format(workbook_id, action)
         return self._client._post(self._client.base_url + url, headers=headers, **kwargs)
 
     @token_required
@@ -96,6 +106,24 @@ class Workbooks(object):
         url = "me/drive/items/{}/workbook/worksheets".format(workbook_id)
         return self._client._get(self._client.base_url + url, params=params, **kwargs)
 
+    @token_required
+    def iter_worksheets(self, workbook_id: str, params: dict = None, as_model: bool = False) -> Iterator:
+        """Lazily iterate over the worksheets of a workbook.
+
+        https://docs.microsoft.com/en-us/graph/api/workbook-list-worksheets?view=graph-rest-1.0&tabs=http
+
+        Args:
+            workbook_id (str): Excel file ID.
+            params (dict, optional): Query. Defaults to None.
+            as_model (bool, optional): Yield compact Worksheet models. Defaults to False.
+
+        Yields:
+            dict or Worksheet: Worksheet.
+        """
+        url = "me/drive/items/{}/workbook/worksheets".format(workbook_id)
+        model = Worksheet if as_model else None
+        return self._client._iter(self._client.base_url + url, params=params, model=model)
+
     @token_required
     def get_worksheet(self, workbook_id: str, worksheet_id: str, **kwargs) -> Response:
         """Retrieve the properties and relationships of worksheet object.
@@ -262,6 +290,28 @@ class Workbooks(object):
         url = "me/drive/items/{}/workbook/tables/{}/rows".format(workbook_id, table_id)
         return self._client._get(self._client.base_url + url, params=params, **kwargs)
 
+    @token_required
+    def iter_table_rows(
+        self, workbook_id: str, table_id: str, params: dict = None, prefetch: int = 0, as_model: bool = False
+    ) -> Iterator:
+        """Lazily iterate over the rows of a table, requesting one page at a time.
+
+        https://docs.microsoft.com/en-us/graph/api/table-list-rows?view=graph-rest-1.0&tabs=http
+
+        Args:
+            workbook_id (str): Excel file ID.
+            table_id (str): Excel table ID.
+            params (dict, optional): Query. Defaults to None.
+            prefetch (int, optional): Number of pages to download ahead in the background. Defaults to 0.
+            as_model (bool, optional): Yield compact TableRow models. Defaults to False.
+
+        Yields:
+            dict or TableRow: Table row.
+        """
+        url = "me/drive/items/{}/workbook/tables/{}/rows".format(workbook_id, table_id)
+        model = TableRow if as_model else None
+        return self._client._iter(self._client.base_url + url, params=params, prefetch=prefetch, model=model)
+
     @token_required
     def get_range(self, workbook_id: str, worksheet_id: str, address: str, **kwargs) -> Response:
         """Gets the range object specified by the address or name.
@@ -313,7 +363,7 @@ class Workbooks(object):
         Returns:
             Response: Microsoft Graph Response.
         """
-        headers = {"workbook-session-id": self._client.workbook_session_id}
+        headers = {"workbook-session-id": self._client.get_workbook_session_id(workbook_id)}
         url = "me/drive/items/{}/workbook/worksheets/{}/range(address='{}')".format(
             workbook_id, quote_plus(worksheet_id), address
         )
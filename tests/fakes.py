@@ -0,0 +1,124 @@
+import itertools
+import json
+import re
+import threading
+from urllib.parse import unquote
+
+from microsoftgraph.client import Client
+from microsoftgraph.response import RawResponse
+
+
+class StreamResponse(RawResponse):
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+
+class FakeSession(object):
+    def __init__(self, handler) -> None:
+        """requests.Session stand-in answering every request with handler(method, url, headers, kwargs)."""
+        self.handler = handler
+        self.calls = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.calls.append((method, url, headers, kwargs))
+        return self.handler(method, url, headers, kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+def json_response(status_code: int, body, headers: dict = None) -> RawResponse:
+    headers = dict({"Content-Type": "application/json"}, **(headers or {}))
+    return RawResponse(status_code, headers, json.dumps(body).encode())
+
+
+def make_client(handler, **kwargs) -> tuple:
+    session = FakeSession(handler)
+    client = Client("CLIENT_ID", "CLIENT_SECRET", session=session, **kwargs)
+    client.set_token({"access_token": "token"})
+    return client, session
+
+
+class FakeDrive(object):
+    def __init__(self) -> None:
+        """In-memory drive answering the DriveItem requests of the mirror. Folders have None as content."""
+        self.items = {"root": {"name": "root", "parent": None, "content": None, "ctag": 0}}
+        self.downloads = []
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def path(self, item_id: str) -> str:
+        parts = []
+        while self.items[item_id]["parent"] is not None:
+            parts.append(self.items[item_id]["name"])
+            item_id = self.items[item_id]["parent"]
+        return "/" + "/".join(reversed(parts))
+
+    def find(self, path: str) -> str:
+        for item_id in self.items:
+            if self.path(item_id) == path:
+                return item_id
+
+    def add(self, path: str, content: bytes = None) -> str:
+        parent = "root"
+        parts = path.strip("/").split("/")
+        for depth, name in enumerate(parts, 1):
+            item_id = self.find("/" + "/".join(parts[:depth]))
+            if item_id is None:
+                item_id = "i{}".format(next(self._ids))
+                file_content = content if depth == len(parts) else None
+                self.items[item_id] = {"name": name, "parent": parent, "content": file_content, "ctag": 0}
+            parent = item_id
+        return parent
+
+    def move(self, path: str, new_path: str) -> None:
+        item = self.items[self.find(path)]
+        parent, item["name"] = new_path.rsplit("/", 1)
+        item["parent"] = self.find(parent) if parent else "root"
+
+    def write(self, path: str, content: bytes) -> None:
+        item = self.items[self.find(path)]
+        item["content"] = content
+        item["ctag"] += 1
+
+    def metadata(self, item_id: str) -> dict:
+        item = self.items[item_id]
+        data = {
+            "id": item_id,
+            "name": item["name"],
+            "eTag": "e{}".format(item["ctag"]),
+            "cTag": "c{}".format(item["ctag"]),
+        }
+        if item["parent"] is not None:
+            parent = self.path(item["parent"])
+            data["parentReference"] = {"id": item["parent"], "path": "/drive/root:" + ("" if parent == "/" else parent)}
+        if item["content"] is None:
+            data["folder"] = {}
+        else:
+            data["file"] = {}
+            data["size"] = len(item["content"])
+            data["@microsoft.graph.downloadUrl"] = "https://download/" + item_id
+        return data
+
+    def handler(self, method, url, headers, kwargs):
+        with self._lock:
+            if url.startswith("https://download/"):
+                item_id = url[len("https://download/") :]
+                self.downloads.append(self.path(item_id))
+                return StreamResponse(200, {}, self.items[item_id]["content"])
+            path = unquote(url.split("v1.0/", 1)[1])
+            if method == "GET" and path == "me/drive/root":
+                return json_response(200, self.metadata("root"))
+            match = re.match(r"me/drive/(?:items/(\w+)|root)/children$", path)
+            if method == "GET" and match:
+                parent = match.group(1) or "root"
+                children = [self.metadata(i) for i, item in self.items.items() if item["parent"] == parent]
+                return json_response(200, {"value": children})
+            match = re.match(r"me/drive/items/(\w+)$", path)
+            if method == "GET" and match:
+                return json_response(200, self.metadata(match.group(1)))
+            raise AssertionError("Unexpected request: {} {}".format(method, path))
@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+
+from microsoftgraph.retry import Retry
+from microsoftgraph.tables import TableAppender
+from microsoftgraph.workbook_sessions import WorkbookSessions
+
+httpx = pytest.importorskip("httpx")
+from microsoftgraph.async_client import AsyncClient  # noqa: E402
+
+
+def make_async_client(handler, token: dict = None, **kwargs) -> AsyncClient:
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = AsyncClient("CLIENT_ID", "CLIENT_SECRET", session=session, **kwargs)
+    client.set_token(token or {"access_token": "token"})
+    return client
+
+
+def test_pages_are_followed():
+    def handler(request):
+        if "page=2" in str(request.url):
+            return httpx.Response(200, json={"value": [3]})
+        next_link = "https://graph.microsoft.com/v1.0/me/messages?page=2"
+        return httpx.Response(200, json={"value": [1, 2], "@odata.nextLink": next_link})
+
+    async def main():
+        async with make_async_client(handler) as client:
+            return await client.mail.list_messages()
+
+    assert asyncio.run(main()).data["value"] == [1, 2, 3]
+
+
+def test_throttled_request_is_retried():
+    statuses = [429, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), headers={"Retry-After": "0"}, json={"id": "m"})
+
+    async def main():
+        async with make_async_client(handler, retry=Retry(backoff_factor=0)) as client:
+            return await client.mail.get_message("m")
+
+    response = asyncio.run(main())
+    assert response.data == {"id": "m"} and response.retries == 1
+
+
+def test_expiring_token_is_refreshed_once():
+    refreshes = []
+
+    def handler(request):
+        if request.url.path.endswith("/token"):
+            refreshes.append(request)
+            return httpx.Response(200, json={"access_token": "fresh", "expires_in": 3600})
+        assert request.headers["Authorization"] == "Bearer fresh"
+        return httpx.Response(200, json={"id": "m"})
+
+    token = {"access_token": "stale", "refresh_token": "refresh", "expires_at": time.time()}
+
+    async def main():
+        async with make_async_client(handler, token, redirect_uri="https://app/callback") as client:
+            await asyncio.gather(*[client.mail.get_message("m") for _ in range(5)])
+            return client.token
+
+    assert asyncio.run(main())["access_token"] == "fresh"
+    assert len(refreshes) == 1
+
+
+def test_rejected_token_is_replayed_once():
+    def handler(request):
+        if request.url.path.endswith("/token"):
+            return httpx.Response(200, json={"access_token": "fresh"})
+        if request.headers["Authorization"] == "Bearer stale":
+            return httpx.Response(401, json={"error": {"code": "InvalidAuthenticationToken"}})
+        return httpx.Response(200, json={"id": "m"})
+
+    token = {"access_token": "stale", "refresh_token": "refresh"}
+
+    async def main():
+        async with make_async_client(handler, token, redirect_uri="https://app/callback") as client:
+            return await client.mail.get_message("m")
+
+    assert asyncio.run(main()).data == {"id": "m"}
+
+
+@pytest.mark.parametrize(
+    "start",
+    [
+        lambda client: client.batch(),
+        lambda client: client.delta(),
+        lambda client: WorkbookSessions(client, ["workbook"]),
+        lambda client: TableAppender(client, "workbook", "table"),
+    ],
+)
+def test_sync_only_helpers_are_rejected(start):
+    client = make_async_client(lambda request: httpx.Response(200, json={}))
+    with pytest.raises(TypeError, match="requires the synchronous Client"):
+        start(client)
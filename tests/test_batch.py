@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from microsoftgraph import exceptions
+from tests.fakes import json_response, make_client
+
+
+def batch_handler(statuses: dict = None):
+    # Answers each request of a $batch call with 200, or the status given for its url.
+    statuses = statuses or {}
+
+    def handler(method, url, headers, kwargs):
+        assert method == "POST" and url.endswith("$batch")
+        responses = []
+        for request in json.loads(kwargs["data"])["requests"]:
+            status = statuses.get(request["url"], 200)
+            body = {"url": request["url"]} if status == 200 else {"error": {"code": str(status)}}
+            responses.append(
+                {"id": request["id"], "status": status, "body": body, "headers": {"Content-Type": "application/json"}}
+            )
+        return json_response(200, {"responses": responses})
+
+    return handler
+
+
+def sent(session) -> list:
+    return [json.loads(kwargs["data"])["requests"] for _, _, _, kwargs in session.calls]
+
+
+def test_split_in_chunks_of_twenty():
+    client, session = make_client(batch_handler())
+    batch = client.batch()
+    requests = [batch.mail.get_message("m{}".format(i)) for i in range(45)]
+    batch.execute()
+
+    assert [len(chunk) for chunk in sent(session)] == [20, 20, 5]
+    for i, request in enumerate(requests):
+        assert request.result().data["url"] == "/me/messages/m{}".format(i)
+
+
+def test_depends_on_within_a_chunk():
+    client, session = make_client(batch_handler({"/me/messages/missing": 404, "/me/messages/next": 424}))
+    batch = client.batch()
+    first = batch.mail.get_message("missing")
+    second = batch.mail.get_message("next").after(first)
+    batch.execute()
+
+    assert sent(session)[0][1]["dependsOn"] == [first.id]
+    with pytest.raises(exceptions.NotFound):
+        first.result()
+    with pytest.raises(exceptions.FailedDependency):
+        second.result()
+
+
+def test_failed_dependency_in_an_earlier_chunk():
+    client, session = make_client(batch_handler({"/me/messages/m0": 404}))
+    batch = client.batch()
+    requests = [batch.mail.get_message("m{}".format(i)) for i in range(20)]
+    dependent = batch.mail.get_message("dependent").after(requests[0])
+    independent = batch.mail.get_message("independent").after(requests[1])
+    batch.execute()
+
+    second_chunk = sent(session)[1]
+    assert [request["url"] for request in second_chunk] == ["/me/messages/independent"]
+    assert "dependsOn" not in second_chunk[0]
+    with pytest.raises(exceptions.FailedDependency):
+        dependent.result()
+    assert independent.result().data["url"] == "/me/messages/independent"
+
+
+def test_dependency_must_be_queued_before():
+    client, _ = make_client(batch_handler())
+    batch = client.batch()
+    first = batch.mail.get_message("a")
+    second = batch.mail.get_message("b")
+    with pytest.raises(ValueError):
+        first.after(second)
+
+
+def test_unmapped_status_fails_only_its_request():
+    client, _ = make_client(batch_handler({"/me/messages/locked": 423, "/me/messages/gateway": 502}))
+    batch = client.batch()
+    first = batch.mail.get_message("first")
+    locked = batch.mail.get_message("locked")
+    gateway = batch.mail.get_message("gateway")
+    last = batch.mail.get_message("last")
+    batch.execute()
+
+    assert first.result().data["url"] == "/me/messages/first"
+    assert last.result().data["url"] == "/me/messages/last"
+    with pytest.raises(exceptions.UnknownError):
+        locked.result()
+    with pytest.raises(exceptions.UnknownError):
+        gateway.result()
+
+
+def test_lock_mismatch_is_unavailable():
+    def handler(method, url, headers, kwargs):
+        return json_response(423, {"error": {"code": "resourceLocked", "innerError": {"code": "lockMismatch"}}})
+
+    client, _ = make_client(handler)
+    with pytest.raises(exceptions.ServiceUnavailable):
+        client._get(client.base_url + "me/drive/items/1")
@@ -0,0 +1,131 @@
+import os
+
+import pytest
+import requests
+
+import microsoftgraph.transfers
+from microsoftgraph import exceptions
+from microsoftgraph.quickxor import QuickXorHash
+from microsoftgraph.transfers import UPLOAD_CHUNK_MULTIPLE, ChunkedUploader
+from tests.fakes import json_response, make_client
+
+UPLOAD_URL = "https://upload.example.com/session"
+
+
+class FakeUploadSession(object):
+    def __init__(self, size: int, failures: list = None) -> None:
+        """Upload session keeping the received bytes. failures holds, for each request in turn, None or the
+        (when, error) to raise: "before" the chunk is stored or "after", as a response lost on the way back."""
+        self.size = size
+        self.failures = list(failures or [])
+        self.content = bytearray(size)
+        self.received = 0
+        self.requests = []
+
+    def handler(self, method, url, headers, kwargs):
+        if url.endswith("/createUploadSession"):
+            return json_response(200, {"uploadUrl": UPLOAD_URL})
+        assert url == UPLOAD_URL
+        self.requests.append((method, (headers or {}).get("Content-Range")))
+        failure = self.failures.pop(0) if self.failures else None
+        if failure and failure[0] == "before":
+            raise failure[1]
+        response = self._handle(method, headers, kwargs)
+        if failure:
+            raise failure[1]
+        return response
+
+    def _handle(self, method, headers, kwargs):
+        if method == "GET":
+            return json_response(200, {"nextExpectedRanges": ["{}-".format(self.received)]})
+        start, end = map(int, headers["Content-Range"].split(" ")[1].split("/")[0].split("-"))
+        assert start <= self.received, "bytes skipped"
+        self.content[start : end + 1] = kwargs["data"]
+        self.received = max(self.received, end + 1)
+        if self.received < self.size:
+            return json_response(202, {"nextExpectedRanges": ["{}-".format(self.received)]})
+        hashes = {"quickXorHash": QuickXorHash(bytes(self.content)).b64digest()}
+        return json_response(201, {"id": "item", "size": self.size, "file": {"hashes": hashes}})
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(microsoftgraph.transfers.time, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(os.urandom(UPLOAD_CHUNK_MULTIPLE * 3 + 1000))
+    return path
+
+
+def upload(session, local_file, max_retries: int = 5, **kwargs):
+    client, _ = make_client(session.handler)
+    uploader = ChunkedUploader(
+        client, chunk_size=UPLOAD_CHUNK_MULTIPLE, max_retries=max_retries, simple_upload_max_size=0
+    )
+    return uploader.upload(str(local_file), **kwargs)
+
+
+def test_chunks_are_sent_in_order(local_file):
+    session = FakeUploadSession(local_file.stat().st_size)
+    response = upload(session, local_file, filename="/upload.bin")
+
+    assert response.data["id"] == "item"
+    assert bytes(session.content) == local_file.read_bytes()
+    assert [method for method, _ in session.requests] == ["PUT"] * 4
+
+
+def test_lost_responses_resume_from_the_session(local_file):
+    error = requests.exceptions.ConnectionError("reset")
+    session = FakeUploadSession(local_file.stat().st_size, [None, ("after", error), None, ("before", error)])
+    upload(session, local_file, filename="/upload.bin")
+
+    assert bytes(session.content) == local_file.read_bytes()
+    assert [method for method, _ in session.requests] == ["PUT", "PUT", "GET", "PUT", "GET", "PUT", "PUT"]
+
+
+def test_failed_probe_is_retried(local_file):
+    error = requests.exceptions.ConnectionError("reset")
+    failures = [("before", error), ("before", error), ("before", error)]
+    session = FakeUploadSession(local_file.stat().st_size, failures)
+    upload(session, local_file, filename="/upload.bin")
+
+    assert bytes(session.content) == local_file.read_bytes()
+    assert [method for method, _ in session.requests][:5] == ["PUT", "GET", "GET", "GET", "PUT"]
+
+
+def test_resume_from_an_upload_url(local_file):
+    session = FakeUploadSession(local_file.stat().st_size)
+    session.content[: UPLOAD_CHUNK_MULTIPLE * 2] = local_file.read_bytes()[: UPLOAD_CHUNK_MULTIPLE * 2]
+    session.received = UPLOAD_CHUNK_MULTIPLE * 2
+    upload(session, local_file, upload_url=UPLOAD_URL)
+
+    assert bytes(session.content) == local_file.read_bytes()
+    assert [method for method, _ in session.requests] == ["GET", "PUT", "PUT"]
+
+
+def test_retries_are_bounded(local_file):
+    error = requests.exceptions.ConnectionError("down")
+    session = FakeUploadSession(local_file.stat().st_size, [("before", error)] * 10)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        upload(session, local_file, max_retries=2, filename="/upload.bin")
+    assert len(session.requests) == 3
+
+
+def test_expired_session_is_not_retried(local_file):
+    expired = exceptions.NotFound({"error": {"code": "itemNotFound"}})
+    session = FakeUploadSession(local_file.stat().st_size, [("before", expired)])
+    with pytest.raises(exceptions.NotFound):
+        upload(session, local_file, filename="/upload.bin")
+    assert len(session.requests) == 1
+
+
+def test_target_is_required(local_file):
+    session = FakeUploadSession(local_file.stat().st_size)
+    with pytest.raises(ValueError):
+        upload(session, local_file)
+    client, _ = make_client(session.handler)
+    with pytest.raises(ValueError):
+        client.files.drive_create_upload_session()
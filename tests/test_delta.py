@@ -0,0 +1,96 @@
+import pytest
+
+from microsoftgraph import exceptions
+from microsoftgraph.delta import DeltaStateStore, DeltaSync, FileDeltaStateStore
+from tests.fakes import json_response, make_client
+
+BASE_URL = "https://graph.microsoft.com/v1.0/"
+DELTA_URL = BASE_URL + "me/mailFolders/inbox/messages/delta"
+
+
+class FakeDeltaEndpoint(object):
+    def __init__(self, messages: list) -> None:
+        """Message delta query. The initial round lists messages over two pages, a delta link returns the changes
+        made since it was issued."""
+        self.messages = list(messages)
+        self.changes = []
+        self.expired = False
+        self.fail_page = False
+        self.urls = []
+
+    def handler(self, method, url, headers, kwargs):
+        self.urls.append(url)
+        if url == DELTA_URL:
+            half = len(self.messages) // 2
+            page = {"value": self.messages[:half], "@odata.nextLink": BASE_URL + "page2"}
+            return json_response(200, page)
+        if url == BASE_URL + "page2":
+            if self.fail_page:
+                return json_response(500, {"error": {"code": "generalException"}})
+            return json_response(200, self.delta_page(self.messages[len(self.messages) // 2 :]))
+        if url.startswith(BASE_URL + "delta?token="):
+            if self.expired:
+                return json_response(410, {"error": {"code": "syncStateNotFound"}})
+            changes, self.changes = self.changes, []
+            return json_response(200, self.delta_page(changes))
+        raise AssertionError("Unexpected request: {}".format(url))
+
+    def delta_page(self, value: list) -> dict:
+        return {"value": value, "@odata.deltaLink": BASE_URL + "delta?token={}".format(len(self.urls))}
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        DeltaStateStore()
+
+
+def test_rounds_after_the_first_only_fetch_changes():
+    endpoint = FakeDeltaEndpoint([{"id": "1"}, {"id": "2"}, {"id": "3"}])
+    client, _ = make_client(endpoint.handler)
+    sync = DeltaSync(client)
+
+    first = sync.messages("inbox")
+    assert first.full_sync and [m["id"] for m in first.changed] == ["1", "2", "3"]
+
+    endpoint.changes = [{"id": "4"}, {"id": "2", "@removed": {"reason": "deleted"}}]
+    result = sync.messages("inbox")
+    assert not result.full_sync
+    assert [m["id"] for m in result.changed] == ["4"] and [m["id"] for m in result.removed] == ["2"]
+    assert endpoint.urls[-1] == first.delta_link
+
+
+def test_expired_delta_link_restarts_a_full_sync():
+    endpoint = FakeDeltaEndpoint([{"id": "1"}, {"id": "2"}])
+    client, _ = make_client(endpoint.handler)
+    sync = DeltaSync(client)
+    sync.messages("inbox")
+
+    endpoint.expired = True
+    result = sync.messages("inbox")
+    assert result.full_sync and [m["id"] for m in result.changed] == ["1", "2"]
+
+
+def test_interrupted_round_keeps_the_previous_link():
+    endpoint = FakeDeltaEndpoint([{"id": "1"}, {"id": "2"}])
+    client, _ = make_client(endpoint.handler)
+    sync = DeltaSync(client)
+
+    endpoint.fail_page = True
+    with pytest.raises(exceptions.InternalServerError):
+        sync.messages("inbox")
+    assert sync.store.get(sync._state_key("mail:inbox")) is None
+
+    endpoint.fail_page = False
+    assert sync.messages("inbox").full_sync
+
+
+def test_file_store_resumes_in_another_process(tmp_path):
+    endpoint = FakeDeltaEndpoint([{"id": "1"}, {"id": "2"}])
+    client, _ = make_client(endpoint.handler)
+    path = str(tmp_path / "delta.json")
+    DeltaSync(client, FileDeltaStateStore(path)).messages("inbox")
+
+    sync = DeltaSync(client, FileDeltaStateStore(path))
+    assert not sync.messages("inbox").full_sync
+    sync.reset("mail:inbox")
+    assert sync.messages("inbox").full_sync
@@ -0,0 +1,62 @@
+import pytest
+
+import microsoftgraph.jsoncodec
+from microsoftgraph.jsoncodec import JSONCodec, OrjsonCodec, default_codec
+from microsoftgraph.response import RawResponse, Response
+from tests.fakes import json_response, make_client
+
+BASE_URL = "https://graph.microsoft.com/v1.0/"
+DOCUMENT = {"subject": "Café", "values": [[1, 2.5, None, True]], "nested": {"empty": []}}
+
+
+class CountingCodec(JSONCodec):
+    def __init__(self) -> None:
+        self.loaded = 0
+        self.dumped = 0
+
+    def loads(self, data: bytes):
+        self.loaded += 1
+        return super().loads(data)
+
+    def dumps(self, obj) -> bytes:
+        self.dumped += 1
+        return super().dumps(obj)
+
+
+def test_standard_codec_round_trip():
+    codec = JSONCodec()
+    data = codec.dumps(DOCUMENT)
+    assert isinstance(data, bytes) and b", " not in data
+    assert codec.loads(data) == DOCUMENT
+
+
+def test_orjson_codec_round_trip():
+    pytest.importorskip("orjson")
+    codec = OrjsonCodec()
+    assert codec.loads(codec.dumps(DOCUMENT)) == DOCUMENT
+    assert isinstance(default_codec(), OrjsonCodec)
+
+
+def test_without_orjson(monkeypatch):
+    monkeypatch.setattr(microsoftgraph.jsoncodec, "orjson", None)
+    with pytest.raises(ImportError):
+        OrjsonCodec()
+    assert type(default_codec()) is JSONCodec
+
+
+def test_response_is_decoded_once_on_access():
+    codec = CountingCodec()
+    response = Response(json_response(200, DOCUMENT), codec=codec)
+    assert codec.loaded == 0
+    assert response.data == DOCUMENT and response.data == DOCUMENT
+    assert codec.loaded == 1
+    assert Response(RawResponse(200, {"Content-Type": "text/plain"}, b"text"), codec=codec).data == b"text"
+
+
+def test_client_uses_its_codec_both_ways():
+    codec = CountingCodec()
+    client, session = make_client(lambda *args: json_response(201, DOCUMENT), json_codec=codec)
+    assert client._post(BASE_URL + "me/messages", json=DOCUMENT).data == DOCUMENT
+    _, _, _, kwargs = session.calls[0]
+    assert "json" not in kwargs and codec.loads(kwargs["data"]) == DOCUMENT
+    assert codec.dumped == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from microsoftgraph.models import DriveItem, Message, Model
+from tests.fakes import json_response, make_client
+
+MESSAGE = {
+    "@odata.etag": 'W/"1"',
+    "id": "m1",
+    "subject": "Hello",
+    "isRead": False,
+    "from": {"emailAddress": {"name": "Bob", "address": "bob@example.com"}},
+    "toRecipients": [
+        {"emailAddress": {"name": "Alice", "address": "alice@example.com"}},
+        {"emailAddress": {"name": "Carol", "address": "carol@example.com"}},
+    ],
+    "body": {"contentType": "text", "content": "Hi"},
+    "importance": "normal",
+}
+
+
+def test_only_declared_properties_are_kept():
+    message = Message.from_dict(MESSAGE)
+    assert (message.id, message.subject, message.is_read, message.cc_recipients) == ("m1", "Hello", False, None)
+    assert not hasattr(message, "__dict__")
+    with pytest.raises(AttributeError):
+        message.importance = "high"
+
+
+def test_nested_structures_are_built_on_first_access():
+    message = Message.from_dict(MESSAGE)
+    assert isinstance(message._sender, dict)
+    assert message.sender.email_address.address == "bob@example.com"
+    assert message.sender is message.sender
+    assert [r.email_address.name for r in message.to_recipients] == ["Alice", "Carol"]
+    assert isinstance(message.to_recipients, tuple)
+
+
+def test_to_dict_round_trip():
+    message = Message.from_dict(MESSAGE)
+    data = message.to_dict()
+    assert "importance" not in data and "@odata.etag" not in data
+    assert data["from"] == MESSAGE["from"] and data["toRecipients"] == MESSAGE["toRecipients"]
+    assert Message.from_dict(data) == message
+    assert repr(message) == "<Message [m1]>"
+
+
+def test_select_lists_the_model_properties():
+    select = Message.select().split(",")
+    assert "subject" in select and "from" in select and "toRecipients" in select
+    assert "importance" not in select
+    assert "parentReference" in DriveItem.select().split(",")
+
+
+def test_iter_messages_as_models():
+    def handler(method, url, headers, kwargs):
+        assert kwargs["params"]["$select"] == Message.select()
+        return json_response(200, {"value": [MESSAGE, dict(MESSAGE, id="m2")]})
+
+    client, _ = make_client(handler)
+    messages = list(client.mail.iter_messages(as_model=True))
+    assert [type(m) for m in messages] == [Message, Message]
+    assert [m.id for m in messages] == ["m1", "m2"]
+
+
+def test_subclass_declares_its_slots():
+    class Minimal(Model):
+        FIELDS = {"id": "id"}
+
+    assert Minimal.__slots__ == ("id",)
+    assert Minimal.from_dict({"id": "x", "name": "dropped"}).to_dict() == {"id": "x"}
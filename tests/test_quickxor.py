@@ -0,0 +1,75 @@
+import base64
+import os
+import random
+
+from microsoftgraph.quickxor import QuickXorHash, quickxor_file
+
+
+def naive_quickxor(data: bytes) -> str:
+    # Byte by byte transcription of the reference algorithm.
+    register = 0
+    for i, value in enumerate(data):
+        shift = (i * 11) % 160
+        register ^= ((value << shift) | (value >> (160 - shift))) & ((1 << 160) - 1)
+    digest = bytearray(register.to_bytes(20, "little"))
+    for i, value in enumerate(len(data).to_bytes(8, "little")):
+        digest[12 + i] ^= value
+    return base64.b64encode(bytes(digest)).decode()
+
+
+def test_known_vector():
+    assert QuickXorHash(b"hello world").b64digest() == "aCgDG9jwBhDc4Q1yawMZAAAAAAA="
+
+
+def test_empty():
+    assert QuickXorHash().b64digest() == naive_quickxor(b"")
+
+
+def test_random_chunks_match_reference():
+    rng = random.Random(0)
+    for size in (1, 159, 160, 161, 320, 1000, 4097, 50000):
+        data = bytes(rng.getrandbits(8) for _ in range(size))
+        hasher = QuickXorHash()
+        position = 0
+        while position < size:
+            length = rng.randint(1, 700)
+            hasher.update(data[position : position + length])
+            position += length
+        assert hasher.b64digest() == naive_quickxor(data), size
+
+
+def test_out_of_order_offsets():
+    data = os.urandom(10000)
+    chunks = [(offset, data[offset : offset + 777]) for offset in range(0, len(data), 777)]
+    random.Random(1).shuffle(chunks)
+    hasher = QuickXorHash()
+    for offset, chunk in chunks:
+        hasher.update(chunk, offset=offset)
+    assert hasher.b64digest() == QuickXorHash(data).b64digest()
+
+
+def test_merge_disjoint_ranges():
+    data = os.urandom(5000)
+    first, second = QuickXorHash(), QuickXorHash()
+    first.update(data[:1234], offset=0)
+    second.update(data[3001:], offset=3001)
+    first.update(data[1234:3001], offset=1234)
+    first.merge(second)
+    assert first.length == len(data)
+    assert first.b64digest() == naive_quickxor(data)
+
+
+def test_state_round_trip():
+    data = os.urandom(3000)
+    hasher = QuickXorHash(data[:1111])
+    resumed = QuickXorHash()
+    resumed.set_state(hasher.get_state())
+    resumed.update(data[1111:])
+    assert resumed.b64digest() == naive_quickxor(data)
+
+
+def test_file(tmp_path):
+    data = os.urandom(70000)
+    path = tmp_path / "file.bin"
+    path.write_bytes(data)
+    assert quickxor_file(str(path), chunk_size=4096) == naive_quickxor(data)
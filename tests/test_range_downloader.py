@@ -0,0 +1,131 @@
+import os
+
+import pytest
+import requests
+
+import microsoftgraph.transfers
+from microsoftgraph import exceptions
+from microsoftgraph.quickxor import QuickXorHash
+from microsoftgraph.retry import Retry
+from microsoftgraph.transfers import RangeDownloader
+from tests.fakes import StreamResponse, json_response, make_client
+
+DOWNLOAD_URL = "https://download.example.com/content"
+RANGE_SIZE = 1000
+
+
+class FakeDownload(object):
+    def __init__(self, content: bytes, failures: dict = None, honour_range: bool = True) -> None:
+        """Pre-authenticated download url. failures maps a range offset to the responses or errors given before the
+        range is served."""
+        self.content = content
+        self.failures = {offset: list(errors) for offset, errors in (failures or {}).items()}
+        self.honour_range = honour_range
+        self.ranges = []
+
+    def handler(self, method, url, headers, kwargs):
+        assert (method, url) == ("GET", DOWNLOAD_URL)
+        if not self.honour_range or "Range" not in (headers or {}):
+            self.ranges.append(None)
+            return StreamResponse(200, {}, self.content)
+        start, end = map(int, headers["Range"].split("=")[1].split("-"))
+        self.ranges.append(start)
+        if self.failures.get(start):
+            failure = self.failures[start].pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            return failure
+        content_range = "bytes {}-{}/{}".format(start, end, len(self.content))
+        return StreamResponse(206, {"Content-Range": content_range}, self.content[start : end + 1])
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(microsoftgraph.transfers.time, "sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.fixture
+def content():
+    return os.urandom(RANGE_SIZE * 4 + 500)
+
+
+def download(download, content, path, max_retries=3, **kwargs):
+    client, _ = make_client(download.handler, **kwargs)
+    downloader = RangeDownloader(client, range_size=RANGE_SIZE, max_workers=1, max_retries=max_retries)
+    hashes = {"quickXorHash": QuickXorHash(content).b64digest()}
+    downloader.download_url(DOWNLOAD_URL, str(path), len(content), hashes=hashes, etag="v1")
+
+
+def test_ranges_are_assembled_and_verified(tmp_path, content, sleeps):
+    fake = FakeDownload(content)
+    download(fake, content, tmp_path / "file.bin")
+    assert (tmp_path / "file.bin").read_bytes() == content
+    assert sorted(fake.ranges) == list(range(0, len(content), RANGE_SIZE))
+    assert os.listdir(tmp_path) == ["file.bin"]
+
+
+def test_failed_range_is_retried_on_its_own(tmp_path, content, sleeps):
+    fake = FakeDownload(content, failures={2000: [requests.ConnectionError("reset")]})
+    download(fake, content, tmp_path / "file.bin")
+    assert (tmp_path / "file.bin").read_bytes() == content
+    assert fake.ranges.count(2000) == 2
+    assert fake.ranges.count(0) == 1
+    assert len(sleeps) == 1
+
+
+def test_resume_skips_the_finished_ranges(tmp_path, content, sleeps):
+    fake = FakeDownload(content, failures={3000: [requests.ConnectionError("reset")]})
+    with pytest.raises(requests.ConnectionError):
+        download(fake, content, tmp_path / "file.bin", max_retries=0)
+    assert os.path.exists(str(tmp_path / "file.bin.part.progress"))
+
+    fake.ranges = []
+    download(fake, content, tmp_path / "file.bin")
+    assert fake.ranges == [3000]
+    assert (tmp_path / "file.bin").read_bytes() == content
+
+
+def test_progress_of_another_version_is_discarded(tmp_path, content, sleeps):
+    fake = FakeDownload(content, failures={3000: [requests.ConnectionError("reset")]})
+    with pytest.raises(requests.ConnectionError):
+        download(fake, content, tmp_path / "file.bin", max_retries=0)
+
+    fake.ranges = []
+    client, _ = make_client(fake.handler)
+    downloader = RangeDownloader(client, range_size=RANGE_SIZE, max_workers=1)
+    downloader.download_url(DOWNLOAD_URL, str(tmp_path / "file.bin"), len(content), etag="v2")
+    assert sorted(fake.ranges) == list(range(0, len(content), RANGE_SIZE))
+    assert (tmp_path / "file.bin").read_bytes() == content
+
+
+def test_server_ignoring_range_falls_back_to_a_single_stream(tmp_path, content, sleeps):
+    fake = FakeDownload(content, honour_range=False)
+    download(fake, content, tmp_path / "file.bin")
+    assert (tmp_path / "file.bin").read_bytes() == content
+    assert None in fake.ranges
+
+
+def test_corrupted_content_is_rejected(tmp_path, content, sleeps):
+    fake = FakeDownload(content[:1000] + b"x" + content[1001:])
+    with pytest.raises(exceptions.IntegrityError):
+        download(fake, content, tmp_path / "file.bin")
+    assert not os.path.exists(str(tmp_path / "file.bin"))
+
+
+def test_retry_after_of_the_failed_range_is_honored(tmp_path, content, sleeps):
+    throttled = json_response(503, {"error": {"code": "serviceNotAvailable"}}, {"Retry-After": "7"})
+    fake = FakeDownload(content, failures={1000: [throttled]})
+    download(fake, content, tmp_path / "file.bin", retry=None)
+    assert sleeps == [7.0]
+    assert (tmp_path / "file.bin").read_bytes() == content
+
+
+def test_backoff_follows_the_client_retry_policy(tmp_path, content, sleeps):
+    throttled = json_response(503, {"error": {"code": "serviceNotAvailable"}}, {"Retry-After": "7"})
+    fake = FakeDownload(content, failures={1000: [throttled, throttled]})
+    retry = Retry(total=0, max_backoff=0.25, respect_retry_after=False)
+    download(fake, content, tmp_path / "file.bin", retry=retry)
+    assert len(sleeps) == 2
+    assert all(0 <= seconds <= 0.25 for seconds in sleeps)
@@ -0,0 +1,108 @@
+import re
+import threading
+
+import pytest
+
+import microsoftgraph.workbook_sessions
+from microsoftgraph.ranges import RangeReader, column_type, convert_column
+from microsoftgraph.utils import parse_range, range_address
+from tests.fakes import json_response, make_client
+
+HEADER = ["name", "count", "ratio"]
+
+
+class FakeSheet(object):
+    def __init__(self, rows: list, row: int = 1, column: int = 1, failures: int = 0) -> None:
+        """Worksheet holding rows from the zero based (row, column). The first failures range reads answer 503."""
+        self.rows = rows
+        self.row = row
+        self.column = column
+        self.failures = failures
+        self.requests = []
+        self._lock = threading.Lock()
+
+    @property
+    def used_range(self) -> str:
+        return "Sheet1!" + range_address(self.row, self.column, len(self.rows), len(self.rows[0]))
+
+    def handler(self, method, url, headers, kwargs):
+        assert method == "GET"
+        select = kwargs["params"]["$select"]
+        with self._lock:
+            self.requests.append(select)
+            if "usedRange(valuesOnly=true)" in url:
+                return json_response(200, {"address": self.used_range})
+            address = re.search(r"address='([^']+)'", url).group(1)
+            if select == "address":
+                return json_response(200, {"address": "Sheet1!" + address})
+            if self.failures:
+                self.failures -= 1
+                return json_response(503, {"error": {"code": "serviceNotAvailable"}})
+        row, column, rows, columns = parse_range(address)
+        values = [r[column - self.column : column - self.column + columns] for r in self.rows[row - self.row :][:rows]]
+        return json_response(200, {"values": values})
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(microsoftgraph.workbook_sessions.time, "sleep", lambda seconds: None)
+
+
+def make_rows(count: int) -> list:
+    return [HEADER] + [["row{}".format(i), i, i / 4 if i % 3 else ""] for i in range(count)]
+
+
+def test_blocks_cover_the_used_range_in_order():
+    sheet = FakeSheet(make_rows(25))
+    client, _ = make_client(sheet.handler)
+    reader = RangeReader(client, block_cells=12, max_workers=3)
+    assert reader.dimensions("book", "Sheet1") == (1, 1, 26, 3)
+    blocks = list(reader.iter_blocks("book", "Sheet1"))
+    assert [len(block) for block in blocks] == [4] * 6 + [2]
+    assert [row for block in blocks for row in block] == sheet.rows
+    assert sheet.requests.count("values") == 7
+
+
+def test_explicit_address():
+    sheet = FakeSheet(make_rows(10))
+    client, _ = make_client(sheet.handler)
+    blocks = list(RangeReader(client).iter_blocks("book", "Sheet1", "B3:C5"))
+    assert blocks == [[row[:2] for row in sheet.rows[1:4]]]
+
+
+def test_failed_block_is_retried():
+    sheet = FakeSheet(make_rows(10), failures=2)
+    client, _ = make_client(sheet.handler)
+    blocks = list(RangeReader(client, block_cells=9).iter_blocks("book", "Sheet1"))
+    assert [row for block in blocks for row in block] == sheet.rows
+
+
+def test_read_columns():
+    sheet = FakeSheet(make_rows(6))
+    client, _ = make_client(sheet.handler)
+    columns = RangeReader(client, block_cells=6).read_columns("book", "Sheet1")
+    assert list(columns) == HEADER
+    assert columns["name"] == ["row{}".format(i) for i in range(6)]
+    assert columns["count"] == list(range(6))
+    assert columns["ratio"] == [None, 0.25, 0.5, None, 1.0, 1.25]
+
+    columns = RangeReader(client).read_columns("book", "Sheet1", "B3:C4", header=False)
+    assert columns == {"B": ["row0", "row1"], "C": [0, 1]}
+
+
+def test_read_columns_as_numpy():
+    numpy = pytest.importorskip("numpy")
+    sheet = FakeSheet(make_rows(6))
+    client, _ = make_client(sheet.handler)
+    columns = RangeReader(client).read_columns("book", "Sheet1", as_numpy=True)
+    assert columns["count"].dtype == numpy.int64
+    assert columns["ratio"].dtype == float and numpy.isnan(columns["ratio"][0])
+
+
+def test_column_types():
+    assert column_type([1, "", 2]) is int
+    assert column_type([1, 2.5]) is float
+    assert column_type([True, False]) is bool
+    assert column_type(["a", 1]) is object
+    assert column_type(["", ""]) is str
+    assert convert_column([1, "", 2.5]) == [1.0, None, 2.5]
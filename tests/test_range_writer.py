@@ -0,0 +1,102 @@
+import json
+import random
+import re
+import threading
+
+import pytest
+
+import microsoftgraph.workbook_sessions
+from microsoftgraph.ranges import RangeWriter, to_rows
+from microsoftgraph.utils import column_index, column_letter, parse_cell, parse_range, range_address
+from tests.fakes import json_response, make_client
+
+
+class FakeWorkbook(object):
+    def __init__(self, failures: dict = None) -> None:
+        """Answers session and range PATCH requests, failing the addresses of failures that many times with 503."""
+        self.failures = dict(failures or {})
+        self.bodies = []
+        self.sessions = []
+        self._lock = threading.Lock()
+
+    def handler(self, method, url, headers, kwargs):
+        with self._lock:
+            if url.endswith("/createSession"):
+                self.sessions.append("open")
+                return json_response(201, {"id": "session"})
+            if url.endswith("/closeSession"):
+                self.sessions.append("closed")
+                return json_response(204, {})
+            assert method == "PATCH" and headers["workbook-session-id"] == "session"
+            address = re.search(r"address='([^']+)'", url).group(1)
+            if self.failures.get(address):
+                self.failures[address] -= 1
+                return json_response(503, {"error": {"code": "serviceNotAvailable"}})
+            self.bodies.append((address, kwargs["data"]))
+            return json_response(200, {"address": address})
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(microsoftgraph.workbook_sessions.time, "sleep", lambda seconds: None)
+
+
+def test_a1_helpers():
+    assert [column_letter(i) for i in (0, 25, 26, 27, 16383)] == ["A", "Z", "AA", "AB", "XFD"]
+    assert [column_index(letters) for letters in ("A", "z", "AA", "XFD")] == [0, 25, 26, 16383]
+    assert parse_cell("$B$3") == (2, 1)
+    assert range_address(2, 1, 3, 2) == "B3:C5"
+    assert range_address(0, 0, 1, 1) == "A1"
+    assert parse_range("Sheet1!B3:C5") == (2, 1, 3, 2)
+    assert parse_range("D4") == (3, 3, 1, 1)
+    with pytest.raises(ValueError):
+        parse_cell("3B")
+    with pytest.raises(ValueError):
+        range_address(1048575, 0, 2, 1)
+    with pytest.raises(ValueError):
+        column_letter(16384)
+
+
+def test_to_rows_pads_and_clears_nan():
+    assert to_rows([[1], [1, float("nan"), 3]]) == [[1, None, None], [1, None, 3]]
+
+
+@pytest.mark.parametrize("max_payload_bytes", [57, 100, 300, 1000])
+def test_bodies_never_exceed_the_limit(max_payload_bytes):
+    rng = random.Random(max_payload_bytes)
+    rows = [[i, "x" * rng.randint(0, 30)] for i in range(200)]
+    workbook = FakeWorkbook()
+    client, _ = make_client(workbook.handler)
+    RangeWriter(client, max_payload_bytes=max_payload_bytes).write("workbook", "Sheet1", rows, "B2")
+
+    assert all(len(body) <= max_payload_bytes for _, body in workbook.bodies)
+    written = [row for _, body in workbook.bodies for row in json.loads(body)["values"]]
+    assert written == rows
+    first_rows = [parse_range(address)[0] for address, _ in workbook.bodies]
+    assert first_rows == sorted(first_rows) and first_rows[0] == 1
+
+
+def test_row_above_the_limit_is_rejected_before_sending():
+    workbook = FakeWorkbook()
+    client, session = make_client(workbook.handler)
+    with pytest.raises(ValueError, match="Row 3"):
+        RangeWriter(client, max_payload_bytes=100).write("workbook", "Sheet1", [["a"], ["x" * 100]], "A2")
+    assert session.calls == []
+
+
+def test_failed_block_is_retried_alone():
+    workbook = FakeWorkbook({"A3:B4": 2})
+    client, _ = make_client(workbook.handler)
+    rows = [[i, i * 2] for i in range(6)]
+    responses = RangeWriter(client, max_rows=2, max_workers=3).write("workbook", "Sheet1", rows)
+
+    assert [response.data["address"] for response in responses] == ["A1:B2", "A3:B4", "A5:B6"]
+    assert sorted(address for address, _ in workbook.bodies) == ["A1:B2", "A3:B4", "A5:B6"]
+    assert workbook.sessions == ["open", "closed"]
+
+
+def test_given_session_is_used_without_opening_one():
+    workbook = FakeWorkbook()
+    client, _ = make_client(workbook.handler)
+    RangeWriter(client).write("workbook", "Sheet1", [[1]], session_id="session")
+    assert workbook.sessions == []
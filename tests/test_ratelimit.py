@@ -0,0 +1,74 @@
+import pytest
+
+import microsoftgraph.ratelimit
+from microsoftgraph.ratelimit import RateLimiter, TokenBucket
+from tests.fakes import json_response, make_client
+
+BASE_URL = "https://graph.microsoft.com/v1.0/"
+
+
+class FakeClock(object):
+    def __init__(self) -> None:
+        """Monotonic clock moved forward by sleep."""
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(microsoftgraph.ratelimit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(microsoftgraph.ratelimit.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_the_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.reserve() for _ in range(5)] == [0, 0, 0, 0.5, 1.0]
+    clock.now += 1.0
+    assert bucket.reserve() == 0.5
+
+
+def test_bucket_refills_up_to_its_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.reserve(2)
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0.1]
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_bucket_keys():
+    mail = BASE_URL + "me/messages"
+    workbook = BASE_URL + "users/Bob@example.com/drive/items/1/workbook/worksheets"
+    assert RateLimiter(1).key_for("GET", mail) == "global"
+    assert RateLimiter(1, key="resource").key_for("GET", workbook) == "workbook"
+    assert RateLimiter(1, key="user").key_for("GET", workbook) == "bob@example.com"
+    assert RateLimiter(1, key="user_resource").key_for("GET", mail) == "me:mail"
+    assert RateLimiter(1, key=lambda method, url: method).key_for("GET", mail) == "GET"
+
+
+def test_rates_per_key(clock):
+    limiter = RateLimiter(10, key="user_resource", rates={"workbook": 1})
+    assert limiter.bucket("me:workbook").rate == 1
+    assert limiter.bucket("me:mail").rate == 10
+    assert limiter.bucket("me:mail") is limiter.bucket("me:mail")
+
+
+def test_client_waits_for_the_limiter(clock):
+    limiter = RateLimiter(rate=4, capacity=1)
+    client, session = make_client(lambda *args: json_response(200, {}), rate_limiter=limiter)
+    for _ in range(3):
+        client._get(BASE_URL + "me")
+    assert clock.sleeps == [0.25, 0.25]
+    assert len(session.calls) == 3
@@ -0,0 +1,73 @@
+import pytest
+
+from microsoftgraph.cache import CacheEntry, LRUCache, ResponseCache
+from tests.fakes import json_response, make_client
+
+
+class FakeItem(object):
+    def __init__(self) -> None:
+        """driveItem answering 304 to an If-None-Match of its current ETag."""
+        self.version = 1
+        self.requests = []
+
+    def handler(self, method, url, headers, kwargs):
+        etag = '"v{}"'.format(self.version)
+        self.requests.append((headers or {}).get("If-None-Match"))
+        if (headers or {}).get("If-None-Match") == etag:
+            return json_response(304, {})
+        return json_response(200, {"id": "item", "name": "v{}".format(self.version)}, {"ETag": etag})
+
+
+def item_url(client) -> str:
+    return client.base_url + "me/drive/items/item"
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        ResponseCache()
+
+
+def test_unchanged_resource_is_served_from_the_cache():
+    item = FakeItem()
+    cache = LRUCache()
+    client, _ = make_client(item.handler, response_cache=cache)
+    assert client._get(item_url(client)).data["name"] == "v1"
+    response = client._get(item_url(client))
+    assert response.status_code == 200 and response.data["name"] == "v1"
+    assert item.requests == [None, '"v1"']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_resource_replaces_the_entry():
+    item = FakeItem()
+    client, _ = make_client(item.handler, response_cache=LRUCache())
+    client._get(item_url(client))
+    item.version = 2
+    assert client._get(item_url(client)).data["name"] == "v2"
+    assert client._get(item_url(client)).data["name"] == "v2"
+    assert item.requests == [None, '"v1"', '"v2"']
+
+
+def test_download_urls_are_not_cached():
+    body = {"id": "item", "@microsoft.graph.downloadUrl": "https://download/item"}
+    client, session = make_client(lambda *args: json_response(200, body, {"ETag": '"v1"'}), response_cache=LRUCache())
+    client._get(item_url(client))
+    client._get(item_url(client))
+    assert all("If-None-Match" not in (headers or {}) for _, _, headers, _ in session.calls)
+
+
+def test_lru_eviction_by_entries_bytes_and_ttl():
+    cache = LRUCache(max_entries=2, max_bytes=10)
+    cache.set("a", CacheEntry("e", 200, {}, b"1234"))
+    cache.set("b", CacheEntry("e", 200, {}, b"1234"))
+    cache.get("a")
+    cache.set("c", CacheEntry("e", 200, {}, b"12"))
+    assert cache.get("b") is None and cache.get("a") is not None and len(cache) == 2
+    cache.set("d", CacheEntry("e", 200, {}, b"123456789"))
+    assert cache.get("a") is None and cache.get("d") is not None
+    cache.set("big", CacheEntry("e", 200, {}, b"12345678901"))
+    assert cache.get("big") is None
+
+    cache = LRUCache(ttl=10)
+    cache.set("a", CacheEntry("e", 200, {}, b"", stored_at=0))
+    assert cache.get("a") is None and len(cache) == 0
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import microsoftgraph.client
+from microsoftgraph import exceptions
+from microsoftgraph.response import Response
+from microsoftgraph.retry import Retry, retry_backoff
+from microsoftgraph.utils import parse_retry_after
+from tests.fakes import json_response, make_client
+
+THROTTLED = {"error": {"code": "TooManyRequests"}}
+
+
+class Responses(object):
+    def __init__(self, *responses) -> None:
+        """Answers the given responses in turn, then 200."""
+        self.responses = list(responses)
+
+    def handler(self, method, url, headers, kwargs):
+        return self.responses.pop(0) if self.responses else json_response(200, {"ok": True})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(microsoftgraph.client.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None and parse_retry_after("soon") is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(later) <= 30
+
+
+def test_backoff_is_jittered_and_bounded():
+    retry = Retry(backoff_factor=1, max_backoff=4)
+    assert all(0 <= retry.get_backoff(attempt) <= min(4, 2**attempt) for attempt in range(6) for _ in range(20))
+    assert retry.get_backoff(0, "12") == 12
+    assert Retry(backoff_factor=0, respect_retry_after=False).get_backoff(3, "12") == 0
+
+
+def test_next_delay_limits():
+    retry = Retry(total=2, backoff_factor=0, max_elapsed=10)
+    throttled = json_response(429, THROTTLED, {"Retry-After": "3"})
+    assert retry.next_delay("GET", "url", throttled, 0, 0) == 3
+    assert retry.next_delay("POST", "url", throttled, 0, 0) is None
+    assert retry.next_delay("GET", "url", json_response(500, {}), 0, 0) is None
+    assert retry.next_delay("GET", "url", throttled, 2, 0) is None
+    assert retry.next_delay("GET", "url", throttled, 0, 8) is None
+    assert retry.retries == 1
+
+
+def test_client_honors_retry_after(sleeps):
+    calls = []
+    retry = Retry(on_retry=lambda *args: calls.append(args))
+    responses = Responses(json_response(429, THROTTLED, {"Retry-After": "2"}), json_response(503, {}))
+    client, session = make_client(responses.handler, retry=retry)
+    response = client._get(client.base_url + "me")
+    assert response.data == {"ok": True} and response.retries == 2
+    assert sleeps[0] == 2.0 and len(sleeps) == 2
+    assert [(attempt, status) for _, _, attempt, _, status in calls] == [(1, 429), (2, 503)]
+    assert len(session.calls) == 3
+
+
+def test_client_gives_up_after_total(sleeps):
+    responses = Responses(*[json_response(429, THROTTLED, {"Retry-After": "1"}) for _ in range(5)])
+    client, session = make_client(responses.handler, retry=Retry(total=2))
+    with pytest.raises(exceptions.TooManyRequests) as error:
+        client._get(client.base_url + "me")
+    assert error.value.response.retry_after == 1.0
+    assert len(session.calls) == 3 and sleeps == [1.0, 1.0]
+
+
+def test_non_idempotent_methods_are_not_retried(sleeps):
+    responses = Responses(json_response(503, {}))
+    client, session = make_client(responses.handler, retry=Retry())
+    with pytest.raises(exceptions.ServiceUnavailable):
+        client._post(client.base_url + "me/sendMail", json={})
+    assert len(session.calls) == 1 and sleeps == []
+
+
+def test_retry_backoff_outside_the_client_loop():
+    client, _ = make_client(None, retry=Retry(backoff_factor=0))
+    throttled = exceptions.TooManyRequests(THROTTLED)
+    assert retry_backoff(client, 3, throttled) == 0
+    throttled.response = Response(json_response(429, THROTTLED, {"Retry-After": "4"}))
+    assert retry_backoff(client, 3, throttled) == 4
+    client.retry = Retry(backoff_factor=0, respect_retry_after=False)
+    assert retry_backoff(client, 3, throttled) == 0
+    client.retry = None
+    assert 0 <= retry_backoff(client, 10, OSError()) <= 30
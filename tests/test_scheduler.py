@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+
+from microsoftgraph.scheduler import BULK, INTERACTIVE, NORMAL, Scheduler, current_priority, priority
+from tests.fakes import json_response, make_client
+
+BASE_URL = "https://graph.microsoft.com/v1.0/"
+MAIL_URL = BASE_URL + "me/messages"
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_priority_blocks():
+    assert current_priority() == NORMAL
+    with priority(INTERACTIVE):
+        with priority(BULK, override=False):
+            assert current_priority() == INTERACTIVE
+        with priority(BULK):
+            assert current_priority() == BULK
+        assert current_priority() == INTERACTIVE
+    assert current_priority(BULK) == BULK
+
+
+def test_waiting_requests_are_served_by_priority():
+    scheduler = Scheduler(max_concurrency=1)
+    served = []
+
+    def request(name: str, value: int) -> None:
+        with scheduler.slot("GET", MAIL_URL, priority=value):
+            served.append(name)
+
+    with scheduler.slot("GET", MAIL_URL):
+        threads = []
+        for name, value in [("bulk", BULK), ("normal", NORMAL), ("interactive", INTERACTIVE)]:
+            threads.append(threading.Thread(target=request, args=(name, value)))
+            threads[-1].start()
+            wait_until(lambda: scheduler.stats()["me"]["queued"] == len(threads))
+        stats = scheduler.stats()["me"]
+        assert stats["in_flight"] == 1 and stats["queued_by_priority"] == {BULK: 1, NORMAL: 1, INTERACTIVE: 1}
+    for thread in threads:
+        thread.join()
+
+    assert served == ["interactive", "normal", "bulk"]
+    assert scheduler.stats()["me"] == {"in_flight": 0, "queued": 0, "queued_by_priority": {}, "served": 4}
+
+
+def test_keys_have_their_own_slots():
+    scheduler = Scheduler(max_concurrency=1)
+    with scheduler.slot("GET", MAIL_URL):
+        with scheduler.slot("GET", BASE_URL + "users/bob@example.com/messages"):
+            assert set(scheduler.stats()) == {"me", "bob@example.com"}
+    assert Scheduler(key="resource").key_for("GET", MAIL_URL) == "mail"
+    assert Scheduler(key="global").key_for("GET", MAIL_URL) == "global"
+
+
+def test_cancelled_async_waiter_gives_its_turn_away():
+    scheduler = Scheduler(max_concurrency=1)
+
+    async def main() -> None:
+        async def hold(release: asyncio.Event) -> None:
+            async with scheduler.aslot("GET", MAIL_URL):
+                await release.wait()
+
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(release))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(hold(asyncio.Event()))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["me"]["queued"] == 1
+        waiter.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await holder
+        async with scheduler.aslot("GET", MAIL_URL):
+            assert scheduler.stats()["me"]["in_flight"] == 1
+
+    asyncio.run(main())
+    assert scheduler.stats()["me"]["in_flight"] == 0
+
+
+def test_client_pages_are_bulk():
+    scheduler = Scheduler(max_concurrency=1)
+    seen = []
+
+    def handler(method, url, headers, kwargs):
+        seen.append(current_priority())
+        if url == MAIL_URL:
+            return json_response(200, {"value": [1], "@odata.nextLink": BASE_URL + "me/messages?page=2"})
+        return json_response(200, {"value": [2]})
+
+    client, _ = make_client(handler, scheduler=scheduler)
+    assert client._get(MAIL_URL).data["value"] == [1, 2]
+    assert seen == [NORMAL, BULK]
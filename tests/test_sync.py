@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from microsoftgraph.sync import TEMP_PREFIX, DriveMirror
+from tests.fakes import FakeDrive, make_client
+
+
+@pytest.fixture
+def drive():
+    drive = FakeDrive()
+    drive.add("/a.txt", b"AAA")
+    drive.add("/b.txt", b"BB")
+    drive.add("/docs/c.txt", b"C")
+    return drive
+
+
+@pytest.fixture
+def mirror(drive, tmp_path):
+    client, _ = make_client(drive.handler)
+    mirror = DriveMirror(client, str(tmp_path), upload=False)
+    mirror.sync()
+    drive.downloads.clear()
+    return mirror
+
+
+def test_first_round_downloads(mirror, tmp_path):
+    assert (tmp_path / "a.txt").read_bytes() == b"AAA"
+    assert (tmp_path / "docs" / "c.txt").read_bytes() == b"C"
+    result = mirror.sync()
+    assert result.unchanged == 3 and not result.downloaded
+
+
+def test_remote_move_is_applied_without_download(drive, mirror, tmp_path):
+    drive.move("/docs/c.txt", "/moved.txt")
+    result = mirror.sync()
+
+    assert result.moved == ["moved.txt"]
+    assert drive.downloads == []
+    assert (tmp_path / "moved.txt").read_bytes() == b"C"
+    assert not (tmp_path / "docs" / "c.txt").exists()
+
+
+def test_remote_swap(drive, mirror, tmp_path):
+    drive.move("/a.txt", "/swap.txt")
+    drive.move("/b.txt", "/a.txt")
+    drive.move("/swap.txt", "/b.txt")
+    result = mirror.sync()
+
+    assert sorted(result.moved) == ["a.txt", "b.txt"]
+    assert drive.downloads == []
+    assert (tmp_path / "a.txt").read_bytes() == b"BB"
+    assert (tmp_path / "b.txt").read_bytes() == b"AAA"
+
+
+def test_changed_on_both_sides_is_a_conflict(drive, mirror, tmp_path):
+    drive.write("/a.txt", b"remote")
+    (tmp_path / "a.txt").write_bytes(b"local change")
+    result = mirror.sync()
+
+    assert result.conflicts == ["a.txt"]
+    assert (tmp_path / "a.txt").read_bytes() == b"local change"
+
+
+def test_move_onto_untracked_file_is_a_conflict(drive, mirror, tmp_path):
+    (tmp_path / "moved.txt").write_bytes(b"mine")
+    drive.move("/docs/c.txt", "/moved.txt")
+    result = mirror.sync()
+
+    assert result.conflicts == ["moved.txt"] and not result.moved
+    assert (tmp_path / "moved.txt").read_bytes() == b"mine"
+    assert (tmp_path / "docs" / "c.txt").read_bytes() == b"C"
+
+    (tmp_path / "moved.txt").unlink()
+    assert mirror.sync().moved == ["moved.txt"]
+    assert (tmp_path / "moved.txt").read_bytes() == b"C"
+
+
+def test_download_onto_untracked_file_is_a_conflict(drive, mirror, tmp_path):
+    (tmp_path / "docs" / "renamed.txt").write_bytes(b"mine")
+    drive.move("/docs/c.txt", "/docs/renamed.txt")
+    drive.write("/docs/renamed.txt", b"new content")
+    result = mirror.sync()
+
+    assert result.conflicts == ["docs/renamed.txt"] and not result.failed
+    assert (tmp_path / "docs" / "renamed.txt").read_bytes() == b"mine"
+    assert (tmp_path / "docs" / "c.txt").read_bytes() == b"C"
+
+
+def test_remote_change_replaces_the_synchronized_copy(drive, mirror, tmp_path):
+    drive.write("/b.txt", b"new")
+    result = mirror.sync()
+
+    assert result.downloaded == ["b.txt"]
+    assert (tmp_path / "b.txt").read_bytes() == b"new"
+
+
+@pytest.mark.parametrize("failed", ["a.txt", "b.txt"])
+def test_failed_move_puts_the_files_back(drive, mirror, tmp_path, monkeypatch, failed):
+    drive.move("/a.txt", "/swap.txt")
+    drive.move("/b.txt", "/a.txt")
+    drive.move("/swap.txt", "/b.txt")
+    drive.move("/docs/c.txt", "/moved.txt")
+    replace = os.replace
+    failures = [OSError("disk full")]
+
+    def failing_replace(source, destination):
+        if failures and os.path.basename(source).startswith(TEMP_PREFIX) and destination.endswith(failed):
+            raise failures.pop()
+        replace(source, destination)
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        mirror.sync()
+    monkeypatch.setattr(os, "replace", replace)
+
+    assert not [path for path in tmp_path.rglob(TEMP_PREFIX + "*")]
+    assert (tmp_path / "a.txt").read_bytes() == b"AAA"
+    assert (tmp_path / "b.txt").read_bytes() == b"BB"
+    assert (tmp_path / "docs" / "c.txt").read_bytes() == b"C"
+
+    result = mirror.sync()
+    assert not result.failed and drive.downloads == []
+    assert (tmp_path / "a.txt").read_bytes() == b"BB"
+    assert (tmp_path / "b.txt").read_bytes() == b"AAA"
+    assert (tmp_path / "moved.txt").read_bytes() == b"C"
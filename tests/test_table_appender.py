@@ -0,0 +1,112 @@
+import json
+import threading
+
+import pytest
+
+import microsoftgraph.workbook_sessions
+from microsoftgraph import exceptions
+from microsoftgraph.tables import TableAppender
+from tests.fakes import json_response, make_client
+
+
+class FakeTable(object):
+    def __init__(self, statuses: list = None) -> None:
+        """Answers session and row requests, with the statuses given first and 201 afterwards."""
+        self.statuses = list(statuses or [])
+        self.bodies = []
+        self.sessions = []
+        self._lock = threading.Lock()
+
+    def handler(self, method, url, headers, kwargs):
+        with self._lock:
+            if url.endswith("/createSession"):
+                self.sessions.append("open")
+                return json_response(201, {"id": "session"})
+            if url.endswith("/closeSession"):
+                self.sessions.append("closed")
+                return json_response(204, {})
+            assert method == "POST" and url.endswith("/tables/table/rows")
+            status = self.statuses.pop(0) if self.statuses else 201
+            if status != 201:
+                return json_response(status, {"error": {"code": str(status)}})
+            self.bodies.append(kwargs["data"])
+            return json_response(201, {})
+
+    def rows(self) -> list:
+        return [row for body in self.bodies for row in json.loads(body)["values"]]
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(microsoftgraph.workbook_sessions.time, "sleep", lambda seconds: None)
+
+
+def test_rows_are_sent_in_batches():
+    table = FakeTable()
+    client, _ = make_client(table.handler)
+    with TableAppender(client, "workbook", "table", max_rows=4) as appender:
+        appender.extend([[i, "x"] for i in range(10)])
+
+    assert [len(json.loads(body)["values"]) for body in table.bodies] == [4, 4, 2]
+    assert table.rows() == [[i, "x"] for i in range(10)]
+    assert appender.rows_appended == 10 and appender.requests == 3
+    assert table.sessions == ["open", "closed"]
+
+
+@pytest.mark.parametrize("max_payload_bytes", [40, 64, 100])
+def test_bodies_never_exceed_the_limit(max_payload_bytes):
+    table = FakeTable()
+    client, _ = make_client(table.handler)
+    rows = [[i, "x" * (i % 9)] for i in range(50)]
+    with TableAppender(client, "workbook", "table", max_payload_bytes=max_payload_bytes) as appender:
+        appender.extend(rows)
+
+    assert all(len(body) <= max_payload_bytes for body in table.bodies)
+    assert table.rows() == rows
+
+
+def test_row_above_the_limit_is_rejected():
+    table = FakeTable()
+    client, session = make_client(table.handler)
+    appender = TableAppender(client, "workbook", "table", max_payload_bytes=30)
+    with pytest.raises(ValueError):
+        appender.append(["x" * 20])
+    assert session.calls == []
+
+
+def test_flush_waits_for_the_rows():
+    table = FakeTable()
+    client, _ = make_client(table.handler)
+    with TableAppender(client, "workbook", "table", session_id="session", flush_interval=60) as appender:
+        appender.append([1])
+        appender.flush()
+        assert table.rows() == [[1]]
+    assert table.sessions == []
+
+
+def test_throttled_batch_is_retried():
+    table = FakeTable([429, 503])
+    client, _ = make_client(table.handler)
+    with TableAppender(client, "workbook", "table", session_id="session") as appender:
+        appender.extend([[1], [2]])
+    assert table.rows() == [[1], [2]] and appender.requests == 1
+
+
+def test_failed_batch_is_kept_and_raised():
+    table = FakeTable([500])
+    client, _ = make_client(table.handler)
+    appender = TableAppender(client, "workbook", "table", session_id="session", max_rows=2)
+    appender.extend([[1], [2], [3]])
+    with pytest.raises(exceptions.InternalServerError):
+        appender.close()
+    assert appender.failed_rows == [[1], [2], [3]] and table.rows() == []
+
+
+def test_exit_keeps_the_original_exception():
+    table = FakeTable([500])
+    client, _ = make_client(table.handler)
+    with pytest.raises(KeyError):
+        with TableAppender(client, "workbook", "table", session_id="session") as appender:
+            appender.append([1])
+            raise KeyError("original")
+    assert isinstance(appender.error, exceptions.InternalServerError)
@@ -0,0 +1,97 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from microsoftgraph.client import Client
+from microsoftgraph.token_cache import FileTokenCache, MemoryTokenCache, SQLiteTokenCache, TokenCache
+from tests.fakes import FakeSession, json_response
+
+TOKEN_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
+
+
+@pytest.fixture(params=["memory", "file", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryTokenCache()
+    if request.param == "file":
+        return FileTokenCache(str(tmp_path / "tokens.json"))
+    return SQLiteTokenCache(str(tmp_path / "tokens.db"))
+
+
+class FakeTokenEndpoint(object):
+    def __init__(self) -> None:
+        """Token endpoint handing out access tokens a1, a2, ..."""
+        self.refreshes = 0
+        self._lock = threading.Lock()
+
+    def handler(self, method, url, headers, kwargs):
+        assert (method, url) == ("POST", TOKEN_URL)
+        with self._lock:
+            self.refreshes += 1
+            access_token = "a{}".format(self.refreshes)
+        return json_response(200, {"access_token": access_token, "refresh_token": "r", "expires_in": 3600})
+
+
+def make_client(handler, cache, **kwargs):
+    kwargs.setdefault("redirect_uri", "https://localhost/callback")
+    return Client("CLIENT_ID", "CLIENT_SECRET", session=FakeSession(handler), token_cache=cache, **kwargs)
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        TokenCache()
+
+
+def test_get_set_delete(cache):
+    key = TokenCache.make_key("CLIENT_ID", "User@Example.com", ["b", "a"])
+    assert key == TokenCache.make_key("CLIENT_ID", "user@example.com", ["a", "b"])
+    assert cache.get(key) is None
+    cache.set(key, {"access_token": "a"})
+    with cache.lock(key):
+        with cache.lock(key):
+            assert cache.get(key) == {"access_token": "a"}
+        cache.set(key, {"access_token": "b"})
+    assert cache.get(key) == {"access_token": "b"}
+    cache.delete(key)
+    assert cache.get(key) is None
+
+
+def test_sqlite_database_is_owner_only(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    old_umask = os.umask(0o022)
+    try:
+        SQLiteTokenCache(path).set("key", {"access_token": "secret"})
+    finally:
+        os.umask(old_umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_file_is_owner_only(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    FileTokenCache(path).set("key", {"access_token": "secret"})
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_client_loads_and_stores_the_cached_token(cache):
+    endpoint = FakeTokenEndpoint()
+    first = make_client(endpoint.handler, cache)
+    first.set_token({"access_token": "a0", "refresh_token": "r", "expires_in": 3600})
+    second = make_client(endpoint.handler, cache)
+    assert second.token["access_token"] == "a0"
+    assert make_client(endpoint.handler, cache, account="other").token is None
+
+
+def test_token_refreshed_by_another_client_is_adopted(cache):
+    endpoint = FakeTokenEndpoint()
+    first = make_client(endpoint.handler, cache)
+    first.set_token({"access_token": "a0", "refresh_token": "r", "expires_at": time.time() - 1})
+    second = make_client(endpoint.handler, cache)
+
+    first._ensure_token()
+    second._ensure_token()
+    assert endpoint.refreshes == 1
+    assert first.token["access_token"] == second.token["access_token"] == "a1"
+    assert cache.get(first.token_cache_key)["access_token"] == "a1"
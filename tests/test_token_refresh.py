@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from microsoftgraph import exceptions
+from microsoftgraph.client import Client
+from tests.fakes import FakeSession, json_response
+
+TOKEN_URL = "https://login.microsoftonline.com/common/oauth2/v2.0/token"
+ME_URL = "https://graph.microsoft.com/v1.0/me"
+
+
+class FakeGraph(object):
+    def __init__(self, reject: int = 0) -> None:
+        """Token endpoint issuing a1, a2... and an API accepting the latest access token only. The first reject API
+        requests answer 401 whatever the token."""
+        self.refreshes = 0
+        self.reject = reject
+        self._lock = threading.Lock()
+
+    @property
+    def access_token(self) -> str:
+        return "a{}".format(self.refreshes)
+
+    def handler(self, method, url, headers, kwargs):
+        if url == TOKEN_URL:
+            # Leaves the other threads time to pile up on the refresh in flight.
+            time.sleep(0.05)
+            with self._lock:
+                self.refreshes += 1
+                token = {"access_token": self.access_token, "expires_in": 3600}
+            assert kwargs["data"]["refresh_token"] == "r"
+            return json_response(200, token)
+        with self._lock:
+            if self.reject:
+                self.reject -= 1
+                return json_response(401, {"error": {"code": "InvalidAuthenticationToken"}})
+            if headers["Authorization"] != "Bearer " + self.access_token:
+                return json_response(401, {"error": {"code": "InvalidAuthenticationToken"}})
+        return json_response(200, {"id": "me"})
+
+
+def make_client(graph: FakeGraph, token: dict, **kwargs) -> Client:
+    kwargs.setdefault("redirect_uri", "https://localhost/callback")
+    client = Client("CLIENT_ID", "CLIENT_SECRET", session=FakeSession(graph.handler), **kwargs)
+    client.set_token(token)
+    return client
+
+
+def test_expiring_token_is_refreshed_before_the_request():
+    graph = FakeGraph()
+    refreshed = []
+    client = make_client(
+        graph, {"access_token": "a0", "refresh_token": "r", "expires_in": 60}, on_token_refresh=refreshed.append
+    )
+    assert client._get(ME_URL).data == {"id": "me"}
+    assert graph.refreshes == 1
+    assert client.token["access_token"] == "a1" and client.token["refresh_token"] == "r"
+    assert client.token["expires_at"] > time.time() + 3000
+    assert refreshed == [client.token]
+
+
+def test_token_outside_the_margin_is_kept():
+    graph = FakeGraph()
+    client = make_client(graph, {"access_token": "a0", "refresh_token": "r", "expires_in": 3600})
+    client._get(ME_URL)
+    assert graph.refreshes == 0
+
+
+def test_rejected_token_is_refreshed_and_the_request_replayed_once():
+    graph = FakeGraph(reject=1)
+    client = make_client(graph, {"access_token": "a0", "refresh_token": "r", "expires_in": 3600})
+    assert client._get(ME_URL).data == {"id": "me"}
+    assert graph.refreshes == 1
+
+    graph.reject = 2
+    with pytest.raises(exceptions.Unauthorized):
+        client._get(ME_URL)
+    assert graph.refreshes == 2
+
+
+def test_without_redirect_uri_nothing_is_refreshed():
+    graph = FakeGraph()
+    client = make_client(graph, {"access_token": "a0", "refresh_token": "r", "expires_in": 60}, redirect_uri=None)
+    client._get(ME_URL)
+    assert graph.refreshes == 0
+
+
+def test_concurrent_callers_share_one_refresh():
+    graph = FakeGraph()
+    client = make_client(graph, {"access_token": "a0", "refresh_token": "r", "expires_at": time.time() - 1})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: client._get(ME_URL).data, range(16)))
+    assert results == [{"id": "me"}] * 16
+    assert graph.refreshes == 1
+
+
+def test_concurrent_401s_share_one_refresh():
+    graph = FakeGraph()
+    graph.refreshes = 1
+    client = make_client(graph, {"access_token": "a0", "refresh_token": "r", "expires_in": 3600})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: client._get(ME_URL).data, range(16)))
+    assert results == [{"id": "me"}] * 16
+    assert graph.refreshes == 2
@@ -0,0 +1,53 @@
+import re
+import threading
+import time
+
+from microsoftgraph.walker import DriveWalker
+from tests.fakes import json_response, make_client
+
+
+def tree_handler(folders: int, files: int, delay: float = 0):
+    # The root holds folders f0..fN, each holding files.
+    lock = threading.Lock()
+
+    def handler(method, url, headers, kwargs):
+        time.sleep(delay)
+        with lock:
+            if url.endswith("root/children"):
+                items = [{"id": "f{}".format(i), "name": "f{}".format(i), "folder": {}} for i in range(folders)]
+                items.append({"id": "top", "name": "top.xlsx", "file": {}})
+            else:
+                folder = re.search(r"items/(\w+)/children", url).group(1)
+                items = [
+                    {"id": "{}-{}".format(folder, i), "name": "{}.txt".format(i), "file": {}} for i in range(files)
+                ]
+            return json_response(200, {"value": items})
+
+    return handler
+
+
+def test_walk_yields_every_item():
+    client, _ = make_client(tree_handler(5, 3))
+    items = list(DriveWalker(client, max_workers=3).walk())
+    assert len(items) == 5 + 1 + 5 * 3
+
+
+def test_filters_and_depth():
+    client, session = make_client(tree_handler(5, 3))
+    assert [item["name"] for item in DriveWalker(client, name="*.XLSX").walk()] == ["top.xlsx"]
+    assert len(list(DriveWalker(client, item_type="file", min_depth=1).walk())) == 15
+    calls = len(session.calls)
+    assert len(list(DriveWalker(client, max_depth=0).walk())) == 6
+    assert len(session.calls) == calls + 1
+
+
+def test_breaking_out_stops_the_crawl():
+    client, session = make_client(tree_handler(200, 3, delay=0.01))
+    for count, _ in enumerate(DriveWalker(client, max_workers=4).walk(), 1):
+        if count == 210:
+            break
+    at_break = len(session.calls)
+    time.sleep(0.5)
+    # Only the listings already running when the loop ended may complete.
+    assert len(session.calls) <= at_break + 4
+    assert len(session.calls) < 100
@@ -0,0 +1,167 @@
+import itertools
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import microsoftgraph.client
+import microsoftgraph.workbook_sessions
+from microsoftgraph import exceptions
+from microsoftgraph.retry import Retry
+from microsoftgraph.workbook_sessions import WorkbookSessions, request_retryable, session_request
+from tests.fakes import json_response, make_client
+
+SESSION_EXPIRED = {"error": {"code": "InvalidSessionReCreatable", "message": "The session expired."}}
+
+
+class FakeExcel(object):
+    def __init__(self, statuses: list = None) -> None:
+        """Workbook sessions service. Range requests answer the statuses given first, then 200."""
+        self.statuses = list(statuses or [])
+        self.live = set()
+        self.log = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def expire(self) -> None:
+        self.live.clear()
+
+    def handler(self, method, url, headers, kwargs):
+        with self._lock:
+            action = re.search(r"/workbook/(\w+)", url).group(1)
+            session_id = (headers or {}).get("workbook-session-id")
+            self.log.append((action, session_id))
+            if action == "createSession":
+                session_id = "s{}".format(next(self._ids))
+                self.live.add(session_id)
+                return json_response(201, {"id": session_id})
+            if session_id not in self.live:
+                return json_response(404 if action == "refreshSession" else 400, SESSION_EXPIRED)
+            if action == "closeSession":
+                self.live.discard(session_id)
+                return json_response(204, {})
+            if action == "refreshSession":
+                return json_response(204, {})
+            status = self.statuses.pop(0) if self.statuses else 200
+            body = {"session": session_id} if status == 200 else {"error": {"code": "x"}}
+            return json_response(status, body, {"Retry-After": "3"} if status == 429 else None)
+
+    def actions(self, name: str) -> int:
+        return len([action for action, _ in self.log if action == name])
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(microsoftgraph.workbook_sessions.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(microsoftgraph.client.time, "sleep", lambda seconds: None)
+
+
+def range_url(client) -> str:
+    return client.base_url + "me/drive/items/book/workbook/worksheets/Sheet1/range(address='A1')"
+
+
+def test_one_session_per_workbook():
+    excel = FakeExcel()
+    client, _ = make_client(excel.handler)
+    with WorkbookSessions(client, refresh_interval=None) as sessions:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            ids = list(pool.map(lambda i: sessions.get("book{}".format(i % 2)), range(20)))
+        assert len(set(ids)) == 2 and excel.actions("createSession") == 2
+        assert client.workbook_sessions is sessions
+    assert client.workbook_sessions is None
+    assert excel.actions("closeSession") == 2 and not excel.live
+
+
+def test_expired_session_is_recreated_once():
+    excel = FakeExcel()
+    client, _ = make_client(excel.handler)
+    with WorkbookSessions(client, ["book"], refresh_interval=None) as sessions:
+        excel.expire()
+        assert sessions.request("book", "GET", range_url(client)).data == {"session": "s2"}
+    assert excel.actions("createSession") == 2
+
+
+def test_workbooks_methods_use_the_pool():
+    excel = FakeExcel()
+    client, _ = make_client(excel.handler)
+    with WorkbookSessions(client, refresh_interval=None):
+        client.workbooks.update_range("book", "Sheet1", "A1", json={"values": [[1]]})
+        excel.expire()
+        client.workbooks.update_range("book", "Sheet1", "A1", json={"values": [[2]]})
+    assert [session for action, session in excel.log if action == "worksheets"] == ["s1", "s1", "s2"]
+
+
+def test_close_and_refresh_session_act_on_the_pool():
+    excel = FakeExcel()
+    client, _ = make_client(excel.handler)
+    with WorkbookSessions(client, refresh_interval=None) as sessions:
+        assert client.workbooks.close_session("book") is None
+        assert client.workbooks.refresh_session("book") is None
+        assert excel.actions("createSession") == 0
+
+        session_id = sessions.get("book")
+        assert client.workbooks.refresh_session("book").status_code == 204
+        assert client.workbooks.close_session("book").status_code == 204
+        assert session_id not in excel.live
+        assert sessions.get("book") != session_id
+
+
+def test_refresh_forgets_expired_sessions():
+    excel = FakeExcel()
+    client, _ = make_client(excel.handler)
+    with WorkbookSessions(client, ["first", "second"], refresh_interval=None) as sessions:
+        excel.live.discard(sessions.get("first"))
+        sessions.refresh()
+        assert excel.actions("refreshSession") == 2
+        assert sessions.get("first") == "s3"
+
+
+def test_session_request_without_pool_uses_the_global_session():
+    excel = FakeExcel()
+    client, _ = make_client(excel.handler)
+    client.set_workbook_session_id(client.workbooks.create_session("book").data["id"])
+    assert session_request(client, "book", "GET", range_url(client)).data == {"session": "s1"}
+
+
+def test_retries_without_client_policy():
+    excel = FakeExcel([503, 500, 429])
+    client, _ = make_client(excel.handler)
+    with WorkbookSessions(client, ["book"], refresh_interval=None) as sessions:
+        sessions.request("book", "GET", range_url(client), max_retries=3)
+    assert excel.actions("worksheets") == 4
+
+
+def test_client_policy_retries_are_not_multiplied():
+    excel = FakeExcel([503] * 10)
+    client, _ = make_client(excel.handler, retry=Retry(total=2, backoff_factor=0))
+    with WorkbookSessions(client, ["book"], refresh_interval=None) as sessions:
+        with pytest.raises(exceptions.ServiceUnavailable):
+            sessions.request("book", "GET", range_url(client), max_retries=3)
+    assert excel.actions("worksheets") == 3
+
+
+def test_errors_outside_the_client_policy_are_still_retried():
+    excel = FakeExcel([500, 500])
+    client, _ = make_client(excel.handler, retry=Retry(total=2, backoff_factor=0))
+    with WorkbookSessions(client, ["book"], refresh_interval=None) as sessions:
+        sessions.request("book", "GET", range_url(client), max_retries=3)
+    assert excel.actions("worksheets") == 3
+
+
+def test_retry_after_of_the_failed_request_is_honored(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(microsoftgraph.workbook_sessions.time, "sleep", sleeps.append)
+    excel = FakeExcel([429, 500])
+    client, _ = make_client(excel.handler, retry=Retry(total=2, backoff_factor=1, max_backoff=0.25))
+    with WorkbookSessions(client, ["book"], refresh_interval=None) as sessions:
+        sessions.request("book", "POST", range_url(client), max_retries=3)
+    assert sleeps[0] == 3.0 and 0 <= sleeps[1] <= 0.25
+
+
+def test_request_retryable():
+    client, _ = make_client(None, retry=Retry())
+    retryable = request_retryable(client, "GET")
+    assert exceptions.ServiceUnavailable not in retryable and exceptions.TooManyRequests not in retryable
+    assert exceptions.InternalServerError in retryable and OSError in retryable
+    assert exceptions.ServiceUnavailable in request_retryable(client, "POST")